@@ -1,12 +1,18 @@
 # flake8: noqa
+import html
 import os
-from typing import List, Tuple
+import time
+from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import pydeck as pdk
 import streamlit as st
-from streamlit_echarts5 import st_echarts
+
+import doc_index
+import fleet_stats
+import flight_catalog
+import telemetry_stream
+import transcript_search
 from pathlib import Path  # noqa: F401 (placeholder for future static paths)
 
 
@@ -14,7 +20,6 @@ from pathlib import Path  # noqa: F401 (placeholder for future static paths)
 # Helpers & data
 # --------------
 
-@st.cache_data(show_spinner=False)
 def load_csv(csv_path: str) -> pd.DataFrame:
     df = pd.read_csv(csv_path)
     # Normalize expected columns with robust fallbacks
@@ -61,19 +66,219 @@ def load_csv(csv_path: str) -> pd.DataFrame:
     return df
 
 
-@st.cache_data(show_spinner=False)
+TELEMETRY_COLUMNS = (
+    'ground_speed',
+    'altitude_radar',
+    'vertical_speed',
+    'eng1_torque',
+    'eng2_torque',
+)
+
+
+class FlightData:
+    """
+    One flight's columns as read-only NumPy arrays, sorted by t_seconds.
+    A single instance per process is shared by every viewer session;
+    sessions slice it by their time window and never copy it whole.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        order = np.argsort(df['t_seconds'].to_numpy(), kind='stable')
+        self.columns = {}
+        for name in ('t_seconds', 'time_str', 'crew', 'transcript'):
+            if name in df.columns:
+                self.columns[name] = df[name].to_numpy()[order]
+        for name in TELEMETRY_COLUMNS:
+            if name in df.columns:
+                self.columns[name] = (
+                    pd.to_numeric(df[name], errors='coerce')
+                    .to_numpy(dtype=np.float64)[order]
+                )
+        self.columns['t_seconds'] = (
+            self.columns['t_seconds'].astype(np.int64)
+        )
+        for arr in self.columns.values():
+            arr.setflags(write=False)
+        self.t_seconds = self.columns['t_seconds']
+
+    def __len__(self) -> int:
+        return len(self.t_seconds)
+
+    @property
+    def t_min(self) -> int:
+        return int(self.t_seconds[0])
+
+    @property
+    def t_max(self) -> int:
+        return int(self.t_seconds[-1])
+
+    def window(self, lo: int, hi: int) -> slice:
+        """Index range of lo <= t_seconds <= hi, by binary search."""
+        a = int(np.searchsorted(self.t_seconds, lo, side='left'))
+        b = int(np.searchsorted(self.t_seconds, hi, side='right'))
+        return slice(a, b)
+
+
+FLIGHTS_DIR = os.environ.get(
+    "AVIAT_FLIGHTS_DIR", os.path.dirname(os.path.abspath(__file__))
+)
+
+
+@st.cache_resource(show_spinner="Indexing flights…")
+def get_flight_catalog() -> flight_catalog.FlightCatalog:
+    """Process-wide catalog; rescanned incrementally once per process."""
+    catalog = flight_catalog.FlightCatalog()
+    catalog.scan([FLIGHTS_DIR])
+    return catalog
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_flight(csv_path: str, mtime: float) -> FlightData:
+    # Prefer the catalog's columnar copy over re-parsing the CSV
+    catalog = get_flight_catalog()
+    record = catalog.find(csv_path)
+    cols = catalog.load_columns(record.flight_id) if record else None
+    if cols is None:
+        return FlightData(load_csv(csv_path))
+    df = pd.DataFrame(cols)
+    for name in ('crew', 'transcript'):
+        if name in df.columns:
+            df[name] = df[name].astype(object).replace('', np.nan)
+    return FlightData(df)
+
+
+def load_flight(csv_path: str) -> FlightData:
+    return _load_flight(csv_path, os.path.getmtime(csv_path))
+
+
+# One process-wide source chosen by the operator, never by viewers: a
+# per-session URL would let any viewer bind ports or tail server files.
+LIVE_SOURCE = os.environ.get("AVIAT_LIVE_SOURCE", "udp://0.0.0.0:5005")
+LIVE_REFRESH_S = 1.0
+
+
+@st.cache_resource(show_spinner=False)
+def live_stream() -> telemetry_stream.TelemetryStream:
+    """The receiver for LIVE_SOURCE, opened once and shared by sessions."""
+    return telemetry_stream.TelemetryStream(LIVE_SOURCE)
+
+
+def live_window(
+    stream: telemetry_stream.TelemetryStream, span_s: int
+) -> np.ndarray:
+    """
+    The last span_s seconds of live rows for this session. Each refresh
+    copies only the rows that arrived since the previous one.
+    """
+    state = st.session_state.get("live_buffer")
+    if state is None or state["ring"] is not stream.ring:
+        state = {"ring": stream.ring, "seq": 0, "rows": None}
+    seq, new = stream.ring.since(state["seq"])
+    t_col = stream.ring.index["t_seconds"]
+    rows = state["rows"]
+    if rows is None or (
+        len(new) and len(rows) and new[0, t_col] < rows[-1, t_col]
+    ):
+        # First refresh, or the feed restarted at an earlier time
+        rows = new
+    else:
+        rows = np.vstack([rows, new])
+    if len(rows):
+        rows = rows[rows[:, t_col] >= rows[-1, t_col] - span_s]
+    state.update(seq=seq, rows=rows)
+    st.session_state["live_buffer"] = state
+    return rows
+
+
 def load_timeline_md(path: str) -> list:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    except Exception:
+        index = doc_index.load_index(path)
+    except (OSError, UnicodeDecodeError):
         return []
-    events = []
-    for ln in lines:
-        s = ln.strip()
-        if s.startswith("- ") and "—" in s:
-            events.append(s[2:])
-    return events
+    return index.events
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _load_transcripts(csv_path: str, mtime: float) -> pd.DataFrame:
+    flight = load_flight(csv_path)
+    if 'transcript' not in flight.columns:
+        return pd.DataFrame(columns=['t_seconds', 'html'])
+    tx = pd.DataFrame({
+        name: flight.columns[name]
+        for name in ('t_seconds', 'time_str', 'crew', 'transcript')
+        if name in flight.columns
+    }).dropna(subset=['transcript'])
+    crew = (
+        tx['crew'].fillna('').astype(str).str.strip()
+        if 'crew' in tx.columns
+        else pd.Series('', index=tx.index)
+    )
+    crew = crew.where(crew != '', 'Crew')
+    text = tx['transcript'].astype(str).str.strip().str.strip('"')
+    html_rows = (
+        "<div class='tx-row'><b>["
+        + tx['time_str'].map(html.escape)
+        + "] "
+        + crew.map(html.escape)
+        + "</b><br>"
+        + text.map(html.escape)
+        + "</div>"
+    )
+    out = pd.DataFrame({
+        't_seconds': tx['t_seconds'].astype(np.int64),
+        'html': html_rows,
+    })
+    return out.reset_index(drop=True)
+
+
+def load_transcripts(csv_path: str) -> pd.DataFrame:
+    """
+    Transcript rows sorted by t_seconds, with pre-escaped HTML rows.
+    Shared across sessions; treat the frame as read-only.
+    """
+    return _load_transcripts(csv_path, os.path.getmtime(csv_path))
+
+
+def transcripts_in_window(
+    tx: pd.DataFrame, t_lo: int, t_hi: int
+) -> pd.DataFrame:
+    """Rows with t_lo <= t_seconds <= t_hi, found by binary search."""
+    t = tx['t_seconds'].to_numpy()
+    lo = int(np.searchsorted(t, t_lo, side='left'))
+    hi = int(np.searchsorted(t, t_hi, side='right'))
+    return tx.iloc[lo:hi]
+
+
+TRANSCRIPT_MAX_ROWS = 2000
+
+
+def transcripts_html(rows: pd.DataFrame, height_px: int = 420) -> str:
+    """One scroll container for all rows; off-screen rows skip layout."""
+    return (
+        "<style>.tx-row{content-visibility:auto;"
+        "contain-intrinsic-size:auto 48px;padding:2px 0 6px}</style>"
+        f"<div style='max-height:{height_px}px; overflow:auto;"
+        " padding-right:8px'>"
+        + "".join(rows['html'].tolist())
+        + "</div>"
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _transcript_index(csv_path: str, mtime: float):
+    return transcript_search.load_index([csv_path])
+
+
+def load_transcript_index(csv_path: str):
+    return _transcript_index(csv_path, os.path.getmtime(csv_path))
+
+
+def jump_time_window(t: int, t_min: int, t_max: int) -> None:
+    """Move the time slider so t sits a quarter into the current window."""
+    lo, hi = st.session_state.get("time_window", (t_min, t_max))
+    width = max(hi - lo, 1)
+    new_lo = min(max(t - width // 4, t_min), max(t_max - width, t_min))
+    st.session_state["time_window"] = (new_lo, min(new_lo + width, t_max))
 
 
 @st.cache_data(show_spinner=False)
@@ -112,6 +317,14 @@ def parse_kml_line_strings(kml_path: str) -> List[List[Tuple[float, float]]]:
     return coords_blocks
 
 
+def st_echarts(*args, **kwargs):
+    # Imported on first chart render so sessions with every ECharts panel
+    # switched off never load the component
+    from streamlit_echarts5 import st_echarts as _st_echarts
+
+    return _st_echarts(*args, **kwargs)
+
+
 def echarts_theme_dark() -> dict:
     return {
         "darkMode": True,
@@ -135,262 +348,218 @@ def echarts_theme_dark() -> dict:
     }
 
 
-@st.cache_data(show_spinner=False)
 def load_weather_from_roi(md_path: str) -> pd.DataFrame:
-    # Parse "Surface Observations from Hurlburt Tower" table
-    if not os.path.exists(md_path):
-        return pd.DataFrame()
+    # Cache key includes the file mtime so edits to the ROI report are
+    # picked up without clearing the cache
     try:
-        with open(md_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    except Exception:
+        mtime = os.path.getmtime(md_path)
+    except OSError:
         return pd.DataFrame()
+    return _load_weather_from_roi(md_path, mtime)
 
-    start_idx = -1
-    for i, ln in enumerate(lines):
-        if "Surface Observations from Hurlburt Tower" in ln:
-            start_idx = i
-            break
-    if start_idx == -1:
-        return pd.DataFrame()
 
-    tds: List[str] = []
-    for ln in lines[start_idx:]:
-        s = ln.strip()
-        if s.startswith("</table>"):
-            break
-        if s.startswith("<td>") and s.endswith("</td>"):
-            tds.append(s[len("<td>"):-len("</td>")].strip())
+def _fmt_hhmm(s: pd.Series) -> pd.Series:
+    s = s.str.replace(" ", "", regex=False)
+    four_digits = s.str.fullmatch(r"\d{4}").fillna(False)
+    return s.where(~four_digits, s.str[:2] + ":" + s.str[2:])
 
-    rows = []
-    for i in range(0, len(tds), 3):
-        chunk = tds[i:i + 3]
-        if len(chunk) == 3:
-            rows.append(tuple(chunk))
-
-    def fmt_hhmm(s: str) -> str:
-        s = s.strip().replace(" ", "")
-        if ":" in s:
-            return s
-        if len(s) == 4 and s.isdigit():
-            return f"{s[:2]}:{s[2:]}"
-        return s
-
-    def parse_time_pair(cell: str) -> Tuple[str, str]:
-        if "/" in cell:
-            a, b = cell.split("/", 1)
-            return fmt_hhmm(a.strip()), fmt_hhmm(b.strip())
-        return fmt_hhmm(cell.strip()), ""
-
-    def parse_visibility(cell: str) -> float:
-        try:
-            return float(cell.strip())
-        except Exception:
-            return float("nan")
-
-    def parse_ceiling(cell: str) -> float:
-        digits = "".join(ch for ch in cell if ch.isdigit())
-        try:
-            return float(digits)
-        except Exception:
-            return float("nan")
-
-    parsed = []
-    for time_cell, vis_cell, ceil_cell in rows:
-        t_local, t_z = parse_time_pair(time_cell)
-        vis = parse_visibility(vis_cell)
-        ceil_ft = parse_ceiling(ceil_cell)
-        parsed.append({
-            "time_local": t_local,
-            "time_zulu": t_z,
-            "visibility_sm": vis,
-            "ceiling_ft": ceil_ft,
-        })
-
-    dfw = pd.DataFrame(parsed)
-    if not dfw.empty:
-        dfw = dfw.dropna(subset=["visibility_sm", "ceiling_ft"], how="all")
-    return dfw
-
-
-# -----------------
-# Layout & sections
-# -----------------
-st.set_page_config(
-    page_title="VIII Congreso Internacional de la Escuela de Helicópteros para las Fuerzas Armadas",
-    page_icon=("icon.png" if os.path.exists("icon.png") else "🚁"),
-    layout="wide",
-    initial_sidebar_state="expanded",
-)
-
-st.markdown(
-    "<h1 style='margin-bottom:6px'>"
-    "VIII Congreso Internacional de la Escuela de Helicópteros "
-    "para las Fuerzas Armadas"
-    "</h1>",
-    unsafe_allow_html=True,
-)
-st.markdown(
-    "<h2 style='color:#FF4B4B;margin-top:0'>"
-    "Análisis de caso: Rendimiento Humano con Dispositivos de Visión "
-    "Nocturna"
-    "</h2>",
-    unsafe_allow_html=True,
-)
-st.markdown(
-    "<div style='color:#FF4B4B;font-weight:600'>"
-    "Dr Diego Malpica MD - Medicina Aeroespacial"
-    "</div>",
-    unsafe_allow_html=True,
-)
-st.markdown(
-    "<div style='color:#FF4B4B'>"
-    "Dirección de Medicina Aeroespacial"
-    "</div>",
-    unsafe_allow_html=True,
-)
-
-# Default data sources (hidden from sidebar)
-data_csv = "Data.csv"
-kml_file = "MOJO69 Flight Path.kml"
-stl_file = "UH-60_Blackhawk.stl"
 
+@st.cache_data(show_spinner=False)
+def _load_weather_from_roi(md_path: str, mtime: float) -> pd.DataFrame:
+    # "Surface Observations from Hurlburt Tower" table, via the doc index
+    try:
+        index = doc_index.load_index(md_path)
+    except (OSError, UnicodeDecodeError):
+        return pd.DataFrame()
+    sec = index.find_section("Surface Observations from Hurlburt Tower")
+    tables = index.section_tables(sec) if sec is not None else []
+    rows = [r for r in tables[0].rows if len(r) >= 3] if tables else []
+    if not rows:
+        return pd.DataFrame()
+    cells = np.array([r[:3] for r in rows], dtype=object)
 
-# Sidebar controls (no data source inputs)
-with st.sidebar:
-    if os.path.exists("icon.png"):
-        st.image("icon.png", use_container_width=True)
-    st.markdown("### MOJO69 🚁")
-    show_stl = st.checkbox("Mostrar modelo 3D (opcional)", value=False)
-    if show_stl:
-        try:
-            from streamlit_stl import stl_from_file
-            stl_from_file(
-                file_path=stl_file,
-                color="#9aa6b2",
-                auto_rotate=True,
-                height=220,
-            )
-        except Exception:
-            st.caption("UH‑60 STL preview unavailable.")
-    st.markdown("---")
-    st.header("Filters")
-    df = load_csv(data_csv)
-    t_min = int(df['t_seconds'].min())
-    t_max = int(df['t_seconds'].max())
-    default_lo = max(t_min, 72988)
-    default_hi = min(t_max, 73299)
-    sel = st.slider(
-        "Time window (s)",
-        min_value=t_min,
-        max_value=t_max,
-        value=(default_lo, default_hi),
-        step=1,
-    )
-    smooth = st.checkbox("Smooth series (moving avg)", value=True)
-    window = st.slider("Smoothing window", 1, 21, 9, step=2)
-    st.markdown("---")
-    st.header("Chart style")
-    chart_style = st.selectbox(
-        "Style",
-        [
-            "Smooth area",
-            "Line",
-            "Scatter",
-            "Sparkline",
-        ],
-        index=0,
+    # "1848 / 2348" -> local "18:48", zulu "23:48"
+    time_parts = (
+        pd.Series(cells[:, 0], dtype="string")
+        .str.split("/", n=1, expand=True)
+        .reindex(columns=[0, 1])
     )
-    enable_gradient = st.checkbox("Gradient fill", value=True)
-    enable_crosshair = st.checkbox("Axis crosshair", value=True)
-    enable_toolbox = st.checkbox("Toolbox (zoom/save/restore)", value=False)
-    show_markers = st.checkbox("Show markers (min/max)", value=True)
-    declutter = st.checkbox(
-        "Declutter (lighter grid, fewer labels)", value=True
-    )
-    display_mode = st.radio(
-        "Display mode",
-        ["Combined", "Small multiples"],
-        index=0,
-        horizontal=True,
-    )
-    st.markdown("---")
-    st.header("Visibility")
-    show_map = st.checkbox("Show flight path map", value=True)
-    show_gauges = st.checkbox("Show summary gauges (simple)", value=False)
-    show_extra = st.checkbox("Show extra plots", value=True)
-    if show_extra:
-        show_vsi = st.checkbox("Vertical Speed plot", value=True)
-        show_torques = st.checkbox("Engine Torques plots", value=True)
-    else:
-        show_vsi = False
-        show_torques = False
-    st.markdown("---")
-    st.header("Panels")
-    show_transcripts = st.checkbox("Transcripciones", value=False)
-    pos_transcripts = st.selectbox(
-        "Posición de transcripciones",
-        ["Right column", "Below charts"],
-        index=0,
-    )
-    show_context = st.checkbox("Contexto del accidente", value=False)
-    pos_context = st.selectbox(
-        "Posición del contexto",
-        ["Right column", "Below charts"],
-        index=0,
-    )
-    show_timeline_panel = st.checkbox(
-        "Mostrar línea de tiempo (español)", value=True
-    )
-    st.markdown("---")
-    st.header("Weather chart")
-    show_weather_chart = st.checkbox(
-        "Show weather (visibility & ceiling)", value=True
-    )
-    weather_chart_style = st.selectbox(
-        "Weather style",
-        [
-            "2D Bar",
-            "2D Line",
-        ],
-        index=0,
-    )
-
-
-# Top row: two columns with charts/gauges and transcripts/context
-col_left, col_right = st.columns([2.2, 1.3], gap="large")
+    dfw = pd.DataFrame({
+        "time_local": _fmt_hhmm(time_parts[0].str.strip()),
+        "time_zulu": _fmt_hhmm(time_parts[1].str.strip()).fillna(""),
+        "visibility_sm": pd.to_numeric(
+            pd.Series(cells[:, 1], dtype="string").str.strip(),
+            errors="coerce",
+        ).astype("float64"),
+        # "Overcast 300'" -> 300.0
+        "ceiling_ft": pd.to_numeric(
+            pd.Series(cells[:, 2], dtype="string").str.replace(
+                r"\D", "", regex=True
+            ),
+            errors="coerce",
+        ).astype("float64"),
+    })
+    dfw = dfw.dropna(subset=["visibility_sm", "ceiling_ft"], how="all")
+    return dfw.reset_index(drop=True)
+
+
+def _nan_to_none(values: pd.Series) -> list:
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def build_weather_datasets(wdf: pd.DataFrame) -> Tuple[dict, dict]:
+    """ECharts datasets (2D wide, 3D long) straight from the columns."""
+    t = wdf["time_local"].fillna("").astype(str)
+    vis = wdf["visibility_sm"]
+    ceil = wdf["ceiling_ft"]
+
+    dataset_2d = {
+        "dimensions": ["time", "Visibility (SM)", "Ceiling (ft)"],
+        "source": pd.DataFrame({
+            "time": t,
+            "Visibility (SM)": vis.astype(object).where(vis.notna(), None),
+            "Ceiling (ft)": ceil.astype(object).where(ceil.notna(), None),
+        }).to_dict("records"),
+    }
 
-with col_left:
-    lo, hi = sel
-    dff = df[(df['t_seconds'] >= lo) & (df['t_seconds'] <= hi)].copy()
-    if smooth:
+    vis_ok = vis.notna()
+    ceil_ok = ceil.notna()
+    long_df = pd.concat([
+        pd.DataFrame({
+            "time": t[vis_ok],
+            "metric": "Visibility (SM)",
+            "z": vis[vis_ok],
+            "actual": vis[vis_ok],
+        }),
+        pd.DataFrame({
+            "time": t[ceil_ok],
+            "metric": "Ceiling (ft)",
+            "z": ceil[ceil_ok] / 100.0,
+            "actual": ceil[ceil_ok],
+        }),
+    ])
+    # Keep the per-time interleaving (visibility, then ceiling)
+    long_df = long_df.sort_index(kind="stable")
+    dataset_3d = {
+        "dimensions": ["time", "metric", "z", "actual"],
+        "source": long_df.to_dict("records"),
+    }
+    return dataset_2d, dataset_3d
+
+
+def weather_bar_data(
+    values: pd.Series, highlight: pd.Series, color: str
+) -> list:
+    """Bar items with a per-bar color where highlight is True."""
+    style = {"itemStyle": {"color": color}}
+    return [
+        None if v is None else ({"value": v, **style} if h else {"value": v})
+        for v, h in zip(_nan_to_none(values), highlight.tolist())
+    ]
+
+
+# ------
+# Panels
+# ------
+# Each panel is a fragment: widgets inside it rerun only that panel, while
+# sidebar changes still rerun the whole page with fresh arguments.
+
+def window_frame(
+    csv_path: str, lo: int, hi: int, smooth_window: int = 0
+) -> pd.DataFrame:
+    """
+    Rows in [lo, hi] of the shared flight arrays, with speed/altitude
+    smoothed when window > 0. Only the window is materialized.
+    """
+    flight = load_flight(csv_path)
+    sl = flight.window(lo, hi)
+    dff = pd.DataFrame(
+        {name: arr[sl] for name, arr in flight.columns.items()}
+    )
+    if smooth_window > 0:
         for c in ['ground_speed', 'altitude_radar']:
             if c in dff.columns:
                 dff[c] = (
-                    dff[c].rolling(window, min_periods=1, center=True).mean()
+                    dff[c]
+                    .rolling(smooth_window, min_periods=1, center=True)
+                    .mean()
                 )
+    return dff
 
-    x = dff['time_str'].tolist()
-    gs = (
-        dff.get('ground_speed', pd.Series([np.nan] * len(dff)))
-        .fillna(np.nan)
-        .tolist()
-    )
-    alt = (
-        dff.get('altitude_radar', pd.Series([np.nan] * len(dff)))
+
+def compute_range(values, pad=0.1):
+    arr = [v for v in values if v is not None and not np.isnan(v)]
+    if not arr:
+        return [0, 1]
+    vmin, vmax = float(min(arr)), float(max(arr))
+    if vmin == vmax:
+        return [vmin - 1, vmax + 1]
+    span = vmax - vmin
+    return [vmin - span * pad, vmax + span * pad]
+
+
+def series_list(dff: pd.DataFrame, col: str) -> list:
+    return (
+        dff.get(col, pd.Series([np.nan] * len(dff)))
         .fillna(np.nan)
         .tolist()
     )
 
-    def compute_range(values, pad=0.1):
-        arr = [v for v in values if v is not None and not np.isnan(v)]
-        if not arr:
-            return [0, 1]
-        vmin, vmax = float(min(arr)), float(max(arr))
-        if vmin == vmax:
-            return [vmin - 1, vmax + 1]
-        span = vmax - vmin
-        return [vmin - span * pad, vmax + span * pad]
+
+@st.fragment
+def telemetry_panel(
+    csv_path: str, lo: int, hi: int, show_vsi: bool, show_torques: bool
+) -> None:
+    with st.expander("Chart options", expanded=False):
+        c1, c2 = st.columns(2)
+        with c1:
+            smooth = st.checkbox(
+                "Smooth series (moving avg)", value=True, key="chart_smooth"
+            )
+            window = st.slider(
+                "Smoothing window", 1, 21, 9, step=2, key="chart_window"
+            )
+            chart_style = st.selectbox(
+                "Style",
+                [
+                    "Smooth area",
+                    "Line",
+                    "Scatter",
+                    "Sparkline",
+                ],
+                index=0,
+                key="chart_style",
+            )
+            display_mode = st.radio(
+                "Display mode",
+                ["Combined", "Small multiples"],
+                index=0,
+                horizontal=True,
+                key="chart_display_mode",
+            )
+        with c2:
+            enable_gradient = st.checkbox(
+                "Gradient fill", value=True, key="chart_gradient"
+            )
+            enable_crosshair = st.checkbox(
+                "Axis crosshair", value=True, key="chart_crosshair"
+            )
+            enable_toolbox = st.checkbox(
+                "Toolbox (zoom/save/restore)", value=False,
+                key="chart_toolbox",
+            )
+            show_markers = st.checkbox(
+                "Show markers (min/max)", value=True, key="chart_markers"
+            )
+            declutter = st.checkbox(
+                "Declutter (lighter grid, fewer labels)", value=True,
+                key="chart_declutter",
+            )
+
+    dff = window_frame(csv_path, lo, hi, window if smooth else 0)
+    x = dff['time_str'].tolist()
+    gs = series_list(dff, 'ground_speed')
+    alt = series_list(dff, 'altitude_radar')
 
     if display_mode == "Combined":
         # Modern combined chart with dual axes
@@ -583,97 +752,6 @@ with col_left:
         st_echarts(opt_gs, height="260px", theme=echarts_theme_dark())
         st_echarts(opt_ra, height="260px", theme=echarts_theme_dark())
 
-    # Flight path map directly under charts in the left column
-    if show_map:
-        paths = parse_kml_line_strings(kml_file)
-        if not paths:
-            st.info("No LineString coordinates found in KML.")
-        else:
-            all_points = [
-                (lon, lat)
-                for path in paths
-                for (lon, lat) in path
-            ]
-            center_lat = np.mean([lat for _, lat in all_points])
-            center_lon = np.mean([lon for lon, _ in all_points])
-
-            data_rows = []
-            for path in paths:
-                data_rows.append({"path": [[lon, lat] for (lon, lat) in path]})
-            path_df = pd.DataFrame(data_rows)
-
-            layer = pdk.Layer(
-                "PathLayer",
-                path_df,
-                get_path="path",
-                get_color=[88, 166, 255],
-                width_scale=2,
-                width_min_pixels=3,
-            )
-            view_state = pdk.ViewState(
-                latitude=center_lat,
-                longitude=center_lon,
-                zoom=11,
-                pitch=45,
-                bearing=0,
-            )
-            st.pydeck_chart(
-                pdk.Deck(layers=[layer], initial_view_state=view_state)
-            )
-
-    # Optional simple summary gauges (ECharts minimal rings)
-    if show_gauges:
-        st.markdown("\n")
-        g1, g2, g3 = st.columns(3)
-        latest = dff.tail(1)
-        latest_gs = float(
-            latest.get('ground_speed', pd.Series([np.nan])).iloc[0]
-        )
-        latest_ra = float(
-            latest.get('altitude_radar', pd.Series([np.nan])).iloc[0]
-        )
-        latest_vsi = float(
-            latest.get('vertical_speed', pd.Series([np.nan])).iloc[0]
-        )
-
-        def ring(name, value, unit):
-            return {
-                "series": [
-                    {
-                        "type": "gauge",
-                        "startAngle": 210,
-                        "endAngle": -30,
-                        "min": 0,
-                        "max": 1,
-                        "axisLine": {"lineStyle": {"width": 8}},
-                        "progress": {"show": True, "width": 8},
-                        "pointer": {"show": False},
-                        "splitLine": {"show": False},
-                        "axisTick": {"show": False},
-                        "axisLabel": {"show": False},
-                        "title": {"show": True, "offsetCenter": [0, "65%"]},
-                        "detail": {
-                            "valueAnimation": True,
-                            "fontSize": 18,
-                            "formatter": f"{value:.0f} {unit}",
-                        },
-                        "data": [{"value": 0.0, "name": name}],
-                    }
-                ]
-            }
-
-        with g1:
-            st_echarts(ring("Radar Alt", latest_ra, "ft"), height="150px",
-                       theme=echarts_theme_dark())
-        with g2:
-            st_echarts(ring("VSI", latest_vsi, "fpm"), height="150px",
-                       theme=echarts_theme_dark())
-        with g3:
-            st_echarts(ring("Ground Spd", latest_gs, "kt"), height="150px",
-                       theme=echarts_theme_dark())
-
-    # Quick stats removed per requirements
-
     # Extra plots (optional)
     if show_vsi:
         vsi_vals = (
@@ -732,276 +810,750 @@ with col_left:
             ],
         }
         st_echarts(opt_tq, height="240px", theme=echarts_theme_dark())
-    # Weather chart (below plots)
-    if 'show_weather_chart' in globals() and show_weather_chart:
-        st.markdown("\n")
-        wdf = load_weather_from_roi("ROI_UH60 (1).md")
-        if wdf.empty:
-            st.info("No weather table found in ROI markdown.")
-        else:
-            times = wdf["time_local"].tolist()
-            dataset_3d = {
-                "dimensions": ["time", "metric", "z", "actual"],
-                "source": []
-            }
-            for _, r in wdf.iterrows():
-                t_local_val = r["time_local"]
-                t = (
-                    str(t_local_val) if not pd.isna(t_local_val) else ""
-                )
-                vis_val = r["visibility_sm"]
-                vis = (
-                    float(vis_val) if not pd.isna(vis_val) else None
-                )
-                ceil_val = r["ceiling_ft"]
-                ceil = (
-                    float(ceil_val) if not pd.isna(ceil_val) else None
-                )
-                if vis is not None:
-                    dataset_3d["source"].append({
-                        "time": t,
-                        "metric": "Visibility (SM)",
-                        "z": vis,
-                        "actual": vis,
-                    })
-                if ceil is not None:
-                    dataset_3d["source"].append({
-                        "time": t,
-                        "metric": "Ceiling (ft)",
-                        "z": ceil / 100.0,
-                        "actual": ceil,
-                    })
-
-            dataset_2d = {
-                "dimensions": [
-                    "time", "Visibility (SM)", "Ceiling (ft)"
-                ],
-                "source": [
-                    {
-                        "time": (
-                            str(r["time_local"]) if not pd.isna(
-                                r["time_local"]
-                            ) else ""
-                        ),
-                        "Visibility (SM)": (
-                            float(r["visibility_sm"]) if not pd.isna(
-                                r["visibility_sm"]
-                            ) else None
-                        ),
-                        "Ceiling (ft)": (
-                            float(r["ceiling_ft"]) if not pd.isna(
-                                r["ceiling_ft"]
-                            ) else None
-                        ),
-                    }
-                    for _, r in wdf.iterrows()
-                ],
-            }
 
-            # Compute y-axis ranges to ensure VFR thresholds are visible
-            vis_vals = [
-                float(v) for v in wdf["visibility_sm"].dropna().tolist()
-            ]
-            ceil_vals = [
-                float(v) for v in wdf["ceiling_ft"].dropna().tolist()
-            ]
-            v_base_min = min(vis_vals + [3]) if vis_vals else 3
-            v_base_max = max(vis_vals + [3]) if vis_vals else 3
-            v_span = (v_base_max - v_base_min) or 1.0
-            v_min = max(0.0, v_base_min - 0.1 * v_span)
-            v_max = v_base_max + 0.1 * v_span
-            c_base_min = min(ceil_vals + [1000]) if ceil_vals else 1000
-            c_base_max = max(ceil_vals + [1000]) if ceil_vals else 1000
-            c_span = (c_base_max - c_base_min) or 1.0
-            c_min = max(0.0, c_base_min - 0.1 * c_span)
-            c_max = c_base_max + 0.1 * c_span
-
-            if weather_chart_style == "2D Bar":
-                # Build explicit data arrays with per-bar colors to avoid
-                # any dataset/encode callback issues
-                vis_bar_data = []
-                ceil_bar_data = []
-                for _, r in wdf.iterrows():
-                    vv = r["visibility_sm"]
-                    cv = r["ceiling_ft"]
-                    if not pd.isna(vv):
-                        vv_f = float(vv)
-                        vis_bar_data.append({
-                            "value": vv_f,
-                            **({"itemStyle": {"color": "#D90429"}}
-                               if vv_f < 3 else {})
-                        })
-                    else:
-                        vis_bar_data.append(None)
-                    if not pd.isna(cv):
-                        cv_f = float(cv)
-                        ceil_bar_data.append({
-                            "value": cv_f,
-                            **({"itemStyle": {"color": "#2EA043"}}
-                               if cv_f >= 1000 else {})
-                        })
-                    else:
-                        ceil_bar_data.append(None)
-
-                options_weather = {
-                    "backgroundColor": "transparent",
-                    "legend": {"top": 4},
-                    "tooltip": {"trigger": "axis"},
-                    "toolbox": {"feature": {"saveAsImage": {}}},
-                    "dataZoom": [
-                        {"type": "inside", "throttle": 50},
-                        {"type": "slider", "bottom": 8, "height": 14},
-                    ],
-                    "xAxis": {
-                        "type": "category",
-                        "name": "Time",
-                        "data": times,
-                        "axisLabel": {"color": "#c9d1d9"},
+
+@st.fragment(run_every=LIVE_REFRESH_S)
+def live_panel(span_s: int, show_vsi: bool, show_torques: bool) -> None:
+    url = LIVE_SOURCE
+    try:
+        stream = live_stream()
+    except (OSError, ValueError) as e:
+        st.error(f"Live source {url} unavailable: {e}")
+        return
+    if stream.error:
+        st.error(f"Live source {url} stopped: {stream.error}")
+        return
+    rows = live_window(stream, span_s)
+    if not len(rows):
+        st.info(
+            f"Waiting for telemetry on {url} "
+            "(python telemetry_stream.py replay Data.csv <url>)"
+        )
+        return
+
+    col = {name: rows[:, i] for name, i in stream.ring.index.items()}
+    last = {name: float(v[-1]) for name, v in col.items()}
+    age = max(0.0, time.time() - last["recv_time"])
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Ground speed (kt)", f"{last['ground_speed']:.0f}")
+    m2.metric("Radar alt (ft)", f"{max(last['altitude_radar'], 0.0):.0f}")
+    m3.metric("Vertical speed (fpm)", f"{last['vertical_speed']:.0f}")
+    m4.metric("Data age (s)", f"{age:.1f}")
+
+    t = col['t_seconds'].astype(np.int64)
+    x = [f"{v // 3600:02d}:{v // 60 % 60:02d}:{v % 60:02d}" for v in t]
+
+    def values(name: str) -> list:
+        return [None if np.isnan(v) else float(v) for v in col[name]]
+
+    series = [
+        {"name": "Ground Speed (kt)", "type": "line", "showSymbol": False,
+         "data": values('ground_speed')},
+        {"name": "Radar Alt (ft)", "type": "line", "showSymbol": False,
+         "yAxisIndex": 1,
+         "data": [max(v, 0.0) if v is not None else None
+                  for v in values('altitude_radar')]},
+    ]
+    if show_vsi:
+        series.append(
+            {"name": "VSI (fpm)", "type": "line", "showSymbol": False,
+             "yAxisIndex": 1, "data": values('vertical_speed')}
+        )
+    if show_torques:
+        for name, label in (
+            ('eng1_torque', "Eng 1 Torque"), ('eng2_torque', "Eng 2 Torque")
+        ):
+            series.append(
+                {"name": label, "type": "line", "showSymbol": False,
+                 "data": values(name)}
+            )
+    options = {
+        "backgroundColor": "transparent",
+        "animation": False,
+        "legend": {"top": 4},
+        "tooltip": {"trigger": "axis"},
+        "xAxis": {"type": "category", "boundaryGap": False, "data": x},
+        "yAxis": [
+            {"type": "value", "name": "kt / %"},
+            {
+                "type": "value",
+                "name": "ft / fpm",
+                "splitLine": {"show": False},
+            },
+        ],
+        "series": series,
+    }
+    st_echarts(options=options, height="420px", theme=echarts_theme_dark())
+    st.caption(
+        f"Live: {len(stream.ring)} rows buffered, "
+        f"showing the last {span_s} s from {url}"
+    )
+
+
+@st.fragment
+def map_panel(kml_path: Optional[str]) -> None:
+    if not kml_path:
+        st.info("No flight path (KML) is paired with this flight.")
+        return
+    paths = parse_kml_line_strings(kml_path)
+    if not paths:
+        st.info("No LineString coordinates found in KML.")
+        return
+    all_points = [
+        (lon, lat)
+        for path in paths
+        for (lon, lat) in path
+    ]
+    center_lat = np.mean([lat for _, lat in all_points])
+    center_lon = np.mean([lon for lon, _ in all_points])
+
+    data_rows = []
+    for path in paths:
+        data_rows.append({"path": [[lon, lat] for (lon, lat) in path]})
+    path_df = pd.DataFrame(data_rows)
+
+    import pydeck as pdk
+
+    layer = pdk.Layer(
+        "PathLayer",
+        path_df,
+        get_path="path",
+        get_color=[88, 166, 255],
+        width_scale=2,
+        width_min_pixels=3,
+    )
+    view_state = pdk.ViewState(
+        latitude=center_lat,
+        longitude=center_lon,
+        zoom=11,
+        pitch=45,
+        bearing=0,
+    )
+    st.pydeck_chart(
+        pdk.Deck(layers=[layer], initial_view_state=view_state)
+    )
+
+
+@st.fragment
+def gauges_panel(csv_path: str, lo: int, hi: int) -> None:
+    dff = window_frame(csv_path, lo, hi)
+    st.markdown("\n")
+    g1, g2, g3 = st.columns(3)
+    latest = dff.tail(1)
+    latest_gs = float(
+        latest.get('ground_speed', pd.Series([np.nan])).iloc[0]
+    )
+    latest_ra = float(
+        latest.get('altitude_radar', pd.Series([np.nan])).iloc[0]
+    )
+    latest_vsi = float(
+        latest.get('vertical_speed', pd.Series([np.nan])).iloc[0]
+    )
+
+    def ring(name, value, unit):
+        return {
+            "series": [
+                {
+                    "type": "gauge",
+                    "startAngle": 210,
+                    "endAngle": -30,
+                    "min": 0,
+                    "max": 1,
+                    "axisLine": {"lineStyle": {"width": 8}},
+                    "progress": {"show": True, "width": 8},
+                    "pointer": {"show": False},
+                    "splitLine": {"show": False},
+                    "axisTick": {"show": False},
+                    "axisLabel": {"show": False},
+                    "title": {"show": True, "offsetCenter": [0, "65%"]},
+                    "detail": {
+                        "valueAnimation": True,
+                        "fontSize": 18,
+                        "formatter": f"{value:.0f} {unit}",
                     },
-                    "yAxis": [
-                        {"type": "value", "name": "Visibility (SM)",
-                         "min": v_min, "max": v_max,
-                         "axisLabel": {"color": "#c9d1d9"}},
-                        {"type": "value", "name": "Ceiling (ft)",
-                         "min": c_min, "max": c_max,
-                         "axisLabel": {"color": "#c9d1d9"}},
-                    ],
-                    "series": [
-                        {
-                            "type": "bar",
-                            "name": "Visibility (SM)",
-                            "yAxisIndex": 0,
-                            "itemStyle": {"color": "#58a6ff"},
-                            "data": vis_bar_data,
-                            "markLine": {
-                                "silent": True,
-                                "symbol": "none",
-                                "lineStyle": {
-                                    "color": "#FF4B4B",
-                                    "type": "dashed",
-                                    "width": 2
-                                },
-                                "label": {"formatter": "3 SM"},
-                                "data": [{"yAxis": 3}]
+                    "data": [{"value": 0.0, "name": name}],
+                }
+            ]
+        }
+
+    with g1:
+        st_echarts(ring("Radar Alt", latest_ra, "ft"), height="150px",
+                   theme=echarts_theme_dark())
+    with g2:
+        st_echarts(ring("VSI", latest_vsi, "fpm"), height="150px",
+                   theme=echarts_theme_dark())
+    with g3:
+        st_echarts(ring("Ground Spd", latest_gs, "kt"), height="150px",
+                   theme=echarts_theme_dark())
+
+
+@st.fragment
+def weather_panel(md_path: str) -> None:
+    st.markdown("\n")
+    weather_chart_style = st.selectbox(
+        "Weather style",
+        [
+            "2D Bar",
+            "2D Line",
+        ],
+        index=0,
+        key="weather_chart_style",
+    )
+    wdf = load_weather_from_roi(md_path)
+    if wdf.empty:
+        st.info("No weather table found in ROI markdown.")
+    else:
+        times = wdf["time_local"].tolist()
+        dataset_2d, dataset_3d = build_weather_datasets(wdf)
+
+        # Compute y-axis ranges to ensure VFR thresholds are visible
+        vis_vals = [
+            float(v) for v in wdf["visibility_sm"].dropna().tolist()
+        ]
+        ceil_vals = [
+            float(v) for v in wdf["ceiling_ft"].dropna().tolist()
+        ]
+        v_base_min = min(vis_vals + [3]) if vis_vals else 3
+        v_base_max = max(vis_vals + [3]) if vis_vals else 3
+        v_span = (v_base_max - v_base_min) or 1.0
+        v_min = max(0.0, v_base_min - 0.1 * v_span)
+        v_max = v_base_max + 0.1 * v_span
+        c_base_min = min(ceil_vals + [1000]) if ceil_vals else 1000
+        c_base_max = max(ceil_vals + [1000]) if ceil_vals else 1000
+        c_span = (c_base_max - c_base_min) or 1.0
+        c_min = max(0.0, c_base_min - 0.1 * c_span)
+        c_max = c_base_max + 0.1 * c_span
+
+        if weather_chart_style == "2D Bar":
+            # Build explicit data arrays with per-bar colors to avoid
+            # any dataset/encode callback issues
+            vis_bar_data = weather_bar_data(
+                wdf["visibility_sm"], wdf["visibility_sm"] < 3, "#D90429"
+            )
+            ceil_bar_data = weather_bar_data(
+                wdf["ceiling_ft"], wdf["ceiling_ft"] >= 1000, "#2EA043"
+            )
+
+            options_weather = {
+                "backgroundColor": "transparent",
+                "legend": {"top": 4},
+                "tooltip": {"trigger": "axis"},
+                "toolbox": {"feature": {"saveAsImage": {}}},
+                "dataZoom": [
+                    {"type": "inside", "throttle": 50},
+                    {"type": "slider", "bottom": 8, "height": 14},
+                ],
+                "xAxis": {
+                    "type": "category",
+                    "name": "Time",
+                    "data": times,
+                    "axisLabel": {"color": "#c9d1d9"},
+                },
+                "yAxis": [
+                    {"type": "value", "name": "Visibility (SM)",
+                     "min": v_min, "max": v_max,
+                     "axisLabel": {"color": "#c9d1d9"}},
+                    {"type": "value", "name": "Ceiling (ft)",
+                     "min": c_min, "max": c_max,
+                     "axisLabel": {"color": "#c9d1d9"}},
+                ],
+                "series": [
+                    {
+                        "type": "bar",
+                        "name": "Visibility (SM)",
+                        "yAxisIndex": 0,
+                        "itemStyle": {"color": "#58a6ff"},
+                        "data": vis_bar_data,
+                        "markLine": {
+                            "silent": True,
+                            "symbol": "none",
+                            "lineStyle": {
+                                "color": "#FF4B4B",
+                                "type": "dashed",
+                                "width": 2
                             },
-                            "animation": True,
-                            "animationDuration": 1000,
+                            "label": {"formatter": "3 SM"},
+                            "data": [{"yAxis": 3}]
                         },
-                        {
-                            "type": "bar",
-                            "name": "Ceiling (ft)",
-                            "yAxisIndex": 1,
-                            "itemStyle": {"color": "#D90429"},
-                            "data": ceil_bar_data,
-                            "markLine": {
-                                "silent": True,
-                                "symbol": "none",
-                                "lineStyle": {
-                                    "color": "#FF4B4B",
-                                    "type": "dashed",
-                                    "width": 2
-                                },
-                                "label": {"formatter": "1000 ft"},
-                                "data": [{"yAxis": 1000}]
+                        "animation": True,
+                        "animationDuration": 1000,
+                    },
+                    {
+                        "type": "bar",
+                        "name": "Ceiling (ft)",
+                        "yAxisIndex": 1,
+                        "itemStyle": {"color": "#D90429"},
+                        "data": ceil_bar_data,
+                        "markLine": {
+                            "silent": True,
+                            "symbol": "none",
+                            "lineStyle": {
+                                "color": "#FF4B4B",
+                                "type": "dashed",
+                                "width": 2
                             },
-                            "animation": True,
-                            "animationDuration": 1000,
+                            "label": {"formatter": "1000 ft"},
+                            "data": [{"yAxis": 1000}]
                         },
-                    ],
-                }
-                st_echarts(
-                    options_weather,
-                    height="340px",
-                    theme=echarts_theme_dark(),
-                )
-            else:
-                options_weather = {
-                    "backgroundColor": "transparent",
-                    "legend": {"top": 4},
-                    "tooltip": {"trigger": "axis"},
-                    "toolbox": {"feature": {"saveAsImage": {}}},
-                    "dataset": dataset_2d,
-                    "dataZoom": [
-                        {"type": "inside", "throttle": 50},
-                        {"type": "slider", "bottom": 8, "height": 14},
-                    ],
-                    "xAxis": {
-                        "type": "category",
-                        "name": "Time",
-                        "axisLabel": {"color": "#c9d1d9"}
+                        "animation": True,
+                        "animationDuration": 1000,
                     },
-                    "yAxis": [
-                        {"type": "value", "name": "Visibility (SM)",
-                         "min": v_min, "max": v_max,
-                         "axisLabel": {"color": "#c9d1d9"}},
-                        {"type": "value", "name": "Ceiling (ft)",
-                         "min": c_min, "max": c_max,
-                         "axisLabel": {"color": "#c9d1d9"}},
-                    ],
-                    "series": [
-                        {
-                            "type": "line",
-                            "name": "Visibility (SM)",
-                            "yAxisIndex": 0,
-                            "smooth": True,
-                            "showSymbol": False,
-                            "lineStyle": {"width": 2, "color": "#58a6ff"},
-                            "encode": {
-                                "x": "time",
-                                "y": "Visibility (SM)"
-                            },
-                            "areaStyle": {
-                                "opacity": 0.18,
-                                "color": "rgba(88, 166, 255, .22)"
-                            },
-                            "markLine": {
-                                "silent": True,
-                                "symbol": "none",
-                                "lineStyle": {
-                                    "color": "#FF4B4B",
-                                    "type": "dashed",
-                                    "width": 2
-                                },
-                                "label": {"formatter": "3 SM"},
-                                "data": [{"yAxis": 3}]
-                            },
-                            "animation": True,
+                ],
+            }
+            st_echarts(
+                options_weather,
+                height="340px",
+                theme=echarts_theme_dark(),
+            )
+        else:
+            options_weather = {
+                "backgroundColor": "transparent",
+                "legend": {"top": 4},
+                "tooltip": {"trigger": "axis"},
+                "toolbox": {"feature": {"saveAsImage": {}}},
+                "dataset": dataset_2d,
+                "dataZoom": [
+                    {"type": "inside", "throttle": 50},
+                    {"type": "slider", "bottom": 8, "height": 14},
+                ],
+                "xAxis": {
+                    "type": "category",
+                    "name": "Time",
+                    "axisLabel": {"color": "#c9d1d9"}
+                },
+                "yAxis": [
+                    {"type": "value", "name": "Visibility (SM)",
+                     "min": v_min, "max": v_max,
+                     "axisLabel": {"color": "#c9d1d9"}},
+                    {"type": "value", "name": "Ceiling (ft)",
+                     "min": c_min, "max": c_max,
+                     "axisLabel": {"color": "#c9d1d9"}},
+                ],
+                "series": [
+                    {
+                        "type": "line",
+                        "name": "Visibility (SM)",
+                        "yAxisIndex": 0,
+                        "smooth": True,
+                        "showSymbol": False,
+                        "lineStyle": {"width": 2, "color": "#58a6ff"},
+                        "encode": {
+                            "x": "time",
+                            "y": "Visibility (SM)"
                         },
-                        {
-                            "type": "line",
-                            "name": "Ceiling (ft)",
-                            "yAxisIndex": 1,
-                            "smooth": True,
-                            "showSymbol": False,
-                            "lineStyle": {"width": 2, "color": "#2EA043"},
-                            "encode": {
-                                "x": "time",
-                                "y": "Ceiling (ft)"
-                            },
-                            "areaStyle": {
-                                "opacity": 0.15,
-                                "color": "rgba(46, 160, 67, .20)"
+                        "areaStyle": {
+                            "opacity": 0.18,
+                            "color": "rgba(88, 166, 255, .22)"
+                        },
+                        "markLine": {
+                            "silent": True,
+                            "symbol": "none",
+                            "lineStyle": {
+                                "color": "#FF4B4B",
+                                "type": "dashed",
+                                "width": 2
                             },
-                            "markLine": {
-                                "silent": True,
-                                "symbol": "none",
-                                "lineStyle": {
-                                    "color": "#FF4B4B",
-                                    "type": "dashed",
-                                    "width": 2
-                                },
-                                "label": {"formatter": "1000 ft"},
-                                "data": [{"yAxis": 1000}]
+                            "label": {"formatter": "3 SM"},
+                            "data": [{"yAxis": 3}]
+                        },
+                        "animation": True,
+                    },
+                    {
+                        "type": "line",
+                        "name": "Ceiling (ft)",
+                        "yAxisIndex": 1,
+                        "smooth": True,
+                        "showSymbol": False,
+                        "lineStyle": {"width": 2, "color": "#2EA043"},
+                        "encode": {
+                            "x": "time",
+                            "y": "Ceiling (ft)"
+                        },
+                        "areaStyle": {
+                            "opacity": 0.15,
+                            "color": "rgba(46, 160, 67, .20)"
+                        },
+                        "markLine": {
+                            "silent": True,
+                            "symbol": "none",
+                            "lineStyle": {
+                                "color": "#FF4B4B",
+                                "type": "dashed",
+                                "width": 2
                             },
-                            "animation": True,
+                            "label": {"formatter": "1000 ft"},
+                            "data": [{"yAxis": 1000}]
                         },
-                    ],
-                }
-                st_echarts(
-                    options_weather,
-                    height="340px",
-                    theme=echarts_theme_dark(),
+                        "animation": True,
+                    },
+                ],
+            }
+            st_echarts(
+                options_weather,
+                height="340px",
+                theme=echarts_theme_dark(),
+            )
+
+
+@st.cache_data(show_spinner="Computing fleet statistics…", max_entries=2)
+def _fleet_summary(key: str) -> dict:
+    return fleet_stats.load_or_build(get_flight_catalog())
+
+
+def fleet_summary() -> dict:
+    """Cached summary; recomputed only when a catalogued flight changes."""
+    catalog = get_flight_catalog()
+    params = fleet_stats.StatsParams()
+    jobs = fleet_stats.make_jobs(catalog, params)
+    return _fleet_summary(fleet_stats.summary_key(jobs, params))
+
+
+def _histogram_bars(
+    hist: dict, factor: int, name: str, unit: str, trim_zeros: bool
+) -> dict:
+    h = fleet_stats.Histogram.from_dict(hist)
+    edges, weights = h.rebin(factor)
+    minutes = weights / 60.0
+    if trim_zeros and minutes.any():
+        nz = np.flatnonzero(minutes)
+        edges = edges[nz[0]: nz[-1] + 1]
+        minutes = minutes[nz[0]: nz[-1] + 1]
+    return {
+        "backgroundColor": "transparent",
+        "tooltip": {"trigger": "axis"},
+        "xAxis": {
+            "type": "category",
+            "name": unit,
+            "data": [f"{e:g}" for e in edges],
+        },
+        "yAxis": {"type": "value", "name": "min"},
+        "series": [
+            {"name": name, "type": "bar",
+             "data": [round(float(m), 2) for m in minutes]}
+        ],
+    }
+
+
+@st.fragment
+def fleet_panel() -> None:
+    st.subheader("Fleet statistics")
+    summary = fleet_summary()
+    fleet = summary["fleet"]
+    if not fleet["flights"]:
+        st.caption("No flights in the catalog.")
+        return
+    params = summary["params"]
+    cols = st.columns(2 + len(fleet["below_min_s"]))
+    cols[0].metric("Flights", fleet["flights"])
+    cols[1].metric("Airborne", f"{fleet['airborne_s'] / 3600.0:.1f} h")
+    for col, (ft, secs) in zip(cols[2:], fleet["below_min_s"].items()):
+        col.metric(f"Below {ft} ft RA", f"{secs / 60.0:.1f} min")
+
+    q = fleet["descent_fpm"]
+    st.caption(
+        f"Descent rate below {params['descent_ra_ft']:g} ft RA — "
+        + ", ".join(
+            f"{k} {v:.0f} fpm" for k, v in q.items() if v is not None
+        )
+    )
+    st_echarts(
+        _histogram_bars(
+            fleet["descent_hist"], 5, "Descent", "fpm", trim_zeros=True
+        ),
+        height="240px",
+        theme=echarts_theme_dark(),
+    )
+    split = fleet["torque_split"]
+    if split["mean"] is not None:
+        st.caption(
+            f"Torque split Eng 1 − Eng 2: mean {split['mean']:.1f}%, "
+            f"5–95% range {split['p5']:.1f}…{split['p95']:.1f}%"
+        )
+    st_echarts(
+        _histogram_bars(
+            fleet["torque_split_hist"], 2, "Split", "%", trim_zeros=True
+        ),
+        height="240px",
+        theme=echarts_theme_dark(),
+    )
+    rows = []
+    for f in summary["flights"]:
+        row = {
+            "Flight": f["name"],
+            "Airborne (min)": round(f["airborne_s"] / 60.0, 1),
+            "Descent p90 (fpm)": f["descent_fpm"].get("p90"),
+            "Torque split (%)": f["torque_split_mean"],
+        }
+        for ft, secs in f["below_min_s"].items():
+            row[f"< {ft} ft (min)"] = round(secs / 60.0, 1)
+        rows.append(row)
+    st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+
+@st.fragment
+def transcripts_panel(csv_path: str, lo: int, hi: int) -> None:
+    st.subheader("Transcripts")
+    transcripts_box = st.container(border=True)
+    with transcripts_box:
+        if 'transcript' in load_flight(csv_path).columns:
+            tx = load_transcripts(csv_path)
+            rows = transcripts_in_window(tx, lo, hi)
+            st.caption(
+                f"{len(rows)} of {len(tx)} transmissions in the "
+                "selected window"
+            )
+            if len(rows) > TRANSCRIPT_MAX_ROWS:
+                st.caption(
+                    f"Showing the first {TRANSCRIPT_MAX_ROWS}; narrow "
+                    "the time window to see the rest."
                 )
+                rows = rows.iloc[:TRANSCRIPT_MAX_ROWS]
+            st.markdown(transcripts_html(rows), unsafe_allow_html=True)
+        else:
+            st.caption("No transcript column found in CSV.")
+
+
+@st.fragment
+def timeline_panel(md_path: str, lo: int, hi: int) -> None:
+    st.markdown("---")
+    st.subheader("Línea de tiempo ✈️")
+    events = load_timeline_md(md_path)
+    if events and st.checkbox(
+        "Only events in the selected time window",
+        value=False,
+        key="timeline_in_window",
+    ):
+        index = doc_index.load_index(md_path)
+        events = index.events_between(lo, hi)
+        if not events:
+            st.caption("No timeline events in the selected window.")
+    if events:
+        st.markdown(
+            "<div style='max-height:420px; overflow:auto;"
+            " padding-right:8px'>",
+            unsafe_allow_html=True,
+        )
+        for ev in events:
+            st.markdown(f"- {ev.display}")
+        st.markdown("</div>", unsafe_allow_html=True)
+    else:
+        st.caption("No se encontró la línea de tiempo.")
+    st.markdown(
+        "- Weather: 1 SM visibility, 300' overcast; zero moonlight."
+    )
+    st.markdown(
+        "- Direct cause: spatial disorientation; loss of control."
+    )
+    st.markdown(
+        "- Contributing: below-minimum launch, coordination issues."
+    )
+    st.markdown("- Impact: water strike; non-survivable.")
+
+
+# -----------------
+# Layout & sections
+# -----------------
+st.set_page_config(
+    page_title="VIII Congreso Internacional de la Escuela de Helicópteros para las Fuerzas Armadas",
+    page_icon=("icon.png" if os.path.exists("icon.png") else "🚁"),
+    layout="wide",
+    initial_sidebar_state="expanded",
+)
+
+st.markdown(
+    "<h1 style='margin-bottom:6px'>"
+    "VIII Congreso Internacional de la Escuela de Helicópteros "
+    "para las Fuerzas Armadas"
+    "</h1>",
+    unsafe_allow_html=True,
+)
+st.markdown(
+    "<h2 style='color:#FF4B4B;margin-top:0'>"
+    "Análisis de caso: Rendimiento Humano con Dispositivos de Visión "
+    "Nocturna"
+    "</h2>",
+    unsafe_allow_html=True,
+)
+st.markdown(
+    "<div style='color:#FF4B4B;font-weight:600'>"
+    "Dr Diego Malpica MD - Medicina Aeroespacial"
+    "</div>",
+    unsafe_allow_html=True,
+)
+st.markdown(
+    "<div style='color:#FF4B4B'>"
+    "Dirección de Medicina Aeroespacial"
+    "</div>",
+    unsafe_allow_html=True,
+)
+
+# Default data sources (hidden from sidebar)
+data_csv = "Data.csv"
+kml_file = "MOJO69 Flight Path.kml"
+stl_file = "UH-60_Blackhawk.stl"
+
+
+# Sidebar controls (no data source inputs)
+with st.sidebar:
+    if os.path.exists("icon.png"):
+        st.image("icon.png", use_container_width=True)
+    st.markdown("### MOJO69 🚁")
+    show_stl = st.checkbox("Mostrar modelo 3D (opcional)", value=False)
+    if show_stl:
+        try:
+            from streamlit_stl import stl_from_file
+            stl_from_file(
+                file_path=stl_file,
+                color="#9aa6b2",
+                auto_rotate=True,
+                height=220,
+            )
+        except Exception:
+            st.caption("UH‑60 STL preview unavailable.")
+    st.markdown("---")
+    catalog = get_flight_catalog()
+    flights = catalog.flights()
+    if len(flights) > 1:
+        st.header("Flight")
+        if len(flights) > 20:
+            flight_query = st.text_input(
+                "Filter flights",
+                placeholder="name or folder",
+                key="flight_filter",
+            )
+            flights = catalog.flights(flight_query) or flights
+        by_id = {f.flight_id: f for f in flights}
+        if "flight_id" not in st.session_state:
+            record = catalog.find(data_csv)
+            if record is not None:
+                st.session_state["flight_id"] = record.flight_id
+        current = st.session_state.get("flight_id")
+        if current and current not in by_id:
+            # Keep the open flight selectable while a filter hides it
+            record = catalog.get(current)
+            if record is not None:
+                by_id = {record.flight_id: record, **by_id}
+        st.selectbox(
+            "Flight",
+            options=list(by_id),
+            format_func=lambda i: by_id[i].label,
+            key="flight_id",
+            on_change=lambda: st.session_state.pop("time_window", None),
+        )
+        picked = by_id[st.session_state["flight_id"]]
+        data_csv = picked.csv_path
+        # Never fall back to another sortie's track
+        kml_file = picked.kml_path
+    st.header("Filters")
+    flight = load_flight(data_csv)
+    t_min = flight.t_min
+    t_max = flight.t_max
+    default_lo = max(t_min, 72988)
+    default_hi = min(t_max, 73299)
+    if default_lo >= default_hi:
+        default_lo, default_hi = t_min, t_max
+    lo, hi = st.session_state.get("time_window", (t_min, t_max))
+    if not t_min <= lo <= hi <= t_max:
+        st.session_state.pop("time_window", None)
+    if "time_window" not in st.session_state:
+        st.session_state["time_window"] = (default_lo, default_hi)
+    sel = st.slider(
+        "Time window (s)",
+        min_value=t_min,
+        max_value=t_max,
+        step=1,
+        key="time_window",
+    )
+    query = st.text_input(
+        "Search transcripts",
+        placeholder="e.g. climb, dark, clim*",
+        key="transcript_query",
+    )
+    if query.strip():
+        tindex = load_transcript_index(data_csv)
+        hit_ids = tindex.search(query, limit=25)
+        if not hit_ids:
+            st.caption("No matching transmissions.")
+        for doc_id in hit_ids:
+            doc = tindex.docs[doc_id]
+            st.button(
+                f"{doc.time_str} {doc.crew or 'Crew'}: {doc.text[:48]}",
+                key=f"transcript_hit_{doc_id}",
+                on_click=jump_time_window,
+                args=(doc.t_seconds, t_min, t_max),
+                use_container_width=True,
+            )
+    st.markdown("---")
+    st.header("Live telemetry")
+    live_mode = st.checkbox(
+        "Live mode (stream instead of Data.csv)", value=False,
+        key="live_mode",
+    )
+    if live_mode:
+        st.caption(f"Source: {LIVE_SOURCE} (set AVIAT_LIVE_SOURCE)")
+        live_span = st.slider(
+            "Live span (s)", 60, 1800, 300, step=60, key="live_span"
+        )
+    st.markdown("---")
+    st.header("Visibility")
+    show_map = st.checkbox("Show flight path map", value=True)
+    show_gauges = st.checkbox("Show summary gauges (simple)", value=False)
+    show_extra = st.checkbox("Show extra plots", value=True)
+    if show_extra:
+        show_vsi = st.checkbox("Vertical Speed plot", value=True)
+        show_torques = st.checkbox("Engine Torques plots", value=True)
+    else:
+        show_vsi = False
+        show_torques = False
+    st.markdown("---")
+    st.header("Panels")
+    show_transcripts = st.checkbox("Transcripciones", value=False)
+    pos_transcripts = st.selectbox(
+        "Posición de transcripciones",
+        ["Right column", "Below charts"],
+        index=0,
+    )
+    show_context = st.checkbox("Contexto del accidente", value=False)
+    pos_context = st.selectbox(
+        "Posición del contexto",
+        ["Right column", "Below charts"],
+        index=0,
+    )
+    show_timeline_panel = st.checkbox(
+        "Mostrar línea de tiempo (español)", value=True
+    )
+    show_fleet = st.checkbox("Fleet statistics", value=False)
+    st.markdown("---")
+    st.header("Weather chart")
+    show_weather_chart = st.checkbox(
+        "Show weather (visibility & ceiling)", value=True
+    )
+
+
+# Top row: two columns with charts/gauges and transcripts/context
+col_left, col_right = st.columns([2.2, 1.3], gap="large")
+
+with col_left:
+    lo, hi = sel
+    if live_mode:
+        live_panel(live_span, show_vsi, show_torques)
+    else:
+        telemetry_panel(data_csv, lo, hi, show_vsi, show_torques)
+
+    # Flight path map directly under charts in the left column
+    if show_map:
+        map_panel(kml_file)
+
+    # Optional simple summary gauges (ECharts minimal rings)
+    if show_gauges:
+        gauges_panel(data_csv, lo, hi)
+
+    # Weather chart (below plots)
+    if show_weather_chart:
+        weather_panel("ROI_UH60 (1).md")
+
+    if show_fleet:
+        fleet_panel()
 
     # NVG/SD article as clean Markdown (Spanish)
     article_md = """
@@ -1126,62 +1678,12 @@ Volar con NVG incrementa el riesgo por limitaciones físicas del sistema y del p
 
 with col_right:
     if show_transcripts and pos_transcripts == "Right column":
-        st.subheader("Transcripts")
-        transcripts_box = st.container(border=True)
-        with transcripts_box:
-            if 'transcript' in df.columns:
-                sample = (
-                    df[['time_str', 'crew', 'transcript']]
-                    .dropna(subset=['transcript'])
-                    .head(50)
-                    .reset_index(drop=True)
-                )
-                st.markdown(
-                    "<div style='max-height:420px; overflow:auto;"
-                    " padding-right:8px'>",
-                    unsafe_allow_html=True,
-                )
-                for _, row in sample.iterrows():
-                    crew = str(row.get('crew', '') or '').strip() or "Crew"
-                    text = (
-                        str(row.get('transcript', '') or '')
-                        .strip()
-                        .strip('"')
-                    )
-                    st.markdown(f"**[{row['time_str']}] {crew}**  ")
-                    st.markdown(f"{text}")
-                st.markdown("</div>", unsafe_allow_html=True)
-            else:
-                st.caption("No transcript column found in CSV.")
+        transcripts_panel(data_csv, lo, hi)
         st.markdown("---")
     if show_context and pos_context == "Right column":
         st.subheader("Accident context 🛬")
     if show_timeline_panel:
-        st.markdown("---")
-        st.subheader("Línea de tiempo ✈️")
-        events = load_timeline_md("Línea de tiempo.md")
-        if events:
-            st.markdown(
-                "<div style='max-height:420px; overflow:auto;"
-                " padding-right:8px'>",
-                unsafe_allow_html=True,
-            )
-            for ev in events:
-                st.markdown(f"- {ev}")
-            st.markdown("</div>", unsafe_allow_html=True)
-        else:
-            st.caption("No se encontró la línea de tiempo.")
-        st.markdown(
-            "- Weather: 1 SM visibility, 300' overcast; zero moonlight."
-        )
-        st.markdown(
-            "- Direct cause: spatial disorientation; loss of control."
-        )
-        st.markdown(
-            "- Contributing: below-minimum launch, coordination issues."
-        )
-        st.markdown("- Impact: water strike; non-survivable.")
-
+        timeline_panel("Línea de tiempo.md", lo, hi)
 
 # (Map rendering moved above, within the left column directly under charts.)
 
@@ -0,0 +1,264 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import simulate_blackhawk as sim
+
+
+@dataclass
+class RenderJob:
+    csv_path: Path
+    kml_path: Path
+    output_path: Path
+
+
+@dataclass
+class JobResult:
+    csv_path: str
+    output_path: str
+    frames: int
+    seconds: float
+    error: Optional[str] = None
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+
+def read_manifest(manifest_path: Path) -> List[RenderJob]:
+    """
+    Read a CSV manifest with columns csv, kml, output (one sortie per row).
+    Relative paths are resolved against the manifest's directory.
+    """
+    base = manifest_path.resolve().parent
+
+    def resolve(value: str) -> Path:
+        p = Path(value.strip()).expanduser()
+        return p if p.is_absolute() else (base / p).resolve()
+
+    jobs: List[RenderJob] = []
+    with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        missing = {"csv", "kml", "output"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(
+                "Manifest missing column(s): " + ", ".join(sorted(missing))
+            )
+        for row in reader:
+            if not (row.get("csv") or "").strip():
+                continue
+            jobs.append(
+                RenderJob(
+                    csv_path=resolve(row["csv"]),
+                    kml_path=resolve(row["kml"]),
+                    output_path=resolve(row["output"]),
+                )
+            )
+    return jobs
+
+
+# Per-worker mesh, loaded once by the pool initializer and shared by every
+# job that worker runs. An initializer that raised would break the whole
+# pool, so its error is kept here and reported by each job instead.
+_worker_mesh = None
+_worker_init_error: Optional[str] = None
+
+
+def _init_worker(
+    stl_path: str,
+    model_scale: float,
+    mesh_cache_dir: Optional[str],
+) -> None:
+    global _worker_mesh, _worker_init_error
+    try:
+        _worker_mesh = sim.load_mesh(
+            Path(stl_path),
+            model_scale,
+            cache_dir=Path(mesh_cache_dir) if mesh_cache_dir else None,
+        )
+    except (Exception, SystemExit) as exc:
+        _worker_init_error = (
+            f"worker init failed: {type(exc).__name__}: {exc}"
+        )
+
+
+def _run_job(job: RenderJob) -> JobResult:
+    start = time.perf_counter()
+    if _worker_init_error is not None:
+        return JobResult(
+            csv_path=str(job.csv_path),
+            output_path=str(job.output_path),
+            frames=0,
+            seconds=0.0,
+            error=_worker_init_error,
+        )
+    try:
+        job.output_path.parent.mkdir(parents=True, exist_ok=True)
+        frames = sim.run_simulation(
+            csv_path=job.csv_path,
+            kml_path=job.kml_path,
+            stl_path=Path(),
+            offscreen=True,
+            movie_path=job.output_path,
+            mesh=_worker_mesh,
+        )
+        error = None
+    except (Exception, SystemExit) as exc:
+        frames = 0
+        error = f"{type(exc).__name__}: {exc}"
+    return JobResult(
+        csv_path=str(job.csv_path),
+        output_path=str(job.output_path),
+        frames=int(frames),
+        seconds=time.perf_counter() - start,
+        error=error,
+    )
+
+
+def run_batch(
+    jobs: List[RenderJob],
+    stl_path: Path,
+    model_scale: float = 1.0,
+    workers: Optional[int] = None,
+    mesh_cache_dir: Optional[Path] = None,
+) -> List[JobResult]:
+    """Render all jobs offscreen in a process pool, printing each result."""
+    results: List[JobResult] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(
+            str(stl_path),
+            float(model_scale),
+            str(mesh_cache_dir) if mesh_cache_dir else None,
+        ),
+    ) as pool:
+        futures = {pool.submit(_run_job, job): job for job in jobs}
+        for fut in as_completed(futures):
+            try:
+                res = fut.result()
+            except BrokenProcessPool as exc:
+                # A worker died (e.g. crashed in VTK); its jobs and any
+                # still queued cannot finish
+                job = futures[fut]
+                res = JobResult(
+                    csv_path=str(job.csv_path),
+                    output_path=str(job.output_path),
+                    frames=0,
+                    seconds=0.0,
+                    error=f"BrokenProcessPool: {exc}",
+                )
+            results.append(res)
+            if res.error:
+                print(
+                    f"FAIL {res.csv_path}: {res.error}",
+                    file=sys.stderr,
+                )
+            else:
+                print(
+                    f"done {res.output_path}: {res.frames} frames in "
+                    f"{res.seconds:.1f}s ({res.fps:.1f} fps)"
+                )
+    return results
+
+
+def make_parser() -> argparse.ArgumentParser:
+    workspace = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(
+        description=(
+            "Render review videos for many sorties offscreen, in parallel."
+        ),
+    )
+    parser.add_argument(
+        "manifest",
+        help="CSV manifest with columns csv, kml, output",
+    )
+    parser.add_argument(
+        "--stl",
+        default=str(workspace / "UH-60_Blackhawk.stl"),
+        help="Aircraft STL model shared by all jobs",
+    )
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--mesh-cache",
+        default=str(sim.default_mesh_cache_dir()),
+        help="Mesh cache directory, or 'off'",
+    )
+    parser.add_argument(
+        "--report",
+        help="Write per-job timings and throughput to this JSON file",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    try:
+        jobs = read_manifest(Path(args.manifest))
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    if not jobs:
+        print("Manifest has no jobs.", file=sys.stderr)
+        return 1
+
+    stl_path = Path(args.stl).expanduser().resolve()
+    if not stl_path.exists():
+        print(f"Missing STL at {stl_path}", file=sys.stderr)
+        return 1
+    mesh_cache_dir = None
+    if args.mesh_cache.lower() not in {"0", "false", "no", "off"}:
+        mesh_cache_dir = Path(args.mesh_cache).expanduser().resolve()
+
+    workers = max(1, min(int(args.workers), len(jobs)))
+    start = time.perf_counter()
+    results = run_batch(
+        jobs,
+        stl_path=stl_path,
+        model_scale=float(args.scale),
+        workers=workers,
+        mesh_cache_dir=mesh_cache_dir,
+    )
+    wall = time.perf_counter() - start
+
+    ok = [r for r in results if not r.error]
+    frames = sum(r.frames for r in ok)
+    print(
+        f"\n{len(ok)}/{len(results)} jobs OK with {workers} worker(s) in "
+        f"{wall:.1f}s: {len(ok) / wall * 60.0:.2f} jobs/min, "
+        f"{frames / wall:.1f} frames/s"
+    )
+
+    if args.report:
+        report = {
+            "workers": workers,
+            "wall_seconds": wall,
+            "jobs_ok": len(ok),
+            "jobs_failed": len(results) - len(ok),
+            "frames": frames,
+            "frames_per_second": frames / wall,
+            "jobs": [
+                {**asdict(r), "fps": r.fps} for r in results
+            ],
+        }
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if len(ok) == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
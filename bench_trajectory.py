@@ -0,0 +1,333 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import simulate_blackhawk as sim
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+BASELINE_VERSION = 1
+
+# Around the MOJO 69 track near Hurlburt Field
+ORIGIN_LON = -86.69
+ORIGIN_LAT = 30.42
+
+
+@dataclass
+class Track:
+    lonlat: np.ndarray
+    path_xy: np.ndarray
+    positions: np.ndarray
+    times: np.ndarray
+    ground_speed_ms: np.ndarray
+
+
+@dataclass
+class BenchResult:
+    function: str
+    samples: int
+    seconds: float
+    rounds: int
+    peak_mb: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.function}[{self.samples}]"
+
+    @property
+    def ns_per_sample(self) -> float:
+        return self.seconds * 1e9 / max(self.samples, 1)
+
+
+def synthetic_track(n: int, seed: int = 0) -> Track:
+    """
+    A smooth, wandering low-level track of n samples at 1 Hz: heading and
+    speed drift randomly, altitude follows a slow oscillation.
+    """
+    rng = np.random.default_rng(seed)
+    times = np.arange(n, dtype=float)
+    heading = np.cumsum(rng.normal(0.0, 0.02, n))
+    speed = np.clip(30.0 + np.cumsum(rng.normal(0.0, 0.1, n)), 5.0, 80.0)
+    x = np.cumsum(speed * np.sin(heading))
+    y = np.cumsum(speed * np.cos(heading))
+    z = 60.0 + 30.0 * np.sin(times / 90.0)
+    path_xy = np.column_stack([x, y])
+    # Small-offset inverse of an equirectangular projection is plenty here
+    lat = ORIGIN_LAT + y / 111_320.0
+    lon = ORIGIN_LON + x / (111_320.0 * np.cos(np.radians(ORIGIN_LAT)))
+    return Track(
+        lonlat=np.column_stack([lon, lat]),
+        path_xy=path_xy,
+        positions=np.column_stack([x, y, z]),
+        times=times,
+        ground_speed_ms=speed,
+    )
+
+
+def benchmark_cases(track: Track) -> Dict[str, Callable[[], object]]:
+    s_path = sim.compute_arclength(track.path_xy)
+    s_query = np.linspace(0.0, float(s_path[-1]), len(s_path))
+    return {
+        "compute_arclength": lambda: sim.compute_arclength(track.path_xy),
+        "interpolate_polyline": lambda: sim.interpolate_polyline(
+            track.positions, s_path, s_query
+        ),
+        "resample_path_by_speed": lambda: sim.resample_path_by_speed(
+            track.path_xy, track.times, track.ground_speed_ms
+        ),
+        "compute_orientation": lambda: sim.compute_orientation(
+            track.positions, track.ground_speed_ms
+        ),
+        "project_lonlat_to_local_xy": lambda: sim.project_lonlat_to_local_xy(
+            track.lonlat, ORIGIN_LON, ORIGIN_LAT
+        ),
+    }
+
+
+def time_call(
+    fn: Callable[[], object],
+    min_time: float = 0.2,
+    max_rounds: int = 50,
+) -> Tuple[float, int]:
+    """Best-of-rounds wall time; small inputs get more rounds."""
+    fn()  # warm-up: imports, allocator, CPU caches
+    best = float("inf")
+    rounds = 0
+    total = 0.0
+    while rounds < max_rounds and (rounds < 3 or total < min_time):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        rounds += 1
+    return best, rounds
+
+
+def peak_memory_mb(fn: Callable[[], object]) -> float:
+    """Peak traced allocation during one call (NumPy buffers included)."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    return (peak - base) / (1024 * 1024)
+
+
+def run_benchmarks(
+    sizes: List[int],
+    functions: Optional[List[str]] = None,
+    seed: int = 0,
+    min_time: float = 0.2,
+) -> List[BenchResult]:
+    results: List[BenchResult] = []
+    for n in sizes:
+        track = synthetic_track(n, seed)
+        cases = benchmark_cases(track)
+        for name, fn in cases.items():
+            if functions and name not in functions:
+                continue
+            seconds, rounds = time_call(fn, min_time=min_time)
+            res = BenchResult(
+                function=name,
+                samples=n,
+                seconds=seconds,
+                rounds=rounds,
+                peak_mb=peak_memory_mb(fn),
+            )
+            results.append(res)
+            print(
+                f"{res.key:<38}{res.seconds * 1e3:>11.3f} ms"
+                f"{res.ns_per_sample:>9.1f} ns/sample"
+                f"{res.peak_mb:>10.1f} MB peak  ({res.rounds} rounds)"
+            )
+        del track, cases
+    return results
+
+
+def save_baseline(path: str, results: List[BenchResult]) -> None:
+    data = {
+        "baseline_version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": {r.key: asdict(r) for r in results},
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def compare_to_baseline(
+    results: List[BenchResult],
+    baseline: dict,
+    time_tolerance: float,
+    mem_tolerance: float,
+    min_seconds: float = 1e-4,
+) -> List[str]:
+    """
+    Regressions relative to the stored baseline. Timings under min_seconds
+    are too noisy to judge and are only checked for memory.
+    """
+    stored = baseline.get("results", {})
+    regressions: List[str] = []
+    for r in results:
+        base = stored.get(r.key)
+        if base is None:
+            continue
+        base_s = float(base["seconds"])
+        if (
+            max(base_s, r.seconds) >= min_seconds
+            and r.seconds > base_s * (1.0 + time_tolerance)
+        ):
+            regressions.append(
+                f"{r.key}: {r.seconds * 1e3:.3f} ms vs baseline "
+                f"{base_s * 1e3:.3f} ms "
+                f"(+{(r.seconds / base_s - 1.0) * 100.0:.0f}%)"
+            )
+        base_mb = float(base["peak_mb"])
+        # 1 MB slack so tiny inputs do not trip on allocator noise
+        if r.peak_mb > base_mb * (1.0 + mem_tolerance) + 1.0:
+            regressions.append(
+                f"{r.key}: {r.peak_mb:.1f} MB peak vs baseline "
+                f"{base_mb:.1f} MB"
+            )
+    return regressions
+
+
+def default_baseline_path() -> str:
+    """$AVIAT_BENCH_BASELINE (e.g. a CI artifact), else a local file."""
+    return os.environ.get("AVIAT_BENCH_BASELINE") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        ".cache",
+        "bench_trajectory.json",
+    )
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time and memory microbenchmarks for the trajectory math in "
+            "simulate_blackhawk on synthetic tracks."
+        ),
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda v: [int(float(x)) for x in v.split(",") if x],
+        default=list(DEFAULT_SIZES),
+        help="Comma-separated sample counts (default: 1e3,...,1e7)",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=float,
+        help="Drop sizes above this, e.g. 1e6 for a quick run",
+    )
+    parser.add_argument(
+        "--function",
+        action="append",
+        dest="functions",
+        help="Only run this function (repeatable)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum total seconds of timed rounds per case",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=default_baseline_path(),
+        help=(
+            "Baseline JSON to compare against or write (default: "
+            "$AVIAT_BENCH_BASELINE or .cache/bench_trajectory.json)"
+        ),
+    )
+    parser.add_argument(
+        "--allow-missing-baseline",
+        action="store_true",
+        help="Exit 0 instead of 2 when there is no baseline to compare",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write this run as the new baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed slowdown before failing (default: 0.5 = 50%%)",
+    )
+    parser.add_argument(
+        "--mem-tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed peak-memory growth before failing (default: 0.10)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    sizes = sorted(set(args.sizes))
+    if args.max_size is not None:
+        sizes = [n for n in sizes if n <= args.max_size]
+    if not sizes or min(sizes) < 3:
+        print("Sizes must be >= 3 samples.", file=sys.stderr)
+        return 2
+
+    results = run_benchmarks(
+        sizes,
+        functions=args.functions,
+        seed=args.seed,
+        min_time=args.min_time,
+    )
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(
+            f"No baseline at {args.baseline}; run with --save-baseline "
+            "first.",
+            file=sys.stderr,
+        )
+        return 0 if args.allow_missing_baseline else 2
+    except (OSError, ValueError) as e:
+        print(f"Unreadable baseline {args.baseline}: {e}", file=sys.stderr)
+        return 2
+
+    regressions = compare_to_baseline(
+        results, baseline, args.time_tolerance, args.mem_tolerance
+    )
+    if regressions:
+        print("Regressions against baseline:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -76,9 +76,127 @@
   let lastTs = 0;
   let lastSliderSecProcessed = NaN;
   let lastMetricsSecPushed = NaN;
+  let stream = null; // WebSocket to dashboard_server.py, null when served statically
+  let transcriptLines = null; // [{t, crew, text}] from data.bin, sorted by t
 
   // d3 is provided via script tag
 
+  // Server mode (dashboard_server.py): the recording stays on the server and
+  // frames arrive over a WebSocket. Resolves with the meta message, or null
+  // under a plain static server so the CSV path below is used instead.
+  function connectStream() {
+    if (!('WebSocket' in window) || !/^https?:$/.test(location.protocol)) return Promise.resolve(null);
+    return new Promise((resolve) => {
+      let ws;
+      try {
+        ws = new WebSocket(`${location.protocol === 'https:' ? 'wss' : 'ws'}://${location.host}/ws`);
+      } catch { resolve(null); return; }
+      const timer = setTimeout(() => { try { ws.close(); } catch {} resolve(null); }, 1500);
+      ws.onerror = () => { clearTimeout(timer); resolve(null); };
+      ws.onmessage = (ev) => {
+        let msg = null;
+        try { msg = JSON.parse(ev.data); } catch {}
+        if (!msg || msg.type !== 'meta') return;
+        clearTimeout(timer);
+        stream = ws;
+        ws.onerror = null;
+        ws.onmessage = onStreamMessage;
+        ws.onclose = () => {
+          stream = null;
+          playing = false;
+          playBtn.textContent = '▶';
+          setPausedCss(true);
+        };
+        resolve(msg);
+      };
+    });
+  }
+
+  function streamSend(msg) {
+    if (stream && stream.readyState === 1) stream.send(JSON.stringify(msg));
+  }
+
+  function onStreamMessage(ev) {
+    let msg;
+    try { msg = JSON.parse(ev.data); } catch { return; }
+    if (msg.type === 'frame') applyFrame(msg);
+    else if (msg.type === 'ended') {
+      playing = false;
+      playBtn.textContent = '▶';
+      setPausedCss(true);
+    }
+  }
+
+  // Frame pushed by the server: row nearest to msg.t plus nearby transcript
+  function applyFrame(msg) {
+    const sec = msg.t;
+    slider.value = sec;
+    setClock(sec);
+    renderTranscript(sec, msg.transcripts);
+    updateEvent(sec);
+    updateCursor(sec);
+    if (!hasStarted) { updateStats(null, sec); return; }
+    sendMetrics(msg.row);
+    updateStats(msg.row, sec);
+  }
+
+  // Overview columns from the meta message as chart records
+  function recordsFromSeries(series) {
+    const out = [];
+    for (let i = 0; i < series._t.length; i++) {
+      const r = { _t: series._t[i] };
+      for (const k of Object.keys(series)) if (k !== '_t') r[k] = series[k][i];
+      out.push(r);
+    }
+    return out;
+  }
+
+  // Compact bundle from dashboard_server.py (data.bin): "AVD1", uint32 header
+  // length, JSON header (columns, timeline, transcripts), then one
+  // little-endian int32/float32 column per channel. Null when not served.
+  async function loadDataBundle() {
+    try {
+      const resp = await fetch('data.bin');
+      if (!resp.ok) return null;
+      const buf = await resp.arrayBuffer();
+      if (buf.byteLength < 8 || String.fromCharCode(...new Uint8Array(buf, 0, 4)) !== 'AVD1') return null;
+      const headerLen = new DataView(buf).getUint32(4, true);
+      const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buf, 8, headerLen)));
+      const types = { int32: Int32Array, float32: Float32Array, uint16: Uint16Array };
+      const cols = {};
+      let offset = 8 + headerLen;
+      for (const col of header.columns) {
+        const Arr = types[col.dtype];
+        const n = col.length ?? header.rows;
+        const k = Arr.BYTES_PER_ELEMENT;
+        // Undo the byte shuffle: byte j of element i sits at j*n + i
+        const src = new Uint8Array(buf, offset, n * k);
+        const dst = new Uint8Array(n * k);
+        for (let j = 0; j < k; j++) {
+          for (let i = 0; i < n; i++) dst[i * k + j] = src[j * n + i];
+        }
+        const arr = new Arr(dst.buffer);
+        if (col.delta) for (let i = 1; i < n; i++) arr[i] += arr[i - 1];
+        cols[col.name] = arr;
+        offset += n * k;
+      }
+      const series = {};
+      for (const col of header.columns) {
+        if (col.name.startsWith('tx_')) continue;
+        series[col.name] = Array.from(cols[col.name], v => Number.isNaN(v) ? null : v);
+      }
+      // Transcripts: parallel time/crew/text columns indexing the string table
+      const strings = header.strings || [];
+      const transcripts = Array.from(cols.tx_t || [], (t, i) => ({
+        t, crew: strings[cols.tx_crew[i]], text: strings[cols.tx_text[i]]
+      }));
+      return { series, timeline: header.timeline, transcripts };
+    } catch (err) {
+      if (DEBUG) console.error('data.bin unavailable', err);
+      return null;
+    }
+  }
+
   // CSV parsing with fallback if PapaParse is unavailable
   function loadCSV() {
     // Preferred: PapaParse (robust, handles quotes and edge-cases)
@@ -237,35 +355,39 @@
     });
   }
 
-  function renderTranscript(nowSec) {
-    // Show transcript lines within +- 15s window, highlight current second matches
-    const near = records.filter(r => Math.abs(r._t - nowSec) <= 15 && r.Transcripts && r.Transcripts.trim());
+  function renderTranscript(nowSec, lines) {
+    // Show transcript lines within +- 15s window, highlight current second matches.
+    // In server mode the frame carries these lines already as {t, crew, text}.
+    const near = lines
+      || (transcriptLines && transcriptLines.filter(l => Math.abs(l.t - nowSec) <= 15))
+      || records.filter(r => Math.abs(r._t - nowSec) <= 15 && r.Transcripts && r.Transcripts.trim())
+      .map(r => ({ t: r._t, crew: r.Crew, text: r.Transcripts }));
     transcriptEl.innerHTML = '';
     let latestSaid = null;
     
     near.forEach(r => {
       const div = document.createElement('div');
-      div.className = 'line' + (Math.abs(r._t - nowSec) <= 1 ? ' now' : '');
-      const time = `${(r.Local_Hour||0).toString().padStart(2,'0')}:${(r.Local_Minute||0).toString().padStart(2,'0')}:${(r.Local_Second||0).toString().padStart(2,'0')}`;
+      div.className = 'line' + (Math.abs(r.t - nowSec) <= 1 ? ' now' : '');
+      const time = timeToLabel(r.t || 0);
       
       // Clean up transcript text - remove quotes and extra whitespace
-      let transcript = (r.Transcripts || '').replace(/^["'"]+|["'"]+$/g, '').trim();
-      let crew = (r.Crew || '').trim() || 'Unknown';
+      let transcript = (r.text || '').replace(/^["'"]+|["'"]+$/g, '').trim();
+      let crew = (r.crew || '').trim() || 'Unknown';
       
       div.innerHTML = `<div class="t">${time}</div><div class="crew">${crew}</div><div class="say">${transcript}</div>`;
       transcriptEl.appendChild(div);
       
-      if (Math.abs((r._t||0) - nowSec) <= 2) latestSaid = r;
+      if (Math.abs((r.t||0) - nowSec) <= 2) latestSaid = r;
     });
     
     renderCommsBubble(latestSaid);
   }
 
-  function renderCommsBubble(row) {
+  function renderCommsBubble(line) {
     if (!commsBubble) return;
-    if (!row || !row.Transcripts) { commsBubble.classList.remove('show'); return; }
-    const crew = (row.Crew||'').toString().trim();
-    const said = (row.Transcripts||'').toString().replace(/^"+|"+$/g,'');
+    if (!line || !line.text) { commsBubble.classList.remove('show'); return; }
+    const crew = (line.crew||'').toString().trim();
+    const said = (line.text||'').toString().replace(/^"+|"+$/g,'');
     commsBubble.innerHTML = `<div class="crew">${crew}</div><div class="text">${said}</div>`;
     commsBubble.classList.add('show');
   }
@@ -412,6 +534,14 @@
   function onSlider() {
     const sec = +slider.value;
     
+    // Server mode: the seek is answered with a frame, rendered by applyFrame
+    if (stream) {
+      setClock(sec);
+      updateCursor(sec);
+      streamSend({ type: 'seek', t: sec });
+      return;
+    }
+
     // Always update non-gauge UI elements
     setClock(sec);
     renderTranscript(sec);
@@ -448,20 +578,31 @@
   const recordsBySecond = new Map();
 
   async function init() {
-    console.log('Loading CSV data...');
-    const csv = await loadCSV();
-    console.log(`Loaded ${csv.length} CSV records`);
+    const meta = await connectStream();
+    const bundle = meta ? null : await loadDataBundle();
+    if (meta) {
+      console.log(`Streaming from server: ${meta.series._t.length} overview points`);
+      records = recordsFromSeries(meta.series);
+    } else if (bundle) {
+      console.log(`Loaded data.bin: ${bundle.series._t.length} records`);
+      records = recordsFromSeries(bundle.series);
+      transcriptLines = bundle.transcripts;
+    } else {
+      console.log('Loading CSV data...');
+      const csv = await loadCSV();
+      console.log(`Loaded ${csv.length} CSV records`);
     
-    records = csv.map(r => {
-      // normalize keys (remove spaces)
-      const rr = Object.assign({}, r, {
-        Local_Hour: r['Local Hour'],
-        Local_Minute: r['Local Minute'],
-        Local_Second: r['Local Second'],
-      });
-      rr._t = (rr.Local_Hour||0)*3600 + (rr.Local_Minute||0)*60 + (rr.Local_Second||0);
-      return rr;
-    }).sort((a,b)=>a._t-b._t);
+      records = csv.map(r => {
+        // normalize keys (remove spaces)
+        const rr = Object.assign({}, r, {
+          Local_Hour: r['Local Hour'],
+          Local_Minute: r['Local Minute'],
+          Local_Second: r['Local Second'],
+        });
+        rr._t = (rr.Local_Hour||0)*3600 + (rr.Local_Minute||0)*60 + (rr.Local_Second||0);
+        return rr;
+      }).sort((a,b)=>a._t-b._t);
+    }
 
     records.forEach(r => { recordsBySecond.set(r._t, r); });
 
@@ -472,7 +613,7 @@
     slider.min = tMin; slider.max = tMax; slider.value = tMin;
     setClock(tMin);
 
-    timeline = await loadTimeline();
+    timeline = meta ? meta.timeline : bundle ? bundle.timeline : await loadTimeline();
     computeMovementWindow();
     highlights = extractHighlightsFromMarkdown(timeline);
     window.highlights = highlights;
@@ -526,6 +667,12 @@
         onSlider();
         playing = !playing;
         playBtn.textContent = playing ? '❚❚' : '▶';
+        if (stream) {
+          // Server paces playback and pushes one frame per recorded second
+          streamSend(playing ? { type: 'play', speed: parseFloat(speedSel.value) } : { type: 'pause' });
+          setPausedCss(!playing);
+          return;
+        }
         if (!playing) {
           cancelAnimationFrame(rafId);
           cancelGaugeTransitions();
@@ -548,6 +695,7 @@
         cancelGaugeTransitions();
         setPausedCss(true);
         slider.value = Math.round(tMin);
+        streamSend({ type: 'stop' });
         
         // Manually reset UI to initial state
         const initialTime = tMin || 0;
@@ -560,6 +708,12 @@
       });
     }
 
+    if (speedSel) {
+      speedSel.addEventListener('change', () => {
+        streamSend({ type: 'speed', speed: parseFloat(speedSel.value) });
+      });
+    }
+
     // keyboard shortcuts
     window.addEventListener('keydown', (e) => {
       const tag = (e.target && e.target.tagName) ? e.target.tagName.toUpperCase() : '';
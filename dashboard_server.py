@@ -0,0 +1,818 @@
+import argparse
+import asyncio
+import base64
+import bisect
+import csv
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+import doc_index
+import telemetry_stream
+import transcript_search
+
+
+WORKSPACE = os.path.dirname(os.path.abspath(__file__))
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_MAX_MESSAGE = 1 << 16
+MAX_HEADER_BYTES = 1 << 16
+
+# Channel -> CSV column name the dashboard reads from each row
+ROW_FIELDS = {ch: name for name, ch in telemetry_stream.CSV_FIELDS.items()}
+
+TRANSCRIPT_SPAN_S = 15
+SPEED_MIN = 0.05
+SPEED_MAX = 64.0
+OVERVIEW_POINTS = 1500
+
+COMPRESSIBLE = (
+    "text/",
+    "application/octet-stream",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "application/vnd.google-earth.kml+xml",
+    "image/svg+xml",
+)
+
+mimetypes.add_type("text/markdown", ".md")
+mimetypes.add_type("application/vnd.google-earth.kml+xml", ".kml")
+mimetypes.add_type("application/javascript", ".js")
+
+
+class Recording:
+    """
+    One sortie preprocessed for playback: channel arrays sorted by time,
+    a per-second frame index (row nearest to each whole second), the
+    transcript lines and the timeline events. Seeks are array lookups.
+    """
+
+    def __init__(self, csv_path: str, timeline_path: Optional[str] = None):
+        # csv.reader, not splitlines: quoted transcripts may span lines
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            records = csv.reader(f)
+            parser = telemetry_stream.RowParser(next(records, []))
+            rows = parser.parse_rows(records)
+        if not len(rows):
+            raise ValueError(f"No telemetry rows in {csv_path}")
+        rows = rows[np.argsort(rows[:, 0], kind="stable")]
+        self.columns = {
+            ch: rows[:, i]
+            for i, ch in enumerate(telemetry_stream.CHANNELS)
+            if ch in ROW_FIELDS or ch == "t_seconds"
+        }
+        t = self.columns["t_seconds"].astype(np.int64)
+        self.t_min = int(t[0])
+        self.t_max = int(t[-1])
+
+        # Row nearest to each whole second, ties going to the earlier row
+        seconds = np.arange(self.t_min, self.t_max + 1)
+        right = np.clip(np.searchsorted(t, seconds), 0, len(t) - 1)
+        left = np.clip(right - 1, 0, len(t) - 1)
+        take_left = np.abs(seconds - t[left]) <= np.abs(t[right] - seconds)
+        self.frame_rows = np.where(take_left, left, right).astype(np.int32)
+
+        docs = transcript_search.read_transmissions(csv_path)
+        self.transcripts = sorted(docs, key=lambda d: d.t_seconds)
+        self._transcript_times = [d.t_seconds for d in self.transcripts]
+
+        self.events: List[dict] = []
+        if timeline_path and os.path.exists(timeline_path):
+            index = doc_index.load_index(timeline_path)
+            # Same events the dashboard's own markdown parser picks up
+            self.events = [
+                {"t": ev.t_seconds, "text": ev.text}
+                for ev in sorted(index.events, key=lambda e: e.t_seconds)
+                if len(ev.time_str) == 8
+            ]
+
+    def clamp(self, t: float) -> int:
+        return min(max(int(round(t)), self.t_min), self.t_max)
+
+    def row(self, i: int) -> Dict[str, Optional[float]]:
+        out: Dict[str, Optional[float]] = {
+            "_t": int(self.columns["t_seconds"][i])
+        }
+        for ch, name in ROW_FIELDS.items():
+            v = float(self.columns[ch][i])
+            out[name] = None if np.isnan(v) else v
+        return out
+
+    def frame(self, t: int) -> dict:
+        t = self.clamp(t)
+        lo = bisect.bisect_left(self._transcript_times, t - TRANSCRIPT_SPAN_S)
+        hi = bisect.bisect_right(self._transcript_times, t + TRANSCRIPT_SPAN_S)
+        return {
+            "type": "frame",
+            "t": t,
+            "row": self.row(int(self.frame_rows[t - self.t_min])),
+            "transcripts": [
+                {"t": d.t_seconds, "crew": d.crew, "text": d.text}
+                for d in self.transcripts[lo:hi]
+            ],
+        }
+
+    def meta(self, max_points: int = OVERVIEW_POINTS) -> dict:
+        """
+        Time range, timeline and a decimated overview of every channel
+        for the chart; the full recording never leaves the server.
+        """
+        n = len(self.columns["t_seconds"])
+        idx = np.unique(
+            np.linspace(0, n - 1, min(n, max_points)).round().astype(int)
+        )
+        series = {"_t": self.columns["t_seconds"][idx].astype(int).tolist()}
+        for ch, name in ROW_FIELDS.items():
+            series[name] = [
+                None if np.isnan(v) else float(v)
+                for v in self.columns[ch][idx]
+            ]
+        return {
+            "type": "meta",
+            "t_min": self.t_min,
+            "t_max": self.t_max,
+            "series": series,
+            "timeline": self.events,
+        }
+
+
+BLOB_MAGIC = b"AVD1"
+
+
+def encode_blob(recording: "Recording") -> bytes:
+    """
+    The whole recording as one compact binary file: magic, a uint32
+    header length, a JSON header (columns, timeline, string table) padded
+    to 4 bytes, then one little-endian column after another. Transcripts
+    are three columns (time, crew and text as indexes into the string
+    table), so repeated crew names and texts are stored once. Time
+    columns are delta-coded and every column is byte-shuffled (all first
+    bytes, then all second bytes, ...), which gzip compresses far better
+    than interleaved float32.
+    """
+    cols = recording.columns
+    strings: List[str] = []
+    interned: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if value not in interned:
+            interned[value] = len(strings)
+            strings.append(value)
+        return interned[value]
+
+    docs = recording.transcripts
+    arrays = [("_t", "int32", cols["t_seconds"].astype("<i4"))] + [
+        (name, "float32", cols[ch].astype("<f4"))
+        for ch, name in ROW_FIELDS.items()
+    ] + [
+        ("tx_t", "int32",
+         np.array([d.t_seconds for d in docs], dtype="<i4")),
+        ("tx_crew", "uint16",
+         np.array([intern(d.crew) for d in docs], dtype="<u2")),
+        ("tx_text", "uint16",
+         np.array([intern(d.text) for d in docs], dtype="<u2")),
+    ]
+    if len(strings) > 0xFFFF:
+        raise ValueError("too many distinct transcript strings")
+    delta = {"_t", "tx_t"}
+    arrays = [
+        (n, d, np.diff(a, prepend=a.dtype.type(0)) if n in delta else a)
+        for n, d, a in arrays
+    ]
+    header = {
+        "version": 2,
+        "rows": int(len(cols["t_seconds"])),
+        "t_min": recording.t_min,
+        "t_max": recording.t_max,
+        "columns": [
+            {
+                "name": n,
+                "dtype": d,
+                "length": int(len(a)),
+                "delta": n in delta,
+            }
+            for n, d, a in arrays
+        ],
+        "timeline": recording.events,
+        "strings": strings,
+    }
+    raw = json.dumps(header, ensure_ascii=False, separators=(",", ":"))
+    head = raw.encode("utf-8")
+    head += b" " * (-(len(head)) % 4)
+    return b"".join(
+        [BLOB_MAGIC, struct.pack("<I", len(head)), head]
+        + [_byte_shuffle(a) for _, _, a in arrays]
+    )
+
+
+def _byte_shuffle(a: np.ndarray) -> bytes:
+    return (
+        np.frombuffer(a.tobytes(), dtype=np.uint8)
+        .reshape(-1, a.dtype.itemsize)
+        .T.tobytes()
+    )
+
+
+@dataclass
+class StaticFile:
+    stamp: Tuple[int, ...]
+    content_type: str
+    body: bytes
+    etag: str
+    # Precompressed representations by content coding ("br", "gzip")
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def version(self) -> str:
+        return self.etag.strip('"')[:12]
+
+
+def default_static_cache_dir() -> str:
+    return os.path.join(WORKSPACE, ".cache", "static")
+
+
+def _content_type(path: str) -> str:
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type.endswith(
+        "javascript"
+    ):
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+# Local src/href attributes in HTML; URLs with a scheme, query or fragment
+# are left alone
+_LINK_RE = re.compile(rb'((?:src|href)=")([^":?#]+)(")')
+
+
+class StaticFiles:
+    """
+    Files under root served with strong ETags. Compressible bodies are
+    precompressed once (gzip, plus brotli when installed) and the encoded
+    copies persisted under cache_dir by content hash, so restarts reuse
+    them. HTML pages get ?v=<hash> appended to local asset links, letting
+    those assets be cached as immutable.
+    """
+
+    def __init__(self, root: str, cache_dir: Optional[str] = None):
+        self.root = os.path.realpath(root)
+        self.cache_dir = cache_dir or default_static_cache_dir()
+        self._cache: Dict[str, StaticFile] = {}
+
+    def resolve(self, url_path: str) -> Optional[str]:
+        rel = unquote(url_path).lstrip("/") or "dashboard.html"
+        parts = rel.split("/")
+        # No dotfiles: keeps .git and .cache private
+        if any(p.startswith(".") for p in parts if p):
+            return None
+        path = os.path.realpath(os.path.join(self.root, *parts))
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(
+            path
+        ):
+            return None
+        return path
+
+    def make_entry(
+        self,
+        body: bytes,
+        content_type: str,
+        stamp: Tuple[int, ...] = (),
+    ) -> StaticFile:
+        digest = hashlib.sha256(body).hexdigest()
+        entry = StaticFile(
+            stamp=stamp,
+            content_type=content_type,
+            body=body,
+            etag=f'"{digest[:20]}"',
+        )
+        if len(body) > 512 and content_type.startswith(COMPRESSIBLE):
+            entry.encoded = self._compress(body, digest)
+        return entry
+
+    def _compress(self, body: bytes, digest: str) -> Dict[str, bytes]:
+        codings = {"gzip": lambda b: gzip.compress(b, 9, mtime=0)}
+        if brotli is not None:
+            codings["br"] = lambda b: brotli.compress(b, quality=11)
+        encoded: Dict[str, bytes] = {}
+        for coding, compress in codings.items():
+            cache_file = os.path.join(self.cache_dir, f"{digest}.{coding}")
+            try:
+                with open(cache_file, "rb") as f:
+                    data = f.read()
+            except OSError:
+                data = compress(body)
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+                    with open(tmp_file, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp_file, cache_file)
+                except OSError:
+                    # Caching is best effort; serve from memory
+                    pass
+            # Not worth a Content-Encoding when it barely shrinks
+            if len(data) < len(body) * 0.9:
+                encoded[coding] = data
+        return encoded
+
+    def get(self, path: str) -> StaticFile:
+        st = os.stat(path)
+        stamp: Tuple[int, ...] = (st.st_mtime_ns, st.st_size)
+        content_type = _content_type(path)
+        html = content_type.startswith("text/html")
+        if html:
+            # A page's body depends on the versions of what it links to
+            with open(path, "rb") as f:
+                body = self._version_links(f.read(), os.path.dirname(path))
+            stamp += (zlib.crc32(body),)
+        cached = self._cache.get(path)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+        if not html:
+            with open(path, "rb") as f:
+                body = f.read()
+        entry = self.make_entry(body, content_type, stamp)
+        self._cache[path] = entry
+        return entry
+
+    def _version_links(self, body: bytes, base: str) -> bytes:
+        def repl(m: "re.Match[bytes]") -> bytes:
+            link = m.group(2).decode("utf-8", errors="replace")
+            path = self.resolve(
+                os.path.relpath(os.path.join(base, unquote(link)), self.root)
+            )
+            if path is None or _content_type(path).startswith("text/html"):
+                return m.group(0)
+            version = self.get(path).version
+            return m.group(1) + f"{link}?v={version}".encode() + m.group(3)
+
+        return _LINK_RE.sub(repl, body)
+
+    def precompress(self) -> int:
+        """Warm the cache for every servable file; returns the count."""
+        count = 0
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if name.startswith(".") or not _content_type(path).startswith(
+                    COMPRESSIBLE
+                ):
+                    continue
+                try:
+                    self.get(path)
+                except OSError:
+                    continue
+                count += 1
+        return count
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Any representation's tag (identity, -gzip, -br) validates the file
+    base = etag[:-1]
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag or (
+            tag.startswith(base + "-") and tag.endswith('"')
+        ):
+            return True
+    return False
+
+
+def _accepts(header: str, coding: str) -> bool:
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def ws_accept_key(key: str) -> str:
+    digest = hashlib.sha1((key + WS_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def ws_encode(opcode: int, payload: bytes) -> bytes:
+    """A single unmasked server frame (RFC 6455 section 5.2)."""
+    n = len(payload)
+    if n < 126:
+        head = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 1 << 16:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return head + payload
+
+
+async def ws_read_frame(
+    reader: asyncio.StreamReader,
+) -> Tuple[bool, int, bytes]:
+    """(fin, opcode, unmasked payload) of the next frame."""
+    b0, b1 = await reader.readexactly(2)
+    n = b1 & 0x7F
+    if n == 126:
+        (n,) = struct.unpack("!H", await reader.readexactly(2))
+    elif n == 127:
+        (n,) = struct.unpack("!Q", await reader.readexactly(8))
+    if n > WS_MAX_MESSAGE:
+        raise ValueError("WebSocket frame too large")
+    mask = await reader.readexactly(4) if b1 & 0x80 else b""
+    payload = await reader.readexactly(n)
+    if mask:
+        key = int.from_bytes((mask * (n // 4 + 1))[:n], "big")
+        payload = (int.from_bytes(payload, "big") ^ key).to_bytes(n, "big")
+    return bool(b0 & 0x80), b0 & 0x0F, payload
+
+
+def _finite(value: object) -> Optional[float]:
+    """A JSON number as a finite float, else None (bools excluded)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    try:
+        value = float(value)
+    except OverflowError:
+        return None
+    return value if np.isfinite(value) else None
+
+
+class PlaybackSession:
+    """
+    One browser's playback state. Frames are pushed at playback rate, one
+    per recorded second; seeks answer immediately with the frame there.
+    """
+
+    def __init__(self, recording: Recording, writer: asyncio.StreamWriter):
+        self.recording = recording
+        self.writer = writer
+        self.t = recording.t_min
+        self.speed = 1.0
+        self._player: Optional[asyncio.Task] = None
+
+    async def send(self, message: dict) -> None:
+        data = json.dumps(message, separators=(",", ":")).encode("utf-8")
+        self.writer.write(ws_encode(0x1, data))
+        await self.writer.drain()
+
+    async def handle(self, message: dict) -> None:
+        """Apply one client message; malformed ones are ignored."""
+        kind = message.get("type")
+        if kind == "seek":
+            t = _finite(message.get("t"))
+            if t is None:
+                return
+            self.t = self.recording.clamp(t)
+            await self.send(self.recording.frame(self.t))
+        elif kind == "play":
+            if "speed" in message:
+                speed = _finite(message["speed"])
+                if speed is None:
+                    return
+                self.speed = min(max(speed, SPEED_MIN), SPEED_MAX)
+            if self.t >= self.recording.t_max:
+                self.t = self.recording.t_min
+            self.stop_player()
+            self._player = asyncio.ensure_future(self._play())
+        elif kind == "speed":
+            speed = _finite(message.get("speed"))
+            if speed is not None:
+                self.speed = min(max(speed, SPEED_MIN), SPEED_MAX)
+        elif kind == "pause":
+            self.stop_player()
+        elif kind == "stop":
+            self.stop_player()
+            self.t = self.recording.t_min
+            await self.send(self.recording.frame(self.t))
+
+    def stop_player(self) -> None:
+        if self._player is not None:
+            self._player.cancel()
+            self._player = None
+
+    async def _play(self) -> None:
+        # Deadline-based pacing so send time does not accumulate as drift
+        deadline = time.monotonic()
+        while True:
+            await self.send(self.recording.frame(self.t))
+            if self.t >= self.recording.t_max:
+                await self.send({"type": "ended", "t": self.t})
+                return
+            self.t += 1
+            deadline += 1.0 / self.speed
+            await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+
+
+class DashboardServer:
+    def __init__(
+        self,
+        root: str,
+        recording: Recording,
+        stream: bool = True,
+        cache_dir: Optional[str] = None,
+    ):
+        self.static = StaticFiles(root, cache_dir)
+        self.recording = recording
+        self.stream = stream
+        self._meta = json.dumps(
+            recording.meta(), separators=(",", ":")
+        ).encode("utf-8")
+        self.data_blob = self.static.make_entry(
+            encode_blob(recording), "application/octet-stream"
+        )
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, b"Headers too large")
+                    return
+                if len(head) > MAX_HEADER_BYTES:
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, b"Bad request")
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                path = urlsplit(target).path
+                if self.stream and path == "/ws" and "websocket" in (
+                    headers.get("upgrade", "").lower()
+                ):
+                    await self._websocket(reader, writer, headers)
+                    return
+                keep_alive = self._keep_alive(version, headers)
+                await self._serve_static(writer, method, target, headers,
+                                         keep_alive)
+                if not keep_alive:
+                    return
+        except (
+            asyncio.IncompleteReadError,
+            ConnectionError,
+            asyncio.CancelledError,
+        ):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+        conn = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return conn == "keep-alive"
+        return conn != "close"
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+        head_only: bool = False,
+        keep_alive: bool = False,
+    ) -> None:
+        reasons = {
+            200: "OK",
+            304: "Not Modified",
+            400: "Bad Request",
+            404: "Not Found",
+            405: "Method Not Allowed",
+            431: "Request Header Fields Too Large",
+        }
+        lines = [f"HTTP/1.1 {status} {reasons.get(status, '')}"]
+        all_headers = {
+            "Server": "aviat-dashboard",
+            "Connection": "keep-alive" if keep_alive else "close",
+        }
+        if status != 304:
+            all_headers["Content-Length"] = str(len(body))
+        all_headers.update(headers or {})
+        lines += [f"{k}: {v}" for k, v in all_headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body and not head_only and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+    async def _serve_static(
+        self,
+        writer: asyncio.StreamWriter,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        keep_alive: bool,
+    ) -> None:
+        if method not in ("GET", "HEAD"):
+            await self._respond(writer, 405, b"Method not allowed",
+                                {"Allow": "GET, HEAD"},
+                                keep_alive=keep_alive)
+            return
+        url = urlsplit(target)
+        if url.path == "/data.bin":
+            entry: Optional[StaticFile] = self.data_blob
+        else:
+            file_path = self.static.resolve(url.path)
+            entry = self.static.get(file_path) if file_path else None
+        if entry is None:
+            await self._respond(writer, 404, b"Not found",
+                                keep_alive=keep_alive)
+            return
+
+        accept = headers.get("accept-encoding", "")
+        coding = next(
+            (c for c in ("br", "gzip") if c in entry.encoded
+             and _accepts(accept, c)),
+            None,
+        )
+        etag = entry.etag if coding is None else f'{entry.etag[:-1]}-{coding}"'
+        if url.query == f"v={entry.version}":
+            # Linked with its content hash from a page: never changes
+            cache_control = "public, max-age=31536000, immutable"
+        else:
+            cache_control = "no-cache"
+        out = {
+            "Content-Type": entry.content_type,
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if coding is not None:
+            out["Content-Encoding"] = coding
+        if _etag_matches(headers.get("if-none-match", ""), entry.etag):
+            await self._respond(writer, 304, headers=out,
+                                keep_alive=keep_alive)
+            return
+        body = entry.body if coding is None else entry.encoded[coding]
+        await self._respond(writer, 200, body, out,
+                            head_only=method == "HEAD",
+                            keep_alive=keep_alive)
+
+    async def _websocket(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        headers: Dict[str, str],
+    ) -> None:
+        key = headers.get("sec-websocket-key")
+        if not key or headers.get("sec-websocket-version") != "13":
+            await self._respond(writer, 400, b"Bad WebSocket handshake")
+            return
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {ws_accept_key(key)}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        writer.write(ws_encode(0x1, self._meta))
+        session = PlaybackSession(self.recording, writer)
+        await session.send(self.recording.frame(session.t))
+        fragments: List[bytes] = []
+        try:
+            while True:
+                fin, opcode, payload = await ws_read_frame(reader)
+                if opcode == 0x8:
+                    writer.write(ws_encode(0x8, payload[:2]))
+                    await writer.drain()
+                    return
+                if opcode == 0x9:
+                    writer.write(ws_encode(0xA, payload))
+                    await writer.drain()
+                    continue
+                if opcode in (0x0, 0x1, 0x2):
+                    fragments.append(payload)
+                    if sum(len(f) for f in fragments) > WS_MAX_MESSAGE:
+                        raise ValueError("WebSocket message too large")
+                    if not fin:
+                        continue
+                    data = b"".join(fragments)
+                    fragments = []
+                    try:
+                        message = json.loads(data.decode("utf-8"))
+                    except ValueError:
+                        continue
+                    if isinstance(message, dict):
+                        await session.handle(message)
+        except ValueError:
+            writer.write(ws_encode(0x8, struct.pack("!H", 1009)))
+        finally:
+            session.stop_player()
+
+
+async def serve(
+    host: str,
+    port: int,
+    root: str,
+    csv_path: str,
+    timeline_path: Optional[str],
+    stream: bool = True,
+    cache_dir: Optional[str] = None,
+) -> None:
+    recording = Recording(csv_path, timeline_path)
+    server = DashboardServer(root, recording, stream, cache_dir)
+    assets = server.static.precompress()
+    srv = await asyncio.start_server(server.handle_client, host, port)
+    addr = srv.sockets[0].getsockname()
+    codings = "gzip+br" if brotli is not None else "gzip"
+    print(
+        f"Serving {root} on http://{addr[0]}:{addr[1]}/ "
+        f"({assets} assets precompressed with {codings}; "
+        f"data.bin {len(server.data_blob.body) // 1024} KB; "
+        + (
+            f"streaming {recording.t_max - recording.t_min + 1} frames)"
+            if stream
+            else "streaming off)"
+        )
+    )
+    async with srv:
+        await srv.serve_forever()
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve dashboard.html with precompressed assets, strong ETags "
+            "and a binary data bundle, and stream the recording to it over "
+            "a WebSocket at playback rate."
+        ),
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--root", default=WORKSPACE)
+    parser.add_argument(
+        "--csv",
+        default=os.path.join(WORKSPACE, "Data.csv"),
+        help="Recording to stream (default: Data.csv)",
+    )
+    parser.add_argument(
+        "--timeline",
+        default=os.path.join(WORKSPACE, "Línea de tiempo.md"),
+        help="Timeline markdown for event markers",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help=(
+            "Static files and data.bin only; the dashboard then plays the "
+            "bundle locally (offline briefings)"
+        ),
+    )
+    parser.add_argument(
+        "--static-cache",
+        default=default_static_cache_dir(),
+        help="Where precompressed assets are kept between runs",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    try:
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                args.root,
+                args.csv,
+                args.timeline,
+                stream=not args.no_stream,
+                cache_dir=args.static_cache,
+            )
+        )
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+INDEX_CACHE_VERSION = 1
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+# Timeline bullets: "- 20:16:32 — WG: ..." (also nested "  - ...")
+_CLOCK_EVENT_RE = re.compile(
+    r"^(?:[-*]\s+)?(\d{1,2}):(\d{2})(?::(\d{2}))?\s*[—–-]\s*(.+)$"
+)
+# ROI report timeline: "1549: MOJO 69 ..." and "2021:38: MOJO 69 ..."
+_HHMM_EVENT_RE = re.compile(r"^(\d{2})(\d{2})(?::(\d{2}))?:\s+(.+)$")
+_ROW_RE = re.compile(r"<tr>(.*?)</tr>", re.S | re.I)
+_CELL_RE = re.compile(r"<(t[hd])>(.*?)</t[hd]>", re.S | re.I)
+
+
+@dataclass
+class Section:
+    title: str
+    level: int
+    start_line: int
+    end_line: int
+
+
+@dataclass
+class Table:
+    section: int
+    line: int
+    header: List[str]
+    rows: List[List[str]]
+
+
+@dataclass
+class Event:
+    t_seconds: int
+    time_str: str
+    text: str
+    section: int
+    line: int
+    depth: int = 0
+
+    @property
+    def display(self) -> str:
+        return f"{self.time_str} — {self.text}"
+
+
+@dataclass
+class DocIndex:
+    path: str
+    stamp: List[int]
+    lines: List[str]
+    sections: List[Section]
+    tables: List[Table]
+    events: List[Event]
+    # Sorted event times for bisect; derived, not serialized
+    _times: List[int] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        self.events.sort(key=lambda e: (e.t_seconds, e.line))
+        self._times = [e.t_seconds for e in self.events]
+
+    def find_section(self, title: str) -> Optional[int]:
+        """Index of the first section whose title contains title."""
+        needle = title.casefold()
+        for i, sec in enumerate(self.sections):
+            if needle in sec.title.casefold():
+                return i
+        return None
+
+    def section_text(self, i: int) -> str:
+        sec = self.sections[i]
+        return "\n".join(self.lines[sec.start_line:sec.end_line])
+
+    def section_tables(self, i: int) -> List[Table]:
+        return [t for t in self.tables if t.section == i]
+
+    def section_events(self, i: int) -> List[Event]:
+        return sorted(
+            (e for e in self.events if e.section == i),
+            key=lambda e: e.line,
+        )
+
+    def events_between(self, t0: float, t1: float) -> List[Event]:
+        """Events with t0 <= t_seconds <= t1, found by bisection."""
+        lo = bisect_left(self._times, t0)
+        hi = bisect_right(self._times, t1)
+        return self.events[lo:hi]
+
+    def to_dict(self) -> dict:
+        return {
+            "index_version": INDEX_CACHE_VERSION,
+            "path": self.path,
+            "stamp": self.stamp,
+            "lines": self.lines,
+            "sections": [asdict(s) for s in self.sections],
+            "tables": [asdict(t) for t in self.tables],
+            "events": [asdict(e) for e in self.events],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DocIndex":
+        return cls(
+            path=data["path"],
+            stamp=list(data["stamp"]),
+            lines=list(data["lines"]),
+            sections=[Section(**s) for s in data["sections"]],
+            tables=[Table(**t) for t in data["tables"]],
+            events=[Event(**e) for e in data["events"]],
+        )
+
+
+def _strip_tags(text: str) -> str:
+    return re.sub(r"<[^>]+>", "", text).strip()
+
+
+def _parse_tables(
+    lines: List[str],
+    line_section: List[int],
+) -> List[Table]:
+    """HTML <table> blocks and pipe tables, in document order."""
+    tables: List[Table] = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        s = lines[i].strip()
+        if s.lower().startswith("<table"):
+            j = i
+            while j < n and "</table>" not in lines[j].lower():
+                j += 1
+            block = "\n".join(lines[i:j + 1])
+            header: List[str] = []
+            rows: List[List[str]] = []
+            for row in _ROW_RE.findall(block):
+                cells = _CELL_RE.findall(row)
+                if cells and all(tag.lower() == "th" for tag, _ in cells):
+                    header = [_strip_tags(c) for _, c in cells]
+                elif cells:
+                    rows.append([_strip_tags(c) for _, c in cells])
+            tables.append(Table(line_section[i], i, header, rows))
+            i = j + 1
+            continue
+        if (
+            s.startswith("|")
+            and i + 1 < n
+            and re.fullmatch(r"\|?[\s:|-]+\|?", lines[i + 1].strip())
+            and "-" in lines[i + 1]
+        ):
+            def split_row(row: str) -> List[str]:
+                return [c.strip() for c in row.strip().strip("|").split("|")]
+
+            header = split_row(s)
+            rows = []
+            j = i + 2
+            while j < n and lines[j].strip().startswith("|"):
+                rows.append(split_row(lines[j]))
+                j += 1
+            tables.append(Table(line_section[i], i, header, rows))
+            i = j
+            continue
+        i += 1
+    return tables
+
+
+def _parse_event(line: str) -> Optional[Tuple[int, str, str, int]]:
+    stripped = line.lstrip()
+    depth = (len(line) - len(stripped)) // 2
+    stripped = stripped.rstrip()
+    m = _CLOCK_EVENT_RE.match(stripped)
+    if m is None and not stripped.startswith(("-", "*")):
+        m = _HHMM_EVENT_RE.match(stripped)
+    if m is None:
+        return None
+    hh, mm, ss = int(m.group(1)), int(m.group(2)), int(m.group(3) or 0)
+    if hh > 23 or mm > 59 or ss > 59:
+        return None
+    time_str = f"{hh:02d}:{mm:02d}" + (f":{ss:02d}" if m.group(3) else "")
+    return hh * 3600 + mm * 60 + ss, time_str, m.group(4).strip(), depth
+
+
+def build_index(path: str) -> DocIndex:
+    """Parse a markdown document into sections, tables and events."""
+    st = os.stat(path)
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    # Lines before the first heading belong to an untitled section 0
+    sections = [Section("", 0, 0, len(lines))]
+    line_section: List[int] = []
+    for i, ln in enumerate(lines):
+        m = _HEADING_RE.match(ln)
+        if m:
+            sections[-1].end_line = i
+            sections.append(
+                Section(m.group(2).strip(), len(m.group(1)), i + 1, len(lines))
+            )
+        line_section.append(len(sections) - 1)
+
+    events: List[Event] = []
+    for i, ln in enumerate(lines):
+        parsed = _parse_event(ln)
+        if parsed is not None:
+            t, time_str, text, depth = parsed
+            events.append(
+                Event(t, time_str, text, line_section[i], i, depth)
+            )
+
+    return DocIndex(
+        path=os.path.abspath(path),
+        stamp=[st.st_mtime_ns, st.st_size],
+        lines=lines,
+        sections=sections,
+        tables=_parse_tables(lines, line_section),
+        events=events,
+    )
+
+
+def default_index_cache_dir() -> str:
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".cache", "docindex"
+    )
+
+
+def index_cache_path(cache_dir: str, path: str) -> str:
+    key = hashlib.sha256(
+        os.path.realpath(path).encode("utf-8")
+    ).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+_index_memo: Dict[str, DocIndex] = {}
+
+
+def load_index(
+    path: str,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> DocIndex:
+    """
+    Return the index for a markdown file, reusing the in-process copy or
+    the JSON cache while the file's mtime and size are unchanged.
+    """
+    real = os.path.realpath(path)
+    st = os.stat(real)
+    stamp = [st.st_mtime_ns, st.st_size]
+
+    memo = _index_memo.get(real)
+    if not refresh and memo is not None and memo.stamp == stamp:
+        return memo
+
+    cache_file = index_cache_path(
+        cache_dir or default_index_cache_dir(), real
+    )
+    index: Optional[DocIndex] = None
+    if not refresh:
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if (
+                data.get("index_version") == INDEX_CACHE_VERSION
+                and data.get("stamp") == stamp
+            ):
+                index = DocIndex.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            index = None
+
+    if index is None:
+        index = build_index(real)
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(index.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            # Caching is best effort; the fresh index is still returned
+            pass
+
+    _index_memo[real] = index
+    return index
+
+
+def parse_clock(value: str) -> int:
+    parts = [int(p) for p in value.split(":")]
+    while len(parts) < 3:
+        parts.append(0)
+    hh, mm, ss = parts[:3]
+    return hh * 3600 + mm * 60 + ss
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Query the section/table/event index of a markdown doc."
+    )
+    parser.add_argument("doc", help="Markdown file to index")
+    parser.add_argument("--section", help="Print the section matching this")
+    parser.add_argument(
+        "--between",
+        nargs=2,
+        metavar=("START", "END"),
+        help="Print events between two clock times (HH:MM[:SS])",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Rebuild the cached index",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    try:
+        index = load_index(args.doc, refresh=args.refresh)
+    except (OSError, UnicodeDecodeError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    if args.section:
+        i = index.find_section(args.section)
+        if i is None:
+            print(f"No section matching {args.section!r}", file=sys.stderr)
+            return 1
+        print(index.section_text(i))
+        for table in index.section_tables(i):
+            print(" | ".join(table.header))
+            for row in table.rows:
+                print(" | ".join(row))
+    elif args.between:
+        try:
+            t0, t1 = (parse_clock(v) for v in args.between)
+        except ValueError:
+            print("Times must be HH:MM[:SS]", file=sys.stderr)
+            return 1
+        for ev in index.events_between(t0, t1):
+            print(ev.display)
+    else:
+        print(
+            f"{len(index.sections)} sections, {len(index.tables)} tables, "
+            f"{len(index.events)} events"
+        )
+        for sec in index.sections[1:]:
+            print(f"{'  ' * (sec.level - 1)}{sec.title}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
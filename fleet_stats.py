@@ -0,0 +1,526 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import flight_catalog
+
+
+STATS_VERSION = 1
+
+# Display bins are rebinned from these; the fine bins double as a
+# mergeable quantile sketch (error <= one bin width).
+DESCENT_BINS = (0.0, 8000.0, 50.0)  # fpm
+TORQUE_SPLIT_BINS = (-40.0, 40.0, 0.5)  # % torque, Eng 1 - Eng 2
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass
+class StatsParams:
+    descent_ra_ft: float = 500.0
+    minimums_ft: Tuple[float, ...] = (100.0, 200.0, 500.0)
+    airborne_ra_ft: float = 10.0
+    min_torque: float = 10.0
+    max_gap_s: float = 30.0
+
+    @property
+    def key(self) -> str:
+        blob = json.dumps(
+            {"v": STATS_VERSION, **asdict(self)}, sort_keys=True
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class Histogram:
+    """
+    Fixed-width, time-weighted histogram with under/overflow and exact
+    min/max/mean. Partials from different flights merge by addition.
+    """
+
+    lo: float
+    hi: float
+    width: float
+    weights: np.ndarray
+    under: float = 0.0
+    over: float = 0.0
+    total: float = 0.0
+    weighted_sum: float = 0.0
+    vmin: float = float("inf")
+    vmax: float = float("-inf")
+
+    @classmethod
+    def empty(cls, lo: float, hi: float, width: float) -> "Histogram":
+        nbins = int(round((hi - lo) / width))
+        return cls(lo, hi, width, np.zeros(nbins, dtype=np.float64))
+
+    @property
+    def edges(self) -> np.ndarray:
+        return self.lo + self.width * np.arange(len(self.weights) + 1)
+
+    def add(self, values: np.ndarray, weights: np.ndarray) -> None:
+        keep = np.isfinite(values) & (weights > 0)
+        values = values[keep]
+        weights = weights[keep]
+        if not len(values):
+            return
+        idx = np.floor((values - self.lo) / self.width).astype(np.int64)
+        nbins = len(self.weights)
+        inside = (idx >= 0) & (idx < nbins)
+        self.weights += np.bincount(
+            idx[inside], weights=weights[inside], minlength=nbins
+        )
+        self.under += float(weights[idx < 0].sum())
+        self.over += float(weights[idx >= nbins].sum())
+        self.total += float(weights.sum())
+        self.weighted_sum += float((values * weights).sum())
+        self.vmin = min(self.vmin, float(values.min()))
+        self.vmax = max(self.vmax, float(values.max()))
+
+    def merge(self, other: "Histogram") -> None:
+        if (other.lo, other.hi, other.width) != (self.lo, self.hi,
+                                                 self.width):
+            raise ValueError("histograms have different bins")
+        self.weights += other.weights
+        self.under += other.under
+        self.over += other.over
+        self.total += other.total
+        self.weighted_sum += other.weighted_sum
+        self.vmin = min(self.vmin, other.vmin)
+        self.vmax = max(self.vmax, other.vmax)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.weighted_sum / self.total if self.total > 0 else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Linear interpolation inside the bin holding the q-th weight."""
+        if self.total <= 0:
+            return None
+        target = q * self.total
+        if target <= self.under:
+            return self.vmin
+        cum = self.under + np.cumsum(self.weights)
+        i = int(np.searchsorted(cum, target, side="left"))
+        if i >= len(self.weights):
+            return self.vmax
+        before = cum[i] - self.weights[i]
+        frac = (target - before) / self.weights[i] if self.weights[i] else 0
+        value = self.lo + self.width * (i + frac)
+        return float(min(max(value, self.vmin), self.vmax))
+
+    def rebin(self, factor: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(left edges, weights) with factor fine bins per display bin."""
+        n = len(self.weights) // factor * factor
+        weights = self.weights[:n].reshape(-1, factor).sum(axis=1)
+        return self.edges[:n:factor], weights
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["weights"] = self.weights.tolist()
+        for name in ("vmin", "vmax"):
+            if not np.isfinite(data[name]):
+                data[name] = None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Histogram":
+        data = dict(data)
+        data["weights"] = np.asarray(data["weights"], dtype=np.float64)
+        data["vmin"] = (
+            float("inf") if data["vmin"] is None else data["vmin"]
+        )
+        data["vmax"] = (
+            float("-inf") if data["vmax"] is None else data["vmax"]
+        )
+        return cls(**data)
+
+
+@dataclass
+class FlightJob:
+    flight_id: str
+    name: str
+    csv_path: str
+    columns_path: str
+    mtime_ns: int
+    size: int
+    params: StatsParams
+
+
+@dataclass
+class FlightPartial:
+    flight_id: str
+    name: str
+    rows: int
+    airborne_s: float
+    below_min_s: Dict[str, float]
+    descent: Histogram
+    torque_split: Histogram
+    stamp: List[object] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["descent"] = self.descent.to_dict()
+        data["torque_split"] = self.torque_split.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FlightPartial":
+        data = dict(data)
+        data["descent"] = Histogram.from_dict(data["descent"])
+        data["torque_split"] = Histogram.from_dict(data["torque_split"])
+        return cls(**data)
+
+
+def _job_stamp(job: FlightJob) -> List[object]:
+    return [job.mtime_ns, job.size, job.params.key]
+
+
+def _job_columns(job: FlightJob) -> Dict[str, np.ndarray]:
+    try:
+        st = os.stat(job.csv_path)
+        if (st.st_mtime_ns, st.st_size) == (job.mtime_ns, job.size):
+            with np.load(job.columns_path) as npz:
+                return {name: npz[name] for name in npz.files}
+    except (OSError, ValueError):
+        pass
+    return flight_catalog.read_columns(job.csv_path)
+
+
+def sample_durations(t: np.ndarray, max_gap_s: float) -> np.ndarray:
+    """
+    Seconds each row stands for: until the next row, capped so recording
+    gaps do not count as flight time. The last row counts for nothing.
+    """
+    dt = np.diff(t.astype(np.float64), append=float(t[-1]) if len(t) else 0)
+    return np.clip(dt, 0.0, max_gap_s)
+
+
+def flight_partial(job: FlightJob) -> FlightPartial:
+    """One flight's histograms and time-below-minimums (runs in a worker)."""
+    p = job.params
+    cols = _job_columns(job)
+    t = cols["t_seconds"]
+    n = len(t)
+    nan = np.full(n, np.nan)
+    ra = cols.get("altitude_radar", nan)
+    vs = cols.get("vertical_speed", nan)
+    tq1 = cols.get("eng1_torque", nan)
+    tq2 = cols.get("eng2_torque", nan)
+    dt = sample_durations(t, p.max_gap_s)
+
+    airborne = ra >= p.airborne_ra_ft
+    descent = Histogram.empty(*DESCENT_BINS)
+    low = airborne & (ra < p.descent_ra_ft) & (vs < 0)
+    descent.add(-vs[low], dt[low])
+
+    split = Histogram.empty(*TORQUE_SPLIT_BINS)
+    powered = (tq1 >= p.min_torque) & (tq2 >= p.min_torque)
+    split.add(tq1[powered] - tq2[powered], dt[powered])
+
+    below = {
+        f"{m:g}": float(dt[airborne & (ra < m)].sum()) for m in p.minimums_ft
+    }
+    return FlightPartial(
+        flight_id=job.flight_id,
+        name=job.name,
+        rows=int(n),
+        airborne_s=float(dt[airborne].sum()),
+        below_min_s=below,
+        descent=descent,
+        torque_split=split,
+        stamp=_job_stamp(job),
+    )
+
+
+def default_cache_dir() -> str:
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".cache", "fleet"
+    )
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def make_jobs(
+    catalog: flight_catalog.FlightCatalog, params: StatsParams
+) -> List[FlightJob]:
+    return [
+        FlightJob(
+            flight_id=f.flight_id,
+            name=f.name,
+            csv_path=f.csv_path,
+            columns_path=catalog.columns_path(f.flight_id),
+            mtime_ns=f.mtime_ns,
+            size=f.size,
+            params=params,
+        )
+        for f in catalog.flights()
+    ]
+
+
+def summary_key(jobs: Sequence[FlightJob], params: StatsParams) -> str:
+    """Changes whenever a flight is added, removed or modified."""
+    h = hashlib.sha256(params.key.encode("utf-8"))
+    for job in sorted(jobs, key=lambda j: j.flight_id):
+        h.update(f"{job.flight_id}:{job.mtime_ns}:{job.size};".encode())
+    return h.hexdigest()[:16]
+
+
+def compute_partials(
+    jobs: Sequence[FlightJob],
+    cache_dir: str,
+    workers: Optional[int] = None,
+) -> List[FlightPartial]:
+    """
+    Per-flight partials, reusing cached ones whose CSV and parameters are
+    unchanged; the rest are computed in a process pool.
+    """
+    part_dir = os.path.join(cache_dir, "partials")
+    os.makedirs(part_dir, exist_ok=True)
+    partials: Dict[str, FlightPartial] = {}
+    todo: List[FlightJob] = []
+    for job in jobs:
+        cached = _read_json(os.path.join(part_dir, f"{job.flight_id}.json"))
+        if cached is not None and cached.get("stamp") == _job_stamp(job):
+            partials[job.flight_id] = FlightPartial.from_dict(cached)
+        else:
+            todo.append(job)
+
+    workers = workers or os.cpu_count() or 1
+    if len(todo) <= 1 or workers <= 1:
+        fresh = [flight_partial(job) for job in todo]
+    else:
+        workers = min(workers, len(todo))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = list(
+                pool.map(
+                    flight_partial,
+                    todo,
+                    chunksize=max(1, len(todo) // (workers * 4)),
+                )
+            )
+    for part in fresh:
+        partials[part.flight_id] = part
+        _write_json(
+            os.path.join(part_dir, f"{part.flight_id}.json"), part.to_dict()
+        )
+    return [partials[job.flight_id] for job in jobs]
+
+
+def _quantiles(hist: Histogram) -> Dict[str, Optional[float]]:
+    return {f"p{q * 100:g}": hist.quantile(q) for q in QUANTILES}
+
+
+def reduce_partials(
+    partials: Sequence[FlightPartial], params: StatsParams
+) -> dict:
+    """Merge per-flight partials into the fleet summary (JSON-ready)."""
+    descent = Histogram.empty(*DESCENT_BINS)
+    split = Histogram.empty(*TORQUE_SPLIT_BINS)
+    below = {f"{m:g}": 0.0 for m in params.minimums_ft}
+    flights = []
+    for part in partials:
+        descent.merge(part.descent)
+        split.merge(part.torque_split)
+        for k, v in part.below_min_s.items():
+            below[k] = below.get(k, 0.0) + v
+        flights.append({
+            "flight_id": part.flight_id,
+            "name": part.name,
+            "rows": part.rows,
+            "airborne_s": part.airborne_s,
+            "below_min_s": part.below_min_s,
+            "descent_fpm": _quantiles(part.descent),
+            "descent_max_fpm": (
+                part.descent.vmax if part.descent.total > 0 else None
+            ),
+            "torque_split_mean": part.torque_split.mean,
+            "torque_split_p5": part.torque_split.quantile(0.05),
+            "torque_split_p95": part.torque_split.quantile(0.95),
+        })
+    return {
+        "stats_version": STATS_VERSION,
+        "params": asdict(params),
+        "flights": flights,
+        "fleet": {
+            "flights": len(partials),
+            "airborne_s": float(sum(p.airborne_s for p in partials)),
+            "below_min_s": below,
+            "descent_fpm": _quantiles(descent),
+            "torque_split": {
+                "mean": split.mean,
+                "p5": split.quantile(0.05),
+                "p95": split.quantile(0.95),
+            },
+            "descent_hist": descent.to_dict(),
+            "torque_split_hist": split.to_dict(),
+        },
+    }
+
+
+def load_or_build(
+    catalog: flight_catalog.FlightCatalog,
+    params: Optional[StatsParams] = None,
+    cache_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    rebuild: bool = False,
+) -> dict:
+    """The cached fleet summary, rebuilt only when the catalog changed."""
+    params = params or StatsParams()
+    cache_dir = cache_dir or default_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    jobs = make_jobs(catalog, params)
+    key = summary_key(jobs, params)
+    path = os.path.join(cache_dir, "summary.json")
+    if not rebuild:
+        cached = _read_json(path)
+        if cached is not None and cached.get("key") == key:
+            return cached
+
+    start = time.perf_counter()
+    if rebuild:
+        for job in jobs:
+            part = os.path.join(cache_dir, "partials", f"{job.flight_id}.json")
+            try:
+                os.remove(part)
+            except OSError:
+                pass
+    partials = compute_partials(jobs, cache_dir, workers)
+    summary = reduce_partials(partials, params)
+    summary["key"] = key
+    summary["built_at"] = time.time()
+    summary["build_seconds"] = time.perf_counter() - start
+    _write_json(path, summary)
+    return summary
+
+
+def _fmt(value: Optional[float], spec: str = ".0f") -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def format_summary(summary: dict) -> str:
+    fleet = summary["fleet"]
+    mins = list(fleet["below_min_s"])
+    lines = [
+        f"{fleet['flights']} flight(s), "
+        f"{fleet['airborne_s'] / 3600.0:.2f} h airborne",
+        "Descent below {:g} ft RA (fpm): ".format(
+            summary["params"]["descent_ra_ft"]
+        ) + ", ".join(
+            f"{k} {_fmt(v)}" for k, v in fleet["descent_fpm"].items()
+        ),
+        "Torque split Eng1-Eng2 (%): mean {} p5 {} p95 {}".format(
+            _fmt(fleet["torque_split"]["mean"], ".1f"),
+            _fmt(fleet["torque_split"]["p5"], ".1f"),
+            _fmt(fleet["torque_split"]["p95"], ".1f"),
+        ),
+        "Time below minimums: " + ", ".join(
+            f"<{k} ft {fleet['below_min_s'][k] / 60.0:.1f} min"
+            for k in mins
+        ),
+        f"  {'flight':<28}{'air min':>9}{'p90 desc':>10}{'split':>8}"
+        + "".join(f"{'<' + k + ' ft':>10}" for k in mins),
+    ]
+    for f in summary["flights"]:
+        lines.append(
+            f"  {f['name'][:27]:<28}{f['airborne_s'] / 60.0:>9.1f}"
+            f"{_fmt(f['descent_fpm'].get('p90')):>10}"
+            f"{_fmt(f['torque_split_mean'], '.1f'):>8}"
+            + "".join(
+                f"{f['below_min_s'].get(k, 0.0) / 60.0:>10.1f}"
+                for k in mins
+            )
+        )
+    return "\n".join(lines)
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Fleet statistics over every catalogued flight: descent rates "
+            "near the ground, engine torque split and time below minimums."
+        ),
+    )
+    parser.add_argument(
+        "roots",
+        nargs="*",
+        default=[os.path.dirname(os.path.abspath(__file__))],
+        help="Directories to (re)scan into the catalog first",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--minimums",
+        type=lambda v: tuple(float(x) for x in v.split(",") if x),
+        default=StatsParams.minimums_ft,
+        help="Comma-separated radar-altitude minimums in ft",
+    )
+    parser.add_argument(
+        "--descent-ra",
+        type=float,
+        default=StatsParams.descent_ra_ft,
+        help="Only count descent below this radar altitude (ft)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignore cached partials and summary",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    if not args.minimums:
+        print("--minimums needs at least one altitude", file=sys.stderr)
+        return 2
+    params = StatsParams(
+        descent_ra_ft=args.descent_ra, minimums_ft=tuple(args.minimums)
+    )
+    start = time.perf_counter()
+    catalog = flight_catalog.FlightCatalog()
+    try:
+        catalog.scan(args.roots)
+        summary = load_or_build(
+            catalog, params, workers=args.workers, rebuild=args.rebuild
+        )
+    finally:
+        catalog.close()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_summary(summary))
+        print(
+            f"Done in {time.perf_counter() - start:.2f}s (summary built in "
+            f"{summary['build_seconds']:.2f}s)",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+CATALOG_VERSION = 2
+
+REQUIRED_COLUMNS = ("Local Hour", "Local Minute", "Local Second")
+
+# Sortie CSV header -> cached column name (as used by app.py)
+NUMERIC_COLUMNS = {
+    "Ground Speed": "ground_speed",
+    "Altitude Radar": "altitude_radar",
+    "Vertical Speed": "vertical_speed",
+    "Eng 1 Torque": "eng1_torque",
+    "Eng 2 Torque": "eng2_torque",
+    "TAS": "tas",
+}
+TEXT_COLUMNS = {"Crew": "crew", "Transcripts": "transcript"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    flight_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    csv_path TEXT NOT NULL UNIQUE,
+    kml_path TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    t_min INTEGER NOT NULL,
+    t_max INTEGER NOT NULL,
+    duration_s INTEGER NOT NULL,
+    min_lon REAL,
+    min_lat REAL,
+    max_lon REAL,
+    max_lat REAL,
+    max_ra_ft REAL,
+    max_climb_fpm REAL,
+    max_descent_fpm REAL,
+    columns TEXT NOT NULL,
+    scanned_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flights_name ON flights (name);
+CREATE INDEX IF NOT EXISTS flights_t_min ON flights (t_min);
+"""
+
+_COORDS_RE = re.compile(r"<(?:\w+:)?coordinates>(.*?)</(?:\w+:)?coordinates>",
+                        re.S)
+
+
+@dataclass
+class FlightRecord:
+    flight_id: str
+    name: str
+    csv_path: str
+    kml_path: Optional[str]
+    mtime_ns: int
+    size: int
+    rows: int
+    t_min: int
+    t_max: int
+    duration_s: int
+    min_lon: Optional[float]
+    min_lat: Optional[float]
+    max_lon: Optional[float]
+    max_lat: Optional[float]
+    max_ra_ft: Optional[float]
+    max_climb_fpm: Optional[float]
+    max_descent_fpm: Optional[float]
+    columns: List[str]
+    scanned_at: float
+
+    @property
+    def label(self) -> str:
+        return (
+            f"{self.name} · {_clock(self.t_min)}–{_clock(self.t_max)} "
+            f"({self.duration_s // 60} min)"
+        )
+
+
+@dataclass
+class ScanResult:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+
+def _clock(t: int) -> str:
+    return f"{t // 3600 % 24:02d}:{t // 60 % 60:02d}:{t % 60:02d}"
+
+
+def _finite_or_none(value: float) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
+
+
+def read_header(csv_path: str) -> List[str]:
+    with open(csv_path, "r", encoding="utf-8-sig", errors="replace") as f:
+        line = f.readline()
+    return [c.strip() for c in line.rstrip("\r\n").split(",")]
+
+
+def is_sortie_csv(header: Sequence[str]) -> bool:
+    return all(c in header for c in REQUIRED_COLUMNS)
+
+
+def read_columns(csv_path: str) -> Dict[str, np.ndarray]:
+    """
+    A sortie CSV as the columns app.py works with, sorted by t_seconds:
+    numeric telemetry (radar altitude clamped at 0), t_seconds, time_str
+    and the crew/transcript text ("" where absent).
+    """
+    df = pd.read_csv(csv_path)
+    h, m, s = (
+        pd.to_numeric(df[c], errors="coerce").fillna(0).astype(np.int64)
+        for c in REQUIRED_COLUMNS
+    )
+    t = (h * 3600 + m * 60 + s).to_numpy()
+    order = np.argsort(t, kind="stable")
+    cols: Dict[str, np.ndarray] = {"t_seconds": t[order]}
+    cols["time_str"] = np.array(
+        [f"{a:02d}:{b:02d}:{c:02d}" for a, b, c in zip(h, m, s)], dtype="U8"
+    )[order]
+    for src, name in NUMERIC_COLUMNS.items():
+        if src in df.columns:
+            cols[name] = pd.to_numeric(df[src], errors="coerce").to_numpy(
+                dtype=np.float64
+            )[order]
+    if "altitude_radar" in cols:
+        ra = np.nan_to_num(cols["altitude_radar"], nan=0.0)
+        cols["altitude_radar"] = np.maximum(ra, 0.0)
+    for src, name in TEXT_COLUMNS.items():
+        if src in df.columns:
+            cols[name] = (
+                df[src].fillna("").astype(str).to_numpy(dtype=str)[order]
+            )
+    return cols
+
+
+def kml_bbox(
+    kml_path: str,
+) -> Tuple[Optional[float], Optional[float], Optional[float],
+           Optional[float]]:
+    """(min_lon, min_lat, max_lon, max_lat) of every coordinate, or Nones."""
+    try:
+        with open(kml_path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return None, None, None, None
+    lons: List[float] = []
+    lats: List[float] = []
+    for block in _COORDS_RE.findall(text):
+        for triplet in block.split():
+            parts = triplet.split(",")
+            try:
+                lons.append(float(parts[0]))
+                lats.append(float(parts[1]))
+            except (IndexError, ValueError):
+                continue
+    if not lons:
+        return None, None, None, None
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def pair_kml(csv_path: str) -> Optional[str]:
+    """
+    The flight path for a CSV: a .kml with the same stem, else the only
+    .kml in a folder holding no other sortie CSV. Anything else is
+    ambiguous and gets no path.
+    """
+    stem = os.path.splitext(csv_path)[0]
+    if os.path.exists(stem + ".kml"):
+        return stem + ".kml"
+    folder = os.path.dirname(csv_path)
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return None
+    kmls = [n for n in names if n.lower().endswith(".kml")]
+    if len(kmls) != 1:
+        return None
+    for name in names:
+        other = os.path.join(folder, name)
+        if not name.lower().endswith(".csv") or os.path.samefile(
+            other, csv_path
+        ):
+            continue
+        try:
+            if is_sortie_csv(read_header(other)):
+                return None
+        except OSError:
+            continue
+    return os.path.join(folder, kmls[0])
+
+
+def flight_id_for(csv_path: str) -> str:
+    return hashlib.sha256(
+        os.path.abspath(csv_path).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+def default_catalog_dir() -> str:
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".cache", "catalog"
+    )
+
+
+class FlightCatalog:
+    """
+    SQLite index of sortie CSVs under one or more directories, with each
+    flight's columns cached as an .npz next to the database. Rescans only
+    re-read files whose mtime or size changed. Safe to share across
+    threads (one connection behind a lock).
+    """
+
+    def __init__(self, catalog_dir: Optional[str] = None):
+        self.catalog_dir = catalog_dir or default_catalog_dir()
+        self.columns_dir = os.path.join(self.catalog_dir, "columns")
+        os.makedirs(self.columns_dir, exist_ok=True)
+        self.db_path = os.path.join(self.catalog_dir, "catalog.sqlite")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            version = self._db.execute("PRAGMA user_version").fetchone()[0]
+            if version != CATALOG_VERSION:
+                self._db.execute("DROP TABLE IF EXISTS flights")
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def columns_path(self, flight_id: str) -> str:
+        return os.path.join(self.columns_dir, f"{flight_id}.npz")
+
+    def _record(self, row: sqlite3.Row) -> FlightRecord:
+        data = dict(row)
+        data["columns"] = json.loads(data["columns"])
+        return FlightRecord(**data)
+
+    def _index_file(
+        self, csv_path: str, st: os.stat_result, root: str
+    ) -> FlightRecord:
+        cols = read_columns(csv_path)
+        if not len(cols["t_seconds"]):
+            raise ValueError("no rows")
+        flight_id = flight_id_for(csv_path)
+        cache_file = self.columns_path(flight_id)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_file, **cols)
+        os.replace(tmp_file, cache_file)
+
+        kml_path = pair_kml(csv_path)
+        bbox = kml_bbox(kml_path) if kml_path else (None,) * 4
+        t = cols["t_seconds"]
+        vs = cols.get("vertical_speed", np.array([np.nan]))
+        ra = cols.get("altitude_radar", np.array([np.nan]))
+        return FlightRecord(
+            flight_id=flight_id,
+            name=os.path.splitext(os.path.relpath(csv_path, root))[0],
+            csv_path=csv_path,
+            kml_path=kml_path,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            rows=int(len(t)),
+            t_min=int(t[0]),
+            t_max=int(t[-1]),
+            duration_s=int(t[-1] - t[0]),
+            min_lon=bbox[0],
+            min_lat=bbox[1],
+            max_lon=bbox[2],
+            max_lat=bbox[3],
+            max_ra_ft=_finite_or_none(np.nanmax(ra)) if len(ra) else None,
+            max_climb_fpm=_finite_or_none(np.nanmax(vs)) if len(vs) else None,
+            max_descent_fpm=(
+                _finite_or_none(np.nanmin(vs)) if len(vs) else None
+            ),
+            columns=read_header(csv_path),
+            scanned_at=time.time(),
+        )
+
+    def scan(self, roots: Sequence[str]) -> ScanResult:
+        """Index new and changed sortie CSVs; forget ones that vanished."""
+        start = time.perf_counter()
+        result = ScanResult()
+        with self._lock:
+            known = {
+                r["csv_path"]: (r["mtime_ns"], r["size"])
+                for r in self._db.execute(
+                    "SELECT csv_path, mtime_ns, size FROM flights"
+                )
+            }
+        seen = set()
+        for root in roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = sorted(
+                    d for d in dirnames if not d.startswith(".")
+                )
+                for name in sorted(filenames):
+                    if not name.lower().endswith(".csv"):
+                        continue
+                    csv_path = os.path.abspath(os.path.join(dirpath, name))
+                    try:
+                        st = os.stat(csv_path)
+                        stamp = (st.st_mtime_ns, st.st_size)
+                        if known.get(csv_path) == stamp and os.path.exists(
+                            self.columns_path(flight_id_for(csv_path))
+                        ):
+                            seen.add(csv_path)
+                            result.unchanged += 1
+                            continue
+                        if not is_sortie_csv(read_header(csv_path)):
+                            continue
+                        record = self._index_file(csv_path, st, root)
+                    except (OSError, ValueError, pd.errors.ParserError):
+                        result.skipped += 1
+                        continue
+                    seen.add(csv_path)
+                    self._upsert(record)
+                    if csv_path in known:
+                        result.updated += 1
+                    else:
+                        result.added += 1
+
+        gone = [p for p in known if p not in seen]
+        # Only forget flights under the scanned roots
+        abs_roots = [os.path.abspath(r) + os.sep for r in roots]
+        gone = [p for p in gone if any(p.startswith(r) for r in abs_roots)]
+        for csv_path in gone:
+            self._forget(csv_path)
+        result.removed = len(gone)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _upsert(self, record: FlightRecord) -> None:
+        data = asdict(record)
+        data["columns"] = json.dumps(record.columns)
+        names = [f.name for f in fields(FlightRecord)]
+        with self._lock, self._db:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO flights ({', '.join(names)}) "
+                f"VALUES ({', '.join('?' for _ in names)})",
+                [data[n] for n in names],
+            )
+
+    def _forget(self, csv_path: str) -> None:
+        flight_id = flight_id_for(csv_path)
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM flights WHERE csv_path = ?", (csv_path,)
+            )
+        try:
+            os.remove(self.columns_path(flight_id))
+        except OSError:
+            pass
+
+    def flights(
+        self, query: str = "", limit: Optional[int] = None
+    ) -> List[FlightRecord]:
+        """Flights whose name or path contains query, by start time."""
+        sql = "SELECT * FROM flights"
+        args: List[object] = []
+        if query.strip():
+            sql += " WHERE name LIKE ? OR csv_path LIKE ?"
+            like = f"%{query.strip()}%"
+            args += [like, like]
+        sql += " ORDER BY t_min, name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [self._record(r) for r in rows]
+
+    def get(self, flight_id: str) -> Optional[FlightRecord]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM flights WHERE flight_id = ?", (flight_id,)
+            ).fetchone()
+        return self._record(row) if row is not None else None
+
+    def find(self, key: str) -> Optional[FlightRecord]:
+        """Look a flight up by id, CSV path or name."""
+        record = self.get(key)
+        if record is not None:
+            return record
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM flights WHERE csv_path = ? OR name = ? "
+                "ORDER BY t_min LIMIT 1",
+                (os.path.abspath(key), key),
+            ).fetchone()
+        return self._record(row) if row is not None else None
+
+    def load_columns(self, flight_id: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        A flight's cached columns, or None when the flight is unknown or
+        its CSV changed since the last scan.
+        """
+        record = self.get(flight_id)
+        if record is None:
+            return None
+        try:
+            st = os.stat(record.csv_path)
+            if (st.st_mtime_ns, st.st_size) != (record.mtime_ns, record.size):
+                return None
+            with np.load(self.columns_path(flight_id)) as npz:
+                return {name: npz[name] for name in npz.files}
+        except (OSError, ValueError):
+            return None
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Index sortie CSVs into a SQLite flight catalog with cached "
+            "columnar data, and list what is indexed."
+        ),
+    )
+    parser.add_argument(
+        "roots",
+        nargs="*",
+        default=[os.path.dirname(os.path.abspath(__file__))],
+        help="Directories to scan (default: this folder)",
+    )
+    parser.add_argument(
+        "--catalog",
+        default=default_catalog_dir(),
+        help="Catalog directory (default: .cache/catalog)",
+    )
+    parser.add_argument(
+        "--no-scan",
+        action="store_true",
+        help="Only list the current catalog",
+    )
+    parser.add_argument("--query", default="", help="Filter by name/path")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    try:
+        catalog = FlightCatalog(args.catalog)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Cannot open catalog {args.catalog}: {e}", file=sys.stderr)
+        return 1
+    try:
+        if not args.no_scan:
+            res = catalog.scan(args.roots)
+            print(
+                f"Scanned in {res.seconds:.2f}s: {res.added} added, "
+                f"{res.updated} updated, {res.unchanged} unchanged, "
+                f"{res.removed} removed, {res.skipped} unreadable",
+                file=sys.stderr,
+            )
+        flights = catalog.flights(args.query)
+    finally:
+        catalog.close()
+
+    if args.json:
+        print(json.dumps([asdict(f) for f in flights], indent=2))
+        return 0
+    for f in flights:
+        ra = f"{f.max_ra_ft:.0f}" if f.max_ra_ft is not None else "-"
+        vs = (
+            f"{f.max_descent_fpm:.0f}"
+            if f.max_descent_fpm is not None
+            else "-"
+        )
+        print(
+            f"{f.flight_id}  {f.label}  {f.rows} rows  "
+            f"max RA {ra} ft  max descent {vs} fpm"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+WORKSPACE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules each entry point must not pull in at import time; they belong to
+# optional subsystems and are imported when first used.
+DEFERRED_MODULES: Dict[str, Tuple[str, ...]] = {
+    "app": ("pydeck", "streamlit_echarts5", "streamlit_stl"),
+    "simulate_blackhawk": ("pyvista", "vtk", "vtkmodules", "pyproj"),
+    "batch_render": ("pyvista", "vtk", "vtkmodules", "pyproj"),
+}
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class EntryReport:
+    entry: str
+    total_ms: float
+    runs_ms: List[float]
+    top: List[ImportRecord]
+    deferred_violations: List[str] = field(default_factory=list)
+    over_budget: bool = False
+
+
+def app_import_source(app_path: str) -> str:
+    """
+    The top-level import statements of a Streamlit script. Running the
+    script itself would start rendering, so only its imports are timed.
+    """
+    with open(app_path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=app_path)
+    nodes = [
+        n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))
+    ]
+    return "\n".join(ast.unparse(n) for n in nodes)
+
+
+def entry_source(entry: str) -> str:
+    if entry == "app":
+        return app_import_source(os.path.join(WORKSPACE, "app.py"))
+    return f"import {entry}"
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse `python -X importtime` output into records."""
+    records: List[ImportRecord] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            # Header line: "self [us] | cumulative | imported package"
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        # One leading space for top-level imports, two more per nesting
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(
+            ImportRecord(stripped, self_us, cumulative_us, depth)
+        )
+    return records
+
+
+def time_entry(
+    entry: str,
+    python: str = sys.executable,
+) -> Tuple[float, List[ImportRecord]]:
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", entry_source(entry)],
+        cwd=WORKSPACE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    records = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["(no output)"]
+        raise RuntimeError(f"importing {entry} failed: {tail[0]}")
+    total_us = sum(r.cumulative_us for r in records if r.depth == 0)
+    return total_us / 1000.0, records
+
+
+def benchmark(
+    entry: str,
+    repeat: int = 5,
+    top: int = 15,
+    budget_ms: Optional[float] = None,
+) -> EntryReport:
+    """
+    Time an entry point's imports in fresh interpreters. The fastest run
+    is reported, which discounts the cold disk cache on the first one.
+    """
+    runs: List[Tuple[float, List[ImportRecord]]] = [
+        time_entry(entry) for _ in range(max(1, repeat))
+    ]
+    best_ms, records = min(runs, key=lambda r: r[0])
+    imported = {r.module for r in records}
+    deferred = DEFERRED_MODULES.get(entry, ())
+    violations = sorted(
+        {m.split(".")[0] for m in imported} & set(deferred)
+    )
+    return EntryReport(
+        entry=entry,
+        total_ms=best_ms,
+        runs_ms=[r[0] for r in runs],
+        top=sorted(records, key=lambda r: -r.cumulative_us)[:top],
+        deferred_violations=violations,
+        over_budget=budget_ms is not None and best_ms > budget_ms,
+    )
+
+
+def format_report(report: EntryReport, budget_ms: Optional[float]) -> str:
+    budget = f" (budget {budget_ms:.0f} ms)" if budget_ms else ""
+    lines = [
+        f"{report.entry}: {report.total_ms:.1f} ms best of "
+        f"{len(report.runs_ms)}{budget}",
+        f"  {'cumulative ms':>13}  {'self ms':>8}  module",
+    ]
+    for r in report.top:
+        lines.append(
+            f"  {r.cumulative_us / 1000.0:13.1f}  {r.self_us / 1000.0:8.1f}"
+            f"  {'  ' * r.depth}{r.module}"
+        )
+    if report.deferred_violations:
+        lines.append(
+            "  imported at startup but should be lazy: "
+            + ", ".join(report.deferred_violations)
+        )
+    if report.over_budget:
+        lines.append("  OVER BUDGET")
+    return "\n".join(lines)
+
+
+def parse_budget(values: List[str]) -> Dict[str, float]:
+    budgets: Dict[str, float] = {}
+    for value in values:
+        entry, sep, ms = value.partition("=")
+        if not sep:
+            raise ValueError(f"Budget must be ENTRY=MS, got {value!r}")
+        budgets[entry.strip()] = float(ms)
+    return budgets
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure cold-start import time of the app and simulator "
+            "entry points with python -X importtime."
+        ),
+    )
+    parser.add_argument(
+        "entries",
+        nargs="*",
+        default=["app", "simulate_blackhawk"],
+        help="Entry points to time (default: app simulate_blackhawk)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Slowest imports to list per entry",
+    )
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="ENTRY=MS",
+        help="Fail when an entry's best import time exceeds MS",
+    )
+    parser.add_argument("--json", help="Write the full report to this file")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    try:
+        budgets = parse_budget(args.budget)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    reports: List[EntryReport] = []
+    for entry in args.entries:
+        try:
+            report = benchmark(
+                entry,
+                repeat=args.repeat,
+                top=args.top,
+                budget_ms=budgets.get(entry),
+            )
+        except RuntimeError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        reports.append(report)
+        print(format_report(report, budgets.get(entry)))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in reports], f, indent=2)
+
+    failed = [
+        r.entry for r in reports if r.deferred_violations or r.over_budget
+    ]
+    if failed:
+        print("Import-time check failed: " + ", ".join(failed),
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
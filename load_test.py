@@ -0,0 +1,432 @@
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+except Exception as exc:
+    raise SystemExit(
+        "Streamlit >= 1.37 is required for the load test.\n"
+        "Install dependencies with:\n"
+        "  pip install -r requirements.txt"
+    ) from exc
+
+
+WORKSPACE = os.path.dirname(os.path.abspath(__file__))
+
+# Bytes of ForwardMsg protos produced by the run on the current thread; the
+# sum is what the browser would receive over the websocket for that rerun.
+_payload = threading.local()
+
+# AppTest builds a fresh ScriptCache per run, so concurrent sessions would
+# all compile app.py at once (CPython's ast is not safe for that). A server
+# compiles once per process; share the bytecode the same way.
+_bytecode: Dict[str, object] = {}
+_bytecode_lock = threading.Lock()
+
+# What install_instrumentation() managed to hook
+_instrumented: Dict[str, bool] = {}
+
+
+def install_instrumentation() -> Dict[str, bool]:
+    """
+    Hook Streamlit's private test-runner internals for payload counting
+    and shared bytecode. Each hook is skipped when the attribute it needs
+    is missing in the installed version; payload is then reported n/a.
+    """
+    if _instrumented:
+        return _instrumented
+    try:
+        from streamlit.testing.v1.local_script_runner import (
+            LocalScriptRunner,
+        )
+    except ImportError:
+        LocalScriptRunner = None
+    try:
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    except ImportError:
+        ScriptCache = None
+
+    _instrumented["payload"] = False
+    if LocalScriptRunner is not None and hasattr(
+        LocalScriptRunner, "forward_msgs"
+    ):
+        original_forward_msgs = LocalScriptRunner.forward_msgs
+
+        def counting_forward_msgs(self):
+            msgs = original_forward_msgs(self)
+            _payload.bytes = sum(m.ByteSize() for m in msgs)
+            _payload.messages = len(msgs)
+            return msgs
+
+        LocalScriptRunner.forward_msgs = counting_forward_msgs
+        _instrumented["payload"] = True
+
+    _instrumented["shared_bytecode"] = False
+    if ScriptCache is not None and hasattr(ScriptCache, "get_bytecode"):
+        original_get_bytecode = ScriptCache.get_bytecode
+
+        def shared_get_bytecode(self, script_path: str):
+            with _bytecode_lock:
+                code = _bytecode.get(script_path)
+                if code is None:
+                    code = original_get_bytecode(self, script_path)
+                    _bytecode[script_path] = code
+                return code
+
+        ScriptCache.get_bytecode = shared_get_bytecode
+        _instrumented["shared_bytecode"] = True
+    return _instrumented
+
+
+@dataclass
+class Sample:
+    session: int
+    action: str
+    latency_ms: float
+    payload_bytes: int
+    messages: int
+    error: Optional[str] = None
+
+
+@dataclass
+class ActionStats:
+    count: int
+    errors: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    mean_payload_bytes: float
+    max_payload_bytes: int
+
+
+@dataclass
+class LoadReport:
+    sessions: int
+    concurrency: int
+    steps: int
+    wall_seconds: float
+    reruns_per_second: float
+    rss_start_mb: float
+    rss_peak_mb: float
+    payload_measured: bool = False
+    actions: Dict[str, ActionStats] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _checkbox(at: AppTest, label: str):
+    for cb in at.checkbox:
+        if cb.label == label:
+            return cb
+    raise KeyError(f"checkbox {label!r} not found")
+
+
+def _toggle(label: str) -> Callable[[AppTest], None]:
+    def act(at: AppTest) -> None:
+        cb = _checkbox(at, label)
+        cb.set_value(not cb.value)
+
+    return act
+
+
+def _sweep(rng: random.Random) -> Callable[[AppTest], None]:
+    def act(at: AppTest) -> None:
+        slider = at.slider(key="time_window")
+        t_min, t_max = int(slider.min), int(slider.max)
+        width = rng.randint(30, max(31, (t_max - t_min) // 2))
+        lo = rng.randint(t_min, max(t_min, t_max - width))
+        slider.set_value((lo, min(lo + width, t_max)))
+
+    return act
+
+
+def _smoothing(rng: random.Random) -> Callable[[AppTest], None]:
+    def act(at: AppTest) -> None:
+        at.slider(key="chart_window").set_value(rng.choice(range(1, 22, 2)))
+
+    return act
+
+
+def _search(rng: random.Random) -> Callable[[AppTest], None]:
+    def act(at: AppTest) -> None:
+        at.text_input(key="transcript_query").input(
+            rng.choice(["climb", "dark", "water", "altitude", ""])
+        )
+
+    return act
+
+
+def build_actions(
+    rng: random.Random,
+) -> List[Tuple[str, Callable[[AppTest], None]]]:
+    return [
+        ("slider_sweep", _sweep(rng)),
+        ("slider_sweep", _sweep(rng)),
+        ("slider_sweep", _sweep(rng)),
+        ("smoothing", _smoothing(rng)),
+        ("toggle_map", _toggle("Show flight path map")),
+        ("toggle_gauges", _toggle("Show summary gauges (simple)")),
+        ("toggle_transcripts", _toggle("Transcripciones")),
+        ("toggle_weather", _toggle("Show weather (visibility & ceiling)")),
+        ("search", _search(rng)),
+    ]
+
+
+def _timed_run(
+    at: AppTest, session: int, action: str, timeout: float
+) -> Sample:
+    _payload.bytes = 0
+    _payload.messages = 0
+    start = time.perf_counter()
+    error = None
+    try:
+        at.run(timeout=timeout)
+        if at.exception:
+            error = at.exception[0].message
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    return Sample(
+        session=session,
+        action=action,
+        latency_ms=(time.perf_counter() - start) * 1000.0,
+        payload_bytes=int(getattr(_payload, "bytes", 0)),
+        messages=int(getattr(_payload, "messages", 0)),
+        error=error,
+    )
+
+
+def run_session(
+    session: int,
+    app_path: str,
+    steps: int,
+    seed: int,
+    timeout: float,
+) -> List[Sample]:
+    """One simulated viewer: initial load, then scripted interactions."""
+    rng = random.Random(seed + session)
+    at = AppTest.from_file(app_path, default_timeout=timeout)
+    samples = [_timed_run(at, session, "initial_load", timeout)]
+    if samples[0].error:
+        return samples
+    actions = build_actions(rng)
+    for _ in range(steps):
+        name, act = rng.choice(actions)
+        try:
+            act(at)
+        except (KeyError, IndexError) as exc:
+            # Widget hidden by an earlier toggle: skip this interaction
+            samples.append(
+                Sample(session, name, 0.0, 0, 0, f"skipped: {exc}")
+            )
+            continue
+        samples.append(_timed_run(at, session, name, timeout))
+    return samples
+
+
+def summarize(samples: List[Sample]) -> Dict[str, ActionStats]:
+    by_action: Dict[str, List[Sample]] = {}
+    for s in samples:
+        by_action.setdefault(s.action, []).append(s)
+    stats: Dict[str, ActionStats] = {}
+    for name in sorted(by_action):
+        group = by_action[name]
+        ok = [s for s in group if not s.error]
+        lat = np.array([s.latency_ms for s in ok] or [0.0])
+        payload = np.array([s.payload_bytes for s in ok] or [0])
+        stats[name] = ActionStats(
+            count=len(group),
+            errors=len(group) - len(ok),
+            p50_ms=float(np.percentile(lat, 50)),
+            p90_ms=float(np.percentile(lat, 90)),
+            p99_ms=float(np.percentile(lat, 99)),
+            max_ms=float(lat.max()),
+            mean_payload_bytes=float(payload.mean()),
+            max_payload_bytes=int(payload.max()),
+        )
+    return stats
+
+
+def run_load_test(
+    sessions: int,
+    concurrency: int,
+    steps: int,
+    seed: int = 0,
+    timeout: float = 60.0,
+    app_path: Optional[str] = None,
+) -> LoadReport:
+    app_path = app_path or os.path.join(WORKSPACE, "app.py")
+    rss_start = current_rss_mb()
+    peak = [rss_start]
+    done = threading.Event()
+
+    def sample_rss() -> None:
+        while not done.wait(0.05):
+            peak[0] = max(peak[0], current_rss_mb())
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    samples: List[Sample] = []
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(run_session, i, app_path, steps, seed, timeout)
+                for i in range(sessions)
+            ]
+            for fut in futures:
+                samples.extend(fut.result())
+    finally:
+        done.set()
+        sampler.join()
+    wall = time.perf_counter() - start
+
+    measured = [s for s in samples if not (s.error or "").startswith("skip")]
+    report = LoadReport(
+        sessions=sessions,
+        concurrency=concurrency,
+        steps=steps,
+        wall_seconds=wall,
+        reruns_per_second=len(measured) / wall if wall > 0 else 0.0,
+        rss_start_mb=rss_start,
+        rss_peak_mb=max(peak[0], current_rss_mb()),
+        payload_measured=_instrumented.get("payload", False),
+        actions=summarize(measured),
+        errors=sorted({
+            f"{s.action}: {s.error}" for s in measured if s.error
+        }),
+    )
+    return report
+
+
+def format_report(report: LoadReport) -> str:
+    lines = [
+        f"{report.sessions} session(s), {report.concurrency} concurrent, "
+        f"{report.steps} interaction(s) each: {report.wall_seconds:.1f}s, "
+        f"{report.reruns_per_second:.1f} reruns/s",
+        f"RSS {report.rss_start_mb:.0f} MB at start, "
+        f"{report.rss_peak_mb:.0f} MB peak "
+        f"(+{report.rss_peak_mb - report.rss_start_mb:.0f} MB)",
+        f"  {'action':<20}{'n':>5}{'err':>5}{'p50 ms':>9}{'p90 ms':>9}"
+        f"{'p99 ms':>9}{'max ms':>9}{'payload KB':>12}",
+    ]
+    for name, st in report.actions.items():
+        payload = (
+            f"{st.mean_payload_bytes / 1024:>12.1f}"
+            if report.payload_measured
+            else f"{'n/a':>12}"
+        )
+        lines.append(
+            f"  {name:<20}{st.count:>5}{st.errors:>5}{st.p50_ms:>9.0f}"
+            f"{st.p90_ms:>9.0f}{st.p99_ms:>9.0f}{st.max_ms:>9.0f}"
+            + payload
+        )
+    for err in report.errors[:10]:
+        lines.append(f"  error: {err}")
+    return "\n".join(lines)
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Drive app.py headlessly with concurrent simulated viewers and "
+            "report rerun latency, peak RSS and payload size."
+        ),
+    )
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Sessions running at the same time (default: 4)",
+    )
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=10,
+        help="Scripted interactions per session after the first load",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Per-rerun timeout in seconds",
+    )
+    parser.add_argument(
+        "--max-p90-ms",
+        type=float,
+        help="Fail when any action's p90 latency exceeds this",
+    )
+    parser.add_argument("--json", help="Write the report to this file")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    if args.sessions < 1 or args.concurrency < 1 or args.steps < 0:
+        print("sessions and concurrency must be >= 1", file=sys.stderr)
+        return 2
+    # AppTest resolves the data files relative to the working directory
+    os.chdir(WORKSPACE)
+    # Bare-mode sessions log "missing ScriptRunContext" on every thread
+    set_log_level("error")
+    hooks = install_instrumentation()
+    if not hooks["payload"]:
+        print(
+            "This Streamlit version has no LocalScriptRunner.forward_msgs; "
+            "payload sizes are not measured.",
+            file=sys.stderr,
+        )
+    report = run_load_test(
+        sessions=args.sessions,
+        concurrency=min(args.concurrency, args.sessions),
+        steps=args.steps,
+        seed=args.seed,
+        timeout=args.timeout,
+    )
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(asdict(report), f, indent=2)
+
+    if report.errors:
+        return 1
+    if args.max_p90_ms is not None and any(
+        st.p90_ms > args.max_p90_ms for st in report.actions.values()
+    ):
+        print(
+            f"p90 latency above {args.max_p90_ms:.0f} ms", file=sys.stderr
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
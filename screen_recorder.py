@@ -1,10 +1,18 @@
 import argparse
+import asyncio
+import collections
+import dataclasses
 import datetime
+import json
 import os
 import re
+import shutil
+import signal
 import subprocess
 import sys
-from typing import List, Optional, Tuple
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
 
 
 def build_default_output_path(output: Optional[str]) -> str:
@@ -14,23 +22,175 @@ def build_default_output_path(output: Optional[str]) -> str:
     return os.path.abspath(f"recording_{timestamp}.mp4")
 
 
-def ffmpeg_available(ffmpeg_bin: str) -> bool:
+CAPS_CACHE_VERSION = 1
+
+# Capabilities already loaded in this process, keyed by resolved binary
+_caps_memo: Dict[str, dict] = {}
+
+
+def default_caps_cache_path() -> str:
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        ".cache",
+        "ffmpeg_caps.json",
+    )
+
+
+def _read_caps_cache(cache_path: str) -> dict:
     try:
-        subprocess.run(
-            [ffmpeg_bin, "-version"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=False,
-        )
-        return True
-    except FileNotFoundError:
-        return False
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("cache_version") != CAPS_CACHE_VERSION:
+        return {}
+    return cache
+
+
+def _write_caps_entry(cache_path: str, binary: str, entry: dict) -> None:
+    cache = _read_caps_cache(cache_path)
+    cache["cache_version"] = CAPS_CACHE_VERSION
+    cache.setdefault("binaries", {})[binary] = entry
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Caching is best effort; the probe result is still returned
+        pass
+
+
+def _run_ffmpeg_text(cmd: List[str]) -> str:
+    proc = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return (proc.stdout or "") + (proc.stderr or "")
+
+
+def probe_capabilities(
+    ffmpeg_bin: str,
+    refresh: bool = False,
+    cache_path: Optional[str] = None,
+) -> Optional[dict]:
+    """Version, encoders and input devices of ffmpeg_bin, or None if it
+    cannot be found.
+
+    Results are cached in a small JSON file keyed by the resolved binary
+    path and invalidated when the binary's mtime or size changes, so only
+    the first run after installing/upgrading ffmpeg spawns probes.
+    """
+    binary = shutil.which(ffmpeg_bin)
+    if binary is None:
+        return None
+    binary = os.path.realpath(binary)
+    st = os.stat(binary)
+    stamp = [st.st_mtime_ns, st.st_size]
+
+    memo = _caps_memo.get(binary)
+    if not refresh and memo is not None and memo["stamp"] == stamp:
+        return memo
+
+    cache_path = cache_path or default_caps_cache_path()
+    entry = _read_caps_cache(cache_path).get("binaries", {}).get(binary)
+    if refresh or entry is None or entry.get("stamp") != stamp:
+        try:
+            version_text = _run_ffmpeg_text([binary, "-version"])
+            encoders_text = _run_ffmpeg_text(
+                [binary, "-hide_banner", "-encoders"]
+            )
+            devices_text = _run_ffmpeg_text(
+                [binary, "-hide_banner", "-devices"]
+            )
+        except OSError:
+            return None
+        lines = version_text.splitlines()
+        entry = {
+            "stamp": stamp,
+            "version": lines[0] if lines else "ffmpeg found",
+            "encoders": sorted(parse_encoders(encoders_text)),
+            "input_devices": sorted(parse_input_devices(devices_text)),
+            "audio_devices": {},
+        }
+        _write_caps_entry(cache_path, binary, entry)
+    entry["binary"] = binary
+    entry["cache_path"] = cache_path
+    _caps_memo[binary] = entry
+    return entry
+
+
+def ffmpeg_available(ffmpeg_bin: str) -> bool:
+    return probe_capabilities(ffmpeg_bin) is not None
+
+
+def parse_input_devices(text: str) -> FrozenSet[str]:
+    # Lines look like: " D  x11grab         X11 screen capture"
+    names = set()
+    for line in text.splitlines():
+        m = re.match(r"^\s(D)[E ]\s(\S+)\s", line)
+        if m:
+            names.add(m.group(2))
+    return frozenset(names)
+
+
+def cached_audio_devices(
+    ffmpeg_bin: str,
+    audio_backend: Optional[str] = None,
+    refresh: bool = False,
+) -> Tuple[List[str], str]:
+    """list_audio_devices() memoized in the capability cache; pass
+    refresh=True after plugging in new hardware. Empty results are not
+    cached.
+    """
+    audio_backend = audio_backend or default_audio_backend()
+    caps = probe_capabilities(ffmpeg_bin)
+    if caps is None:
+        return [], ""
+    listing = caps["audio_devices"].get(audio_backend)
+    if refresh or listing is None:
+        devices, raw = list_audio_devices(caps["binary"], audio_backend)
+        listing = {"devices": devices, "raw": raw}
+        if not devices:
+            # Nothing parsed (no server running?): do not cache the miss
+            return devices, raw
+        caps["audio_devices"][audio_backend] = listing
+        entry = {
+            k: v for k, v in caps.items() if k not in ("binary", "cache_path")
+        }
+        _write_caps_entry(caps["cache_path"], caps["binary"], entry)
+    return list(listing["devices"]), listing["raw"]
 
 
-def list_audio_devices(ffmpeg_bin: str) -> Tuple[List[str], str]:
+def default_capture_backend() -> str:
+    return "gdigrab" if sys.platform == "win32" else "x11grab"
+
+
+def default_audio_backend() -> str:
+    return "dshow" if sys.platform == "win32" else "pulse"
+
+
+def default_x11_display(display: Optional[str] = None) -> str:
+    """X display to capture: explicit value, then $DISPLAY, then :0.0
+    (pass e.g. :99 to record inside Xvfb).
+    """
+    return display or os.environ.get("DISPLAY") or ":0.0"
+
+
+def list_audio_devices(
+    ffmpeg_bin: str,
+    audio_backend: Optional[str] = None,
+) -> Tuple[List[str], str]:
     """Return (devices, raw_output). Uses ffmpeg dshow device
-    listing on Windows.
+    listing on Windows and ``ffmpeg -sources`` for pulse/alsa.
     """
+    audio_backend = audio_backend or default_audio_backend()
+    if audio_backend != "dshow":
+        return list_source_devices(ffmpeg_bin, audio_backend)
+
     cmd = [
         ffmpeg_bin,
         "-hide_banner",
@@ -69,12 +229,39 @@ def list_audio_devices(ffmpeg_bin: str) -> Tuple[List[str], str]:
     return devices, stderr
 
 
+def list_source_devices(
+    ffmpeg_bin: str,
+    audio_backend: str,
+) -> Tuple[List[str], str]:
+    """Return (devices, raw_output) from ``ffmpeg -sources <backend>``
+    (pulse or alsa on Linux).
+    """
+    proc = subprocess.run(
+        [ffmpeg_bin, "-hide_banner", "-sources", audio_backend],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    raw = (proc.stdout or "") + (proc.stderr or "")
+    devices: List[str] = []
+    # Typical lines:
+    # Auto-detected sources for pulse:
+    # * alsa_input.pci-0000_00_1f.3.analog-stereo [Built-in Audio]
+    #   alsa_output.pci-0000_00_1f.3.analog-stereo.monitor [Monitor of ...]
+    for line in raw.splitlines():
+        m = re.match(r"^\s*\*?\s*(\S+)\s+\[.*\]\s*$", line)
+        if m:
+            devices.append(m.group(1))
+    return devices, raw
+
+
 def enumerate_windows() -> List[Tuple[int, str]]:
     """Enumerate visible top-level windows: returns list of
-    (hwnd, title). Windows-only.
+    (window id, title). Uses the Win32 API on Windows and
+    xwininfo (or python-xlib) on X11.
     """
     if sys.platform != "win32":
-        return []
+        return enumerate_x11_windows()
 
     import ctypes
     from ctypes import wintypes
@@ -138,6 +325,423 @@ def enumerate_windows() -> List[Tuple[int, str]]:
     return unique
 
 
+def _parse_xwininfo_tree(text: str) -> List[Tuple[int, str]]:
+    # Lines look like:
+    #      0x1a00007 "Title": ("class" "Class")  800x600+0+0  +10+20
+    windows: List[Tuple[int, str]] = []
+    seen = set()
+    for line in text.splitlines():
+        m = re.match(
+            r'^\s*(0x[0-9a-fA-F]+)\s+"(.*)":\s.*?(\d+)x(\d+)[+-]', line
+        )
+        if not m:
+            continue
+        title = m.group(2).strip()
+        width, height = int(m.group(3)), int(m.group(4))
+        if not title or width <= 1 or height <= 1 or title in seen:
+            continue
+        seen.add(title)
+        windows.append((int(m.group(1), 16), title))
+    return windows
+
+
+def enumerate_x11_windows(
+    display: Optional[str] = None,
+) -> List[Tuple[int, str]]:
+    """Named X11 windows as (window id, title), deduplicated by title."""
+    env = dict(os.environ, DISPLAY=default_x11_display(display))
+    if shutil.which("xwininfo"):
+        proc = subprocess.run(
+            ["xwininfo", "-root", "-tree"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            env=env,
+        )
+        return _parse_xwininfo_tree(proc.stdout or "")
+    try:
+        from Xlib import display as xdisplay
+    except ImportError:
+        return []
+
+    dpy = xdisplay.Display(env["DISPLAY"])
+    windows: List[Tuple[int, str]] = []
+    seen = set()
+    stack = [dpy.screen().root]
+    while stack:
+        win = stack.pop()
+        try:
+            title = win.get_wm_name()
+            geom = win.get_geometry()
+            children = win.query_tree().children
+        except Exception:
+            continue
+        if isinstance(title, bytes):
+            title = title.decode("utf-8", "replace")
+        title = (title or "").strip()
+        if title and title not in seen and geom.width > 1 and geom.height > 1:
+            seen.add(title)
+            windows.append((int(win.id), title))
+        stack.extend(reversed(children))
+    dpy.close()
+    return windows
+
+
+def x11_window_geometry(
+    window_title: str,
+    display: Optional[str] = None,
+) -> Tuple[int, int, int, int]:
+    """Absolute (x, y, width, height) of the X11 window with this exact
+    title, via xwininfo or python-xlib.
+    """
+    env = dict(os.environ, DISPLAY=default_x11_display(display))
+    if shutil.which("xwininfo"):
+        proc = subprocess.run(
+            ["xwininfo", "-name", window_title],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env,
+        )
+        fields = {}
+        for line in (proc.stdout or "").splitlines():
+            key, sep, value = line.strip().partition(":")
+            if sep:
+                fields[key.strip()] = value.strip()
+        try:
+            return (
+                int(fields["Absolute upper-left X"]),
+                int(fields["Absolute upper-left Y"]),
+                int(fields["Width"]),
+                int(fields["Height"]),
+            )
+        except (KeyError, ValueError):
+            raise ValueError(
+                f"X11 window not found: {window_title!r}"
+            ) from None
+    try:
+        from Xlib import display as xdisplay
+    except ImportError:
+        raise ValueError(
+            "Window capture on X11 needs xwininfo (x11-utils) "
+            "or python-xlib"
+        ) from None
+
+    dpy = xdisplay.Display(env["DISPLAY"])
+    try:
+        root = dpy.screen().root
+        for wid, title in enumerate_x11_windows(display):
+            if title != window_title:
+                continue
+            win = dpy.create_resource_object("window", wid)
+            geom = win.get_geometry()
+            pos = win.translate_coords(root, 0, 0)
+            return (-pos.x, -pos.y, int(geom.width), int(geom.height))
+    finally:
+        dpy.close()
+    raise ValueError(f"X11 window not found: {window_title!r}")
+
+
+# A capture backend turns the capture target into ffmpeg input arguments
+# plus any video filters the input needs before encoding.
+CaptureBackend = Callable[..., Tuple[List[str], List[str]]]
+
+
+def _gdigrab_input(
+    mode: str,
+    fps: int,
+    show_cursor: bool,
+    window_title: Optional[str],
+    region: Optional[Tuple[int, int, int, int]],
+    display: Optional[str],
+) -> Tuple[List[str], List[str]]:
+    args = [
+        "-f",
+        "gdigrab",
+        "-framerate",
+        str(fps),
+        "-draw_mouse",
+        "1" if show_cursor else "0",
+    ]
+    if mode == "desktop":
+        args += ["-i", "desktop"]
+    elif mode == "window":
+        args += ["-i", f"title={window_title}"]
+    else:
+        x, y, w, h = region
+        args += [
+            "-offset_x",
+            str(x),
+            "-offset_y",
+            str(y),
+            "-video_size",
+            f"{w}x{h}",
+            "-i",
+            "desktop",
+        ]
+    return args, []
+
+
+def _x11grab_input(
+    mode: str,
+    fps: int,
+    show_cursor: bool,
+    window_title: Optional[str],
+    region: Optional[Tuple[int, int, int, int]],
+    display: Optional[str],
+) -> Tuple[List[str], List[str]]:
+    disp = default_x11_display(display)
+    args = [
+        "-f",
+        "x11grab",
+        "-framerate",
+        str(fps),
+        "-draw_mouse",
+        "1" if show_cursor else "0",
+    ]
+    if mode == "window":
+        region = x11_window_geometry(window_title, display)
+    if mode == "desktop":
+        args += ["-i", disp]
+    else:
+        x, y, w, h = region
+        # yuv420p needs even dimensions
+        w, h = max(w - w % 2, 2), max(h - h % 2, 2)
+        args += ["-video_size", f"{w}x{h}", "-i", f"{disp}+{x},{y}"]
+    return args, []
+
+
+def _kmsgrab_input(
+    mode: str,
+    fps: int,
+    show_cursor: bool,
+    window_title: Optional[str],
+    region: Optional[Tuple[int, int, int, int]],
+    display: Optional[str],
+) -> Tuple[List[str], List[str]]:
+    # kmsgrab reads the DRM framebuffer directly (no X server needed, but
+    # needs CAP_SYS_ADMIN); the cursor plane and windows are not visible.
+    if mode == "window":
+        raise ValueError("kmsgrab cannot capture a single window")
+    args = [
+        "-device",
+        display or "/dev/dri/card0",
+        "-f",
+        "kmsgrab",
+        "-framerate",
+        str(fps),
+        "-i",
+        "-",
+    ]
+    filters = ["hwdownload", "format=bgr0"]
+    if mode == "region":
+        x, y, w, h = region
+        filters.append(f"crop={w - w % 2}:{h - h % 2}:{x}:{y}")
+    return args, filters
+
+
+CAPTURE_BACKENDS: Dict[str, CaptureBackend] = {
+    "gdigrab": _gdigrab_input,
+    "x11grab": _x11grab_input,
+    "kmsgrab": _kmsgrab_input,
+}
+
+
+def build_audio_input(audio_backend: str, audio_device: str) -> List[str]:
+    if audio_backend == "dshow":
+        return ["-f", "dshow", "-i", f"audio={audio_device}"]
+    if audio_backend in ("pulse", "alsa"):
+        return ["-f", audio_backend, "-i", audio_device]
+    raise ValueError(f"Unknown audio backend: {audio_backend}")
+
+
+@dataclass(frozen=True)
+class EncoderProfile:
+    """Named video encoder settings. threads is "all" (ffmpeg picks) or
+    "spare" (leave one core free for the capture input).
+    """
+
+    codec: str
+    preset: str
+    crf: int
+    description: str
+    tune: Optional[str] = None
+    gop_seconds: Optional[float] = None
+    threads: str = "all"
+    extra: Tuple[str, ...] = ()
+    fallback: Optional[str] = None
+
+
+ENCODER_PROFILES: Dict[str, EncoderProfile] = {
+    "realtime": EncoderProfile(
+        codec="libx264",
+        preset="ultrafast",
+        crf=23,
+        tune="zerolatency",
+        gop_seconds=1.0,
+        threads="spare",
+        description="Lowest latency/CPU; 1 s fixed GOP for live review",
+    ),
+    "archive": EncoderProfile(
+        codec="libx264",
+        preset="slow",
+        crf=20,
+        description="Smaller files at high quality; slower than realtime",
+    ),
+    "hevc": EncoderProfile(
+        codec="libx265",
+        preset="medium",
+        crf=24,
+        extra=("-tag:v", "hvc1", "-x265-params", "log-level=error"),
+        fallback="archive",
+        description="H.265 archive, roughly 40 percent smaller than x264",
+    ),
+    "av1": EncoderProfile(
+        codec="libsvtav1",
+        preset="8",
+        crf=32,
+        gop_seconds=10.0,
+        fallback="hevc",
+        description="AV1 via SVT-AV1 archive (smallest files)",
+    ),
+}
+
+
+def probe_encoders(ffmpeg_bin: str) -> FrozenSet[str]:
+    """Names of the encoders compiled into ffmpeg_bin, from the cached
+    capability probe (``ffmpeg -encoders``).
+    """
+    caps = probe_capabilities(ffmpeg_bin)
+    return frozenset(caps["encoders"]) if caps else frozenset()
+
+
+def parse_encoders(text: str) -> FrozenSet[str]:
+    # Lines look like: " V....D libx264   libx264 H.264 / AVC ..."
+    names = set()
+    for line in text.splitlines():
+        m = re.match(r"^\s*[VAS][F.][S.][X.][B.][D.]\s+(\S+)", line)
+        if m and m.group(1) != "=":
+            names.add(m.group(1))
+    return frozenset(names)
+
+
+def resolve_encoder_profile(
+    name: str,
+    available: FrozenSet[str],
+) -> Tuple[str, EncoderProfile]:
+    """Follow fallbacks until a profile whose codec this ffmpeg supports
+    is found. Returns (profile name, profile).
+    """
+    seen = []
+    current: Optional[str] = name
+    while current is not None and current not in seen:
+        seen.append(current)
+        profile = ENCODER_PROFILES[current]
+        if profile.codec in available:
+            return current, profile
+        current = profile.fallback
+    raise ValueError(
+        f"ffmpeg has no encoder for profile '{name}' "
+        f"(tried {', '.join(seen)})"
+    )
+
+
+def encoder_profile_args(profile: EncoderProfile, fps: int) -> List[str]:
+    args = ["-c:v", profile.codec, "-preset", profile.preset]
+    if profile.tune:
+        args += ["-tune", profile.tune]
+    args += ["-crf", str(profile.crf)]
+    if profile.gop_seconds:
+        gop = max(1, int(round(fps * profile.gop_seconds)))
+        args += ["-g", str(gop), "-keyint_min", str(gop)]
+        if profile.codec in ("libx264", "libx265"):
+            # Fixed GOP: no extra keyframes on scene cuts
+            args += ["-sc_threshold", "0"]
+    if profile.threads == "spare":
+        args += ["-threads", str(max(1, (os.cpu_count() or 2) - 1))]
+    else:
+        args += ["-threads", "0"]
+    args += list(profile.extra)
+    args += ["-pix_fmt", "yuv420p"]
+    return args
+
+
+def segment_paths(output_path: str) -> Tuple[str, str]:
+    """(segment filename pattern, ffconcat list path) for a segmented
+    recording whose joined result would be output_path.
+    """
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}_%05d{ext or '.mp4'}", f"{stem}_segments.ffconcat"
+
+
+def build_segment_output(
+    output_path: str,
+    segment_time: float,
+    segment_keep: Optional[int],
+) -> List[str]:
+    """Segment muxer output arguments. Keyframes are forced on segment
+    boundaries, and each segment is a fragmented MP4 so a crash loses at
+    most the last fragment. With segment_keep, file names wrap around so
+    only the newest segment_keep segments stay on disk.
+    """
+    pattern, list_path = segment_paths(output_path)
+    seg = f"{segment_time:g}"
+    args = [
+        "-force_key_frames",
+        f"expr:gte(t,n_forced*{seg})",
+        "-f",
+        "segment",
+        "-segment_time",
+        seg,
+        "-reset_timestamps",
+        "1",
+        "-segment_format_options",
+        "movflags=+frag_keyframe+empty_moov+default_base_moof",
+        "-segment_list",
+        list_path,
+        "-segment_list_type",
+        "ffconcat",
+    ]
+    if segment_keep and segment_keep > 0:
+        args += [
+            "-segment_list_size",
+            str(segment_keep),
+            "-segment_wrap",
+            str(segment_keep),
+        ]
+    return args + [pattern]
+
+
+def concat_segments(
+    ffmpeg_bin: str,
+    output_path: str,
+    show_output: bool = False,
+) -> int:
+    """Join the segments listed for output_path into output_path without
+    re-encoding (ffmpeg concat demuxer, stream copy).
+    """
+    _, list_path = segment_paths(output_path)
+    if not os.path.exists(list_path):
+        print(f"Segment list not found: {list_path}", file=sys.stderr)
+        return 1
+    cmd = [
+        ffmpeg_bin,
+        "-y",
+        "-hide_banner",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        list_path,
+        "-c",
+        "copy",
+        output_path,
+    ]
+    out = None if show_output else subprocess.DEVNULL
+    return subprocess.run(cmd, stdout=out, stderr=out).returncode
+
+
 def build_ffmpeg_command(
     ffmpeg_bin: str,
     mode: str,
@@ -151,67 +755,76 @@ def build_ffmpeg_command(
     audio_bitrate_kbps: int,
     duration: Optional[float],
     output_path: str,
+    backend: Optional[str] = None,
+    audio_backend: Optional[str] = None,
+    display: Optional[str] = None,
+    encoder_args: Optional[List[str]] = None,
+    segment_time: Optional[float] = None,
+    segment_keep: Optional[int] = None,
 ) -> List[str]:
+    backend = backend or default_capture_backend()
+    audio_backend = audio_backend or default_audio_backend()
+    if backend not in CAPTURE_BACKENDS:
+        raise ValueError(f"Unknown capture backend: {backend}")
+
     cmd: List[str] = [ffmpeg_bin, "-y"]
 
     if duration and duration > 0:
         cmd += ["-t", str(duration)]
 
-    # Video input (gdigrab)
-    cmd += [
-        "-f",
-        "gdigrab",
-        "-framerate",
-        str(fps),
-        "-draw_mouse",
-        "1" if show_cursor else "0",
-    ]
-    if mode == "desktop":
-        cmd += ["-i", "desktop"]
-    elif mode == "window":
+    if mode == "window":
         if not window_title:
             raise ValueError("--window-title is required when --mode window")
-        cmd += ["-i", f"title={window_title}"]
     elif mode == "region":
         if not region:
             raise ValueError(
                 "--x/--y/--width/--height are required when --mode region"
             )
-        x, y, w, h = region
-        cmd += [
-            "-offset_x",
-            str(x),
-            "-offset_y",
-            str(y),
-            "-video_size",
-            f"{w}x{h}",
-            "-i",
-            "desktop",
-        ]
-    else:
+    elif mode != "desktop":
         raise ValueError(f"Unknown mode: {mode}")
 
-    # Optional audio input (dshow)
+    # Video input
+    video_args, video_filters = CAPTURE_BACKENDS[backend](
+        mode=mode,
+        fps=fps,
+        show_cursor=show_cursor,
+        window_title=window_title,
+        region=region,
+        display=display,
+    )
+    cmd += video_args
+
+    # Optional audio input
     if audio_device:
-        cmd += ["-f", "dshow", "-i", f"audio={audio_device}"]
-
-    # Encoding settings
-    cmd += [
-        "-c:v",
-        "libx264",
-        "-preset",
-        preset,
-        "-crf",
-        str(crf),
-        "-pix_fmt",
-        "yuv420p",
-    ]
+        cmd += build_audio_input(audio_backend, audio_device)
+
+    if video_filters:
+        cmd += ["-vf", ",".join(video_filters)]
+
+    # Encoding settings (an encoder profile replaces the x264 defaults)
+    if encoder_args is not None:
+        cmd += encoder_args
+    else:
+        cmd += [
+            "-c:v",
+            "libx264",
+            "-preset",
+            preset,
+            "-crf",
+            str(crf),
+            "-pix_fmt",
+            "yuv420p",
+        ]
     if audio_device:
         cmd += ["-c:a", "aac", "-b:a", f"{audio_bitrate_kbps}k"]
     else:
         # No audio
         cmd += ["-an"]
 
+    if segment_time and segment_time > 0:
+        cmd += build_segment_output(output_path, segment_time, segment_keep)
+        return cmd
+
     # Better mp4 streaming compatibility
     cmd += ["-movflags", "+faststart", output_path]
     return cmd
@@ -250,6 +863,222 @@ def run_ffmpeg(cmd: List[str], show_output: bool) -> int:
         return 1
 
 
+@dataclass
+class RecorderStats:
+    """Latest values from ffmpeg's ``-progress`` output."""
+
+    frame: int = 0
+    fps: float = 0.0
+    drop_frames: int = 0
+    dup_frames: int = 0
+    bitrate_kbps: float = 0.0
+    speed: float = 0.0
+    out_time_s: float = 0.0
+    total_size: int = 0
+    finished: bool = False
+    updated_at: float = 0.0
+
+    def lagging(self, threshold: float = 0.95) -> bool:
+        """True when the encoder runs slower than real time (speed below
+        threshold) or the capture is dropping frames.
+        """
+        if self.out_time_s <= 1.0:
+            return False
+        return (0.0 < self.speed < threshold) or self.drop_frames > 0
+
+
+def _progress_number(value: str, suffix: str = "") -> Optional[float]:
+    value = value.strip()
+    if suffix and value.endswith(suffix):
+        value = value[: -len(suffix)]
+    try:
+        return float(value)
+    except ValueError:
+        # "N/A" before the first packet is written
+        return None
+
+
+def apply_progress_line(stats: RecorderStats, line: str) -> bool:
+    """Update stats from one ``key=value`` progress line. Returns True at
+    the end of a progress block (the ``progress=`` key).
+    """
+    key, sep, value = line.strip().partition("=")
+    if not sep:
+        return False
+    if key in ("frame", "drop_frames", "dup_frames", "total_size"):
+        num = _progress_number(value)
+        if num is not None:
+            setattr(stats, key, int(num))
+    elif key == "fps":
+        stats.fps = _progress_number(value) or 0.0
+    elif key == "bitrate":
+        stats.bitrate_kbps = _progress_number(value, "kbits/s") or 0.0
+    elif key == "speed":
+        stats.speed = _progress_number(value, "x") or 0.0
+    elif key == "out_time_us":
+        num = _progress_number(value)
+        if num is not None:
+            stats.out_time_s = num / 1e6
+    elif key == "progress":
+        stats.finished = value.strip() == "end"
+        stats.updated_at = time.monotonic()
+        return True
+    return False
+
+
+class Recorder:
+    """Drive an ffmpeg recording from asyncio code.
+
+    ``cmd`` is a full ffmpeg command such as the one returned by
+    build_ffmpeg_command(). ``-progress pipe:1`` is added and parsed by a
+    background task, so ``stats`` always holds the live fps, dropped
+    frames, bitrate and encode speed; ``on_progress`` is called with a
+    snapshot after every progress block.
+
+        rec = Recorder(cmd)
+        await rec.start()
+        ...
+        if rec.stats.lagging():
+            ...
+        rc = await rec.stop()
+    """
+
+    def __init__(
+        self,
+        cmd: List[str],
+        on_progress: Optional[Callable[[RecorderStats], None]] = None,
+    ):
+        self.cmd = [cmd[0], "-progress", "pipe:1", "-nostats"] + cmd[1:]
+        self.on_progress = on_progress
+        self._stats = RecorderStats()
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._tasks: List[asyncio.Task] = []
+        # Last ffmpeg log lines, for error reporting
+        self.log_tail: collections.deque = collections.deque(maxlen=50)
+
+    @property
+    def stats(self) -> RecorderStats:
+        return dataclasses.replace(self._stats)
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def start(self) -> None:
+        if self.running:
+            raise RuntimeError("Recorder already started")
+        self._stats = RecorderStats()
+        self._proc = await asyncio.create_subprocess_exec(
+            *self.cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._tasks = [
+            asyncio.create_task(self._read_progress(self._proc.stdout)),
+            asyncio.create_task(self._read_log(self._proc.stderr)),
+        ]
+
+    async def _read_progress(self, stream: asyncio.StreamReader) -> None:
+        while True:
+            raw = await stream.readline()
+            if not raw:
+                break
+            line = raw.decode("utf-8", "replace")
+            if apply_progress_line(self._stats, line) and self.on_progress:
+                self.on_progress(self.stats)
+
+    async def _read_log(self, stream: asyncio.StreamReader) -> None:
+        while True:
+            raw = await stream.readline()
+            if not raw:
+                break
+            self.log_tail.append(raw.decode("utf-8", "replace").rstrip())
+
+    async def wait(self) -> int:
+        """Wait for ffmpeg to exit on its own (e.g. a -t duration)."""
+        if self._proc is None:
+            raise RuntimeError("Recorder not started")
+        rc = await self._proc.wait()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        return rc
+
+    async def stop(self, timeout: float = 10.0) -> int:
+        """Ask ffmpeg to finish cleanly ('q' on stdin), escalating to
+        terminate/kill after timeout seconds. Returns the exit code.
+        """
+        if self._proc is None:
+            raise RuntimeError("Recorder not started")
+        proc = self._proc
+        if proc.returncode is None and proc.stdin is not None:
+            try:
+                proc.stdin.write(b"q")
+                await proc.stdin.drain()
+                proc.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+        return await self.wait()
+
+
+async def _record_with_progress(cmd: List[str]) -> int:
+    def show(st: RecorderStats) -> None:
+        flag = "  LAGGING" if st.lagging() else ""
+        print(
+            f"\r{st.out_time_s:8.1f}s  frame={st.frame}  "
+            f"fps={st.fps:5.1f}  drop={st.drop_frames}  "
+            f"{st.bitrate_kbps:8.1f} kbit/s  speed={st.speed:4.2f}x{flag}",
+            end="",
+            flush=True,
+        )
+
+    rec = Recorder(cmd, on_progress=show)
+    await rec.start()
+    try:
+        rc = await rec.wait()
+    except asyncio.CancelledError:
+        # First Ctrl+C: let ffmpeg finalize the file; a second one must
+        # not cut that short (stop() escalates on its own timeout)
+        previous = None
+        try:
+            previous = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        except ValueError:
+            pass  # not the main thread
+        try:
+            rc = await rec.stop()
+        finally:
+            if previous is not None:
+                signal.signal(signal.SIGINT, previous)
+    print()
+    if rc != 0 and rec.log_tail:
+        print("\n".join(rec.log_tail), file=sys.stderr)
+    return rc
+
+
+def run_with_progress(cmd: List[str]) -> int:
+    print("Starting recording... Press Ctrl+C to stop.")
+    try:
+        return asyncio.run(_record_with_progress(cmd))
+    except FileNotFoundError:
+        print(
+            "Error: ffmpeg not found. Please install ffmpeg and add it to "
+            "PATH.",
+            file=sys.stderr,
+        )
+        return 1
+    except KeyboardInterrupt:
+        print("\nInterrupted; the recording may be incomplete.",
+              file=sys.stderr)
+        return 130
+
+
 def cmd_record(args: argparse.Namespace) -> int:
     ffmpeg_bin = args.ffmpeg or "ffmpeg"
     if not ffmpeg_available(ffmpeg_bin):
@@ -260,6 +1089,15 @@ def cmd_record(args: argparse.Namespace) -> int:
         )
         return 1
 
+    caps = probe_capabilities(ffmpeg_bin)
+    if caps and args.backend not in caps["input_devices"]:
+        print(
+            f"This ffmpeg build has no '{args.backend}' input device "
+            "(see check-ffmpeg).",
+            file=sys.stderr,
+        )
+        return 1
+
     output_path = build_default_output_path(args.output)
     if os.path.isdir(output_path):
         print(
@@ -282,6 +1120,23 @@ def cmd_record(args: argparse.Namespace) -> int:
                 return 1
         region = (int(args.x), int(args.y), int(args.width), int(args.height))
 
+    encoder_args = None
+    if args.profile != "custom":
+        try:
+            used, profile = resolve_encoder_profile(
+                args.profile, probe_encoders(ffmpeg_bin)
+            )
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        if used != args.profile:
+            print(
+                f"Encoder profile '{args.profile}' is not supported by this "
+                f"ffmpeg; using '{used}' ({profile.codec}).",
+                file=sys.stderr,
+            )
+        encoder_args = encoder_profile_args(profile, int(args.fps))
+
     try:
         cmd = build_ffmpeg_command(
             ffmpeg_bin=ffmpeg_bin,
@@ -296,28 +1151,55 @@ def cmd_record(args: argparse.Namespace) -> int:
             audio_bitrate_kbps=int(args.audio_bitrate),
             duration=float(args.duration) if args.duration else None,
             output_path=output_path,
+            backend=args.backend,
+            audio_backend=args.audio_backend,
+            display=args.display,
+            encoder_args=encoder_args,
+            segment_time=args.segment_time,
+            segment_keep=args.segment_keep,
         )
     except ValueError as e:
         print(str(e), file=sys.stderr)
         return 1
 
-    rc = run_ffmpeg(
-        cmd,
-        show_output=bool(args.show_ffmpeg),
-    )
+    if args.progress:
+        rc = run_with_progress(cmd)
+    else:
+        rc = run_ffmpeg(
+            cmd,
+            show_output=bool(args.show_ffmpeg),
+        )
+    if args.segment_time:
+        pattern, list_path = segment_paths(output_path)
+        print(f"Segments: {pattern} (list: {list_path})")
+        if args.concat_on_stop:
+            # Segments are complete even if ffmpeg exited non-zero
+            rc = concat_segments(
+                ffmpeg_bin, output_path, bool(args.show_ffmpeg)
+            )
+            if rc == 0:
+                print(f"Saved to: {output_path}")
+        return rc
     if rc == 0:
         print(f"Saved to: {output_path}")
     return rc
 
 
-def cmd_list_windows(_: argparse.Namespace) -> int:
-    if sys.platform != "win32":
-        print(
-            "Window enumeration is only supported on Windows.",
-            file=sys.stderr,
-        )
-        return 1
-    wins = enumerate_windows()
+def cmd_list_windows(args: argparse.Namespace) -> int:
+    if sys.platform == "win32":
+        wins = enumerate_windows()
+    else:
+        if not shutil.which("xwininfo"):
+            try:
+                import Xlib  # noqa: F401
+            except ImportError:
+                print(
+                    "Window enumeration on Linux needs xwininfo "
+                    "(x11-utils) or python-xlib.",
+                    file=sys.stderr,
+                )
+                return 1
+        wins = enumerate_x11_windows(args.display)
     if not wins:
         print("No visible windows found.")
         return 0
@@ -339,7 +1221,9 @@ def cmd_list_audio_devices(args: argparse.Namespace) -> int:
             file=sys.stderr,
         )
         return 1
-    devices, raw = list_audio_devices(ffmpeg_bin)
+    devices, raw = cached_audio_devices(
+        ffmpeg_bin, args.audio_backend, refresh=bool(args.refresh)
+    )
     if devices:
         print("Audio devices:")
         for idx, name in enumerate(devices, 1):
@@ -353,18 +1237,19 @@ def cmd_list_audio_devices(args: argparse.Namespace) -> int:
 
 def cmd_check_ffmpeg(args: argparse.Namespace) -> int:
     ffmpeg_bin = args.ffmpeg or "ffmpeg"
-    if ffmpeg_available(ffmpeg_bin):
-        out = subprocess.run(
-            [ffmpeg_bin, "-version"],
-            capture_output=True,
-            text=True,
-        )
-        streams_text = out.stdout or out.stderr or ""
-        if streams_text:
-            first_line = streams_text.splitlines()[0]
-        else:
-            first_line = "ffmpeg found"
-        print(first_line)
+    caps = probe_capabilities(ffmpeg_bin, refresh=bool(args.refresh))
+    if caps is not None:
+        print(caps["version"])
+        backends = [
+            name for name in CAPTURE_BACKENDS if name in caps["input_devices"]
+        ]
+        profiles = [
+            name
+            for name, prof in ENCODER_PROFILES.items()
+            if prof.codec in caps["encoders"]
+        ]
+        print(f"Capture backends: {', '.join(backends) or 'none'}")
+        print(f"Encoder profiles: {', '.join(profiles) or 'none'}")
         return 0
     print(
         "ffmpeg not found. Download: "
@@ -377,7 +1262,8 @@ def cmd_check_ffmpeg(args: argparse.Namespace) -> int:
 def make_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description=(
-            "Record desktop/window/region to MP4 using ffmpeg (Windows)."
+            "Record desktop/window/region to MP4 using ffmpeg "
+            "(Windows gdigrab, Linux x11grab/kmsgrab)."
         ),
     )
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -389,6 +1275,18 @@ def make_parser() -> argparse.ArgumentParser:
         choices=["desktop", "window", "region"],
         default="desktop",
     )
+    p_rec.add_argument(
+        "--backend",
+        choices=sorted(CAPTURE_BACKENDS),
+        default=default_capture_backend(),
+        help="Screen capture input (default: gdigrab on Windows, "
+        "x11grab elsewhere)",
+    )
+    p_rec.add_argument(
+        "--display",
+        help="X display for x11grab (default: $DISPLAY, e.g. :99 for "
+        "Xvfb) or DRM device for kmsgrab (default: /dev/dri/card0)",
+    )
     p_rec.add_argument(
         "--window-title",
         help="Exact window title (for --mode window)",
@@ -421,7 +1319,25 @@ def make_parser() -> argparse.ArgumentParser:
     )
     p_rec.add_argument(
         "--audio-device",
-        help="DirectShow audio device name (use list-audio-devices)",
+        help="Audio device name (use list-audio-devices); for pulse/alsa "
+        "'default' is usually available",
+    )
+    p_rec.add_argument(
+        "--audio-backend",
+        choices=["dshow", "pulse", "alsa"],
+        default=default_audio_backend(),
+        help="Audio input (default: dshow on Windows, pulse elsewhere)",
+    )
+    p_rec.add_argument(
+        "--profile",
+        choices=["custom"] + sorted(ENCODER_PROFILES),
+        default="custom",
+        help="Encoder profile: "
+        + "; ".join(
+            f"{name}: {prof.description}"
+            for name, prof in ENCODER_PROFILES.items()
+        )
+        + ". 'custom' uses x264 with --crf/--preset",
     )
     p_rec.add_argument(
         "--crf",
@@ -460,11 +1376,33 @@ def make_parser() -> argparse.ArgumentParser:
         "--output",
         help="Output .mp4 path (default: recording_TIMESTAMP.mp4)",
     )
+    p_rec.add_argument(
+        "--segment-time",
+        type=float,
+        help="Write OUTPUT_NNNNN.mp4 segments of this many seconds "
+        "instead of one file",
+    )
+    p_rec.add_argument(
+        "--segment-keep",
+        type=int,
+        help="Keep only the newest N segments (rolling; with "
+        "--segment-time)",
+    )
+    p_rec.add_argument(
+        "--concat-on-stop",
+        action="store_true",
+        help="Join segments losslessly into --output when recording stops",
+    )
     p_rec.add_argument(
         "--show-ffmpeg",
         action="store_true",
         help="Show ffmpeg console output",
     )
+    p_rec.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show live fps, dropped frames, bitrate and encode speed",
+    )
     p_rec.add_argument(
         "--ffmpeg",
         help="Path to ffmpeg.exe (or use ffmpeg from PATH)",
@@ -474,14 +1412,28 @@ def make_parser() -> argparse.ArgumentParser:
     # list-windows
     p_w = sub.add_parser(
         "list-windows",
-        help="List visible window titles (Windows)",
+        help="List visible window titles (Windows or X11)",
+    )
+    p_w.add_argument(
+        "--display",
+        help="X display to query (default: $DISPLAY)",
     )
     p_w.set_defaults(func=cmd_list_windows)
 
     # list-audio-devices
     p_a = sub.add_parser(
         "list-audio-devices",
-        help="List DirectShow audio capture devices via ffmpeg",
+        help="List audio capture devices via ffmpeg",
+    )
+    p_a.add_argument(
+        "--audio-backend",
+        choices=["dshow", "pulse", "alsa"],
+        default=default_audio_backend(),
+    )
+    p_a.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-probe devices instead of using the cached list",
     )
     p_a.add_argument(
         "--ffmpeg",
@@ -498,6 +1450,11 @@ def make_parser() -> argparse.ArgumentParser:
         "--ffmpeg",
         help="Path to ffmpeg.exe (optional; defaults to ffmpeg in PATH)",
     )
+    p_c.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-probe ffmpeg instead of using the cached capabilities",
+    )
     p_c.set_defaults(func=cmd_check_ffmpeg)
 
     return parser
@@ -1,20 +1,126 @@
+import csv
+import hashlib
+import json
+import os
 import sys
+import time
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, List, Tuple, Optional
 
 import numpy as np
 import pandas as pd
 from xml.etree import ElementTree as ET
-from pyproj import Transformer
 
-try:
+if TYPE_CHECKING:
     import pyvista as pv
-except Exception as exc:
-    raise SystemExit(
-        "PyVista is required to run this simulation.\n"
-        "Install dependencies with:\n"
-        "  pip install -r requirements.txt"
-    ) from exc
+
+
+def _pyvista():
+    """
+    Import PyVista/VTK on first use. Keeping them out of module import lets
+    batch_render and other callers load this module without paying for VTK
+    in processes that never render.
+    """
+    try:
+        import pyvista
+    except Exception as exc:
+        raise SystemExit(
+            "PyVista is required to run this simulation.\n"
+            "Install dependencies with:\n"
+            "  pip install -r requirements.txt"
+        ) from exc
+    return pyvista
+
+
+MESH_CACHE_VERSION = 1
+
+
+def default_mesh_cache_dir() -> Path:
+    return Path(__file__).resolve().parent / ".cache" / "mesh"
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def mesh_cache_path(
+    cache_dir: Path,
+    stl_path: Path,
+    model_scale: float,
+) -> Path:
+    """
+    Cache file for an STL model at a given scale. The key is the STL content
+    hash, so renaming or touching the file does not invalidate the cache but
+    editing it does.
+    """
+    key = (
+        f"{file_sha256(stl_path)}_s{float(model_scale)!r}"
+        f"_v{MESH_CACHE_VERSION}"
+    )
+    return cache_dir / f"{key}.npz"
+
+
+def _mesh_from_arrays(
+    points: np.ndarray,
+    faces: np.ndarray,
+    normals: np.ndarray,
+) -> "pv.PolyData":
+    mesh = _pyvista().PolyData(points, faces)
+    # Active point normals make add_mesh(smooth_shading=True) skip its own
+    # compute_normals pass.
+    mesh.point_data.active_normals = normals
+    return mesh
+
+
+def load_mesh(
+    stl_path: Path,
+    model_scale: float = 1.0,
+    cache_dir: Optional[Path] = None,
+) -> "pv.PolyData":
+    """
+    Load the aircraft STL scaled and with point normals ready for smooth
+    shading.
+
+    When cache_dir is given, the preprocessed mesh is stored there as an
+    uncompressed .npz of points/faces/normals keyed by STL hash and scale,
+    and later launches load it directly instead of parsing the STL.
+    """
+    cache_file: Optional[Path] = None
+    if cache_dir is not None:
+        cache_file = mesh_cache_path(cache_dir, stl_path, model_scale)
+        if cache_file.exists():
+            try:
+                with np.load(cache_file) as data:
+                    return _mesh_from_arrays(
+                        data["points"], data["faces"], data["normals"]
+                    )
+            except Exception:
+                # Corrupt or truncated cache entry: rebuild it below
+                pass
+
+    mesh = _pyvista().read(str(stl_path))
+    if model_scale != 1.0:
+        mesh.scale(model_scale, inplace=True)
+    mesh = mesh.compute_normals(cell_normals=False, point_normals=True)
+
+    if cache_file is not None:
+        points = np.asarray(mesh.points, dtype=np.float32)
+        faces = np.asarray(mesh.faces, dtype=np.int64)
+        normals = np.asarray(mesh.point_data["Normals"], dtype=np.float32)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "wb") as f:
+                np.savez(f, points=points, faces=faces, normals=normals)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            # A read-only checkout still renders, just without the cache
+            pass
+    return mesh
 
 
 def parse_csv(csv_path: Path) -> pd.DataFrame:
@@ -140,6 +246,8 @@ def project_lonlat_to_local_xy(
         f"+proj=aeqd +lat_0={origin_lat} +lon_0={origin_lon} "
         f"+x_0=0 +y_0=0 +ellps=WGS84 +units=m +no_defs"
     )
+    from pyproj import Transformer
+
     transformer = Transformer.from_crs("epsg:4326", proj_out, always_xy=True)
     xs, ys = transformer.transform(lonlat[:, 0], lonlat[:, 1])
     return np.column_stack([xs, ys])
@@ -238,14 +346,262 @@ def compute_orientation(
     return yaw, pitch, roll
 
 
-def build_path_polydata(points_xyz: np.ndarray) -> pv.PolyData:
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Centered moving average along axis 0, computed with cumulative sums.
+    Edges are padded with the first/last sample so the output keeps the
+    input length and endpoints are not pulled toward zero.
+    """
+    values = np.asarray(values, dtype=float)
+    window = int(window)
+    if window <= 1 or values.shape[0] < 2:
+        return values.copy()
+    half = window // 2
+    window = 2 * half + 1
+    pad = [(half, half)] + [(0, 0)] * (values.ndim - 1)
+    padded = np.pad(values, pad, mode="edge")
+    csum = np.cumsum(padded, axis=0)
+    csum = np.concatenate([np.zeros_like(csum[:1]), csum], axis=0)
+    return (csum[window:] - csum[:-window]) / window
+
+
+def compute_follow_camera(
+    positions: np.ndarray,
+    yaw_deg: np.ndarray,
+    mode: str = "chase",
+    distance: float = 120.0,
+    height: float = 60.0,
+    smoothing_window: int = 15,
+    orbit_frames: int = 600,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute camera positions and focal points (each N x 3) for all frames.
+
+    - chase: behind the aircraft along its smoothed heading
+    - orbit: circling the smoothed aircraft position, one turn per
+      orbit_frames frames
+
+    Heading is smoothed as a unit vector so that yaw wrap-around at +/-180
+    degrees does not swing the camera.
+    """
+    focal = moving_average(positions, smoothing_window)
+
+    if mode == "chase":
+        yaw_rad = np.radians(np.asarray(yaw_deg, dtype=float))
+        # yaw is atan2(dx, dy): x east, y north
+        heading = np.column_stack([np.sin(yaw_rad), np.cos(yaw_rad)])
+        heading = moving_average(heading, smoothing_window)
+        norm = np.linalg.norm(heading, axis=1, keepdims=True)
+        heading = heading / np.maximum(norm, 1e-9)
+        offset_xy = -distance * heading
+    elif mode == "orbit":
+        angle = np.pi / 4.0 + 2.0 * np.pi * (
+            np.arange(positions.shape[0], dtype=float) / max(orbit_frames, 1)
+        )
+        offset_xy = distance * np.column_stack([np.cos(angle), np.sin(angle)])
+    else:
+        raise ValueError(f"Unknown camera mode: {mode}")
+
+    cam = np.column_stack([
+        focal[:, 0] + offset_xy[:, 0],
+        focal[:, 1] + offset_xy[:, 1],
+        focal[:, 2] + height,
+    ])
+    return cam, focal
+
+
+def build_path_polydata(points_xyz: np.ndarray) -> "pv.PolyData":
     num_points = points_xyz.shape[0]
     lines = np.hstack([num_points, np.arange(num_points)]).astype(np.int64)
-    poly = pv.PolyData(points_xyz)
+    poly = _pyvista().PolyData(points_xyz)
     poly.lines = lines
     return poly
 
 
+class TrailBuffer:
+    """
+    Flown-trajectory polyline that grows without reallocating.
+
+    Points live in a preallocated NumPy buffer. The PolyData's points and
+    its single polyline cell are zero-copy VTK views of the first length
+    rows and ids, so growing the trail re-points two arrays. The per-frame
+    cost does not depend on the trail length, and points not yet flown
+    are neither drawn nor counted in the bounds.
+    """
+
+    def __init__(self, capacity: int):
+        from vtkmodules.util.numpy_support import numpy_to_vtkIdTypeArray
+        from vtkmodules.vtkCommonCore import vtkPoints
+        from vtkmodules.vtkCommonDataModel import vtkCellArray
+
+        self.capacity = max(int(capacity), 2)
+        self.points = np.zeros((self.capacity, 3), dtype=float)
+        self.length = 0
+
+        self._offsets = np.zeros(2, dtype=np.int64)
+        self._connectivity = np.arange(self.capacity, dtype=np.int64)
+        self._vtk_offsets = numpy_to_vtkIdTypeArray(self._offsets, deep=False)
+        self._vtk_points = vtkPoints()
+        self._cells = vtkCellArray()
+        self.poly = _pyvista().PolyData()
+        self.poly.SetPoints(self._vtk_points)
+        self.poly.SetLines(self._cells)
+        self.set_length(0)
+
+    def fill(self, points_xyz: np.ndarray) -> None:
+        """Load a known trajectory up front; reveal it with set_length."""
+        n = min(points_xyz.shape[0], self.capacity)
+        self.points[:n] = points_xyz[:n]
+        if n:
+            self.points[n:] = points_xyz[n - 1]
+        self.set_length(0)
+
+    def set_length(self, n: int) -> None:
+        from vtkmodules.util.numpy_support import (
+            numpy_to_vtk,
+            numpy_to_vtkIdTypeArray,
+        )
+
+        self.length = min(max(int(n), 0), self.capacity)
+        self._offsets[1] = self.length
+        self._vtk_offsets.Modified()
+        # Views onto the buffers (no copy). An empty trail still exposes
+        # its first point so the mesh is never point-less.
+        self._vtk_points.SetData(
+            numpy_to_vtk(self.points[: max(self.length, 1)], deep=False)
+        )
+        self._cells.SetData(
+            self._vtk_offsets,
+            numpy_to_vtkIdTypeArray(
+                self._connectivity[: self.length], deep=False
+            ),
+        )
+        self.poly.Modified()
+
+    def append(self, point_xyz) -> None:
+        """
+        Add one point for incrementally arriving positions. When the buffer
+        is full the oldest half is dropped, keeping appends amortized O(1).
+        """
+        if self.length >= self.capacity:
+            keep = self.capacity // 2
+            self.points[:keep] = self.points[self.capacity - keep:]
+            self.length = keep
+        self.points[self.length] = point_xyz
+        self.set_length(self.length + 1)
+
+
+class FrameProfiler:
+    """
+    Opt-in per-stage timing of the render loop.
+
+    Stage durations are recorded with perf_counter_ns into a preallocated
+    (capacity x stages) int64 ring buffer, so profiling allocates nothing per
+    frame; once full, the oldest frames are overwritten.
+    """
+
+    STAGES = (
+        "orientation",
+        "set_orientation",
+        "trail_camera",
+        "hud",
+        "render",
+        "write_frame",
+    )
+
+    def __init__(self, capacity: int = 65536):
+        self.capacity = max(int(capacity), 1)
+        self._index = {name: k for k, name in enumerate(self.STAGES)}
+        # Last column holds the whole-frame time
+        self._samples = np.zeros(
+            (self.capacity, len(self.STAGES) + 1), dtype=np.int64
+        )
+        self.frames = 0
+        self._row = self._samples[0]
+        self._frame_start = 0
+        self._last = 0
+
+    def begin_frame(self) -> None:
+        self._row = self._samples[self.frames % self.capacity]
+        self._row[:] = 0
+        self._frame_start = self._last = time.perf_counter_ns()
+
+    def mark(self, stage: str) -> None:
+        """Charge the time since the previous mark to stage."""
+        now = time.perf_counter_ns()
+        self._row[self._index[stage]] += now - self._last
+        self._last = now
+
+    def end_frame(self) -> None:
+        self._row[-1] = time.perf_counter_ns() - self._frame_start
+        self.frames += 1
+
+    def samples_ns(self) -> np.ndarray:
+        """Recorded rows in frame order (oldest first)."""
+        n = min(self.frames, self.capacity)
+        if self.frames <= self.capacity:
+            return self._samples[:n].copy()
+        start = self.frames % self.capacity
+        return np.roll(self._samples, -start, axis=0)
+
+    def summary(self) -> dict:
+        """p50/p95/p99 and mean in milliseconds for each stage and frame."""
+        data = self.samples_ns()
+        out = {"frames": int(self.frames), "recorded": int(data.shape[0])}
+        if data.shape[0] == 0:
+            return out
+        q = np.percentile(data, [50, 95, 99], axis=0) / 1e6
+        mean = data.mean(axis=0) / 1e6
+        for k, name in enumerate(self.STAGES + ("frame",)):
+            out[name] = {
+                "p50_ms": float(q[0, k]),
+                "p95_ms": float(q[1, k]),
+                "p99_ms": float(q[2, k]),
+                "mean_ms": float(mean[k]),
+            }
+        return out
+
+    def format_summary(self) -> str:
+        summ = self.summary()
+        lines = [
+            f"Profiled {summ['recorded']} of {summ['frames']} frames (ms):",
+            f"{'stage':<16}{'p50':>9}{'p95':>9}{'p99':>9}{'mean':>9}",
+        ]
+        for name in self.STAGES + ("frame",):
+            if name not in summ:
+                continue
+            st = summ[name]
+            lines.append(
+                f"{name:<16}{st['p50_ms']:9.3f}{st['p95_ms']:9.3f}"
+                f"{st['p99_ms']:9.3f}{st['mean_ms']:9.3f}"
+            )
+        return "\n".join(lines)
+
+    def write_trace(self, path: Path) -> None:
+        """
+        Write per-frame stage timings (ns) to .csv, or to JSON together with
+        the summary for any other suffix.
+        """
+        data = self.samples_ns()
+        first = self.frames - data.shape[0]
+        columns = list(self.STAGES) + ["frame"]
+        if path.suffix.lower() == ".csv":
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame_index"] + [c + "_ns" for c in columns])
+                for k, row in enumerate(data.tolist()):
+                    writer.writerow([first + k] + row)
+            return
+        trace = {
+            "stages": columns,
+            "first_frame_index": int(first),
+            "summary": self.summary(),
+            "samples_ns": data.tolist(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+
+
 def run_simulation(
     csv_path: Path,
     kml_path: Path,
@@ -257,7 +613,25 @@ def run_simulation(
     time_scale: float = 1.0,
     offscreen: bool = False,
     movie_path: Optional[Path] = None,
-):
+    mesh_cache_dir: Optional[Path] = None,
+    mesh: Optional["pv.PolyData"] = None,
+    camera_mode: str = "fixed",
+    camera_distance: float = 120.0,
+    camera_height: float = 60.0,
+    show_trail: bool = True,
+    profiler: Optional[FrameProfiler] = None,
+) -> int:
+    """
+    Replay one flight. Returns the number of frames rendered.
+
+    A preloaded mesh (already scaled, e.g. from load_mesh) may be passed to
+    reuse it across runs; model_scale and mesh_cache_dir are then ignored.
+
+    camera_mode is "fixed" (camera set once at the start), "chase" or
+    "orbit"; the follow modes precompute one camera pose per frame.
+    show_trail draws the flown trajectory at true altitude as it grows.
+    A FrameProfiler, when given, receives per-stage timings for each frame.
+    """
     df = parse_csv(csv_path)
 
     coords = parse_kml_coordinates(kml_path)
@@ -275,13 +649,13 @@ def run_simulation(
     positions = np.column_stack([xy_samples[:, 0], xy_samples[:, 1], z_series])
     yaw, pitch, roll = compute_orientation(positions, ground_speed_ms)
 
-    try:
-        mesh = pv.read(str(stl_path))
-    except Exception as exc:
-        raise SystemExit(f"Failed to read STL model at {stl_path}: {exc}")
-
-    if model_scale != 1.0:
-        mesh = mesh.scale(model_scale, inplace=False)
+    if mesh is None:
+        try:
+            mesh = load_mesh(stl_path, model_scale, cache_dir=mesh_cache_dir)
+        except Exception as exc:
+            raise SystemExit(
+                f"Failed to read STL model at {stl_path}: {exc}"
+            )
 
     mesh_center = np.asarray(mesh.center, dtype=float)
 
@@ -289,6 +663,7 @@ def run_simulation(
         np.column_stack([xy, np.zeros_like(xy[:, 0])])
     )
 
+    pv = _pyvista()
     plotter = pv.Plotter(off_screen=offscreen)
     plotter.add_axes()
     plotter.set_background("black")
@@ -299,6 +674,18 @@ def run_simulation(
         name="path",
     )
 
+    trail: Optional[TrailBuffer] = None
+    if show_trail:
+        trail = TrailBuffer(positions.shape[0])
+        trail.fill(positions)
+        trail.set_length(1)
+        plotter.add_mesh(
+            trail.poly,
+            color="orange",
+            line_width=2,
+            name="trail",
+        )
+
     actor = plotter.add_mesh(
         mesh,
         color="gray",
@@ -312,9 +699,25 @@ def run_simulation(
         float(mesh_center[2]),
     )
 
-    cam_pos = (positions[0, 0] + 120.0, positions[0, 1] + 120.0, 80.0)
-    plotter.camera.position = cam_pos
-    plotter.camera.focal_point = positions[0].tolist()
+    cam_positions: Optional[List[List[float]]] = None
+    cam_focals: Optional[List[List[float]]] = None
+    if camera_mode == "fixed":
+        cam_pos = (positions[0, 0] + 120.0, positions[0, 1] + 120.0, 80.0)
+        plotter.camera.position = cam_pos
+        plotter.camera.focal_point = positions[0].tolist()
+    else:
+        cam_arr, focal_arr = compute_follow_camera(
+            positions,
+            yaw,
+            mode=camera_mode,
+            distance=camera_distance,
+            height=camera_height,
+        )
+        # Plain lists so the per-frame update is only an assignment
+        cam_positions = cam_arr.tolist()
+        cam_focals = focal_arr.tolist()
+        plotter.camera.position = cam_positions[0]
+        plotter.camera.focal_point = cam_focals[0]
     plotter.camera.up = (0.0, 0.0, 1.0)
 
     def hud_text(i: int) -> str:
@@ -343,15 +746,29 @@ def run_simulation(
     )
 
     num_frames = len(times)
+    camera = plotter.camera
+
+    def no_mark(_stage: str) -> None:
+        return
+
+    mark = profiler.mark if profiler is not None else no_mark
 
     def update_frame(i: int):
         x, y, z = positions[i]
+        r = float(roll[i] + roll_offset_deg)
+        p = float(pitch[i] + pitch_offset_deg)
+        w = float(yaw[i] + yaw_offset_deg)
+        mark("orientation")
         actor.SetPosition(float(x), float(y), float(z))
-        actor.SetOrientation(
-            float(roll[i] + roll_offset_deg),
-            float(pitch[i] + pitch_offset_deg),
-            float(yaw[i] + yaw_offset_deg),
-        )
+        actor.SetOrientation(r, p, w)
+        mark("set_orientation")
+        if trail is not None:
+            trail.set_length(i + 1)
+        if cam_positions is not None:
+            camera.SetPosition(cam_positions[i])
+            camera.SetFocalPoint(cam_focals[i])
+            plotter.renderer.ResetCameraClippingRange()
+        mark("trail_camera")
         plotter.remove_actor("hud")
         plotter.add_text(
             hud_text(i),
@@ -359,6 +776,7 @@ def run_simulation(
             font_size=10,
             name="hud",
         )
+        mark("hud")
         return
 
     def frame_generator():
@@ -381,16 +799,259 @@ def run_simulation(
     # Render loop compatible with older PyVista versions (no Plotter.animate)
     plotter.show(auto_close=False)
     for i in frame_generator():
+        if profiler is not None:
+            profiler.begin_frame()
         update_frame(i)
         plotter.render()
+        mark("render")
         if movie_path is not None:
             plotter.write_frame()
+        mark("write_frame")
+        if profiler is not None:
+            profiler.end_frame()
 
     if movie_path is not None or offscreen:
         plotter.close()
     else:
         # Keep window open for interaction after animating
         plotter.show()
+    return num_frames
+
+
+class LivePose:
+    """
+    Incremental pose along the planned KML path from streamed telemetry
+    rows: distance flown is integrated from ground speed, height comes
+    from the radar altimeter, and attitude from the path heading,
+    vertical speed and turn rate.
+    """
+
+    def __init__(self, path_xy: np.ndarray, max_gap_s: float = 5.0):
+        self.path_xy = path_xy
+        self.s_path = compute_arclength(path_xy)
+        self.max_gap_s = max_gap_s
+        self.s = 0.0
+        self.t: Optional[float] = None
+        self.yaw = 0.0
+        self.position = np.array([path_xy[0, 0], path_xy[0, 1], 0.0])
+        self.pitch = 0.0
+        self.roll = 0.0
+        self.ground_speed_knots = 0.0
+        self.vertical_speed_fpm = 0.0
+
+    def _heading(self, s: float) -> float:
+        ds = 5.0
+        ends = np.array([max(s - ds, 0.0), min(s + ds, self.s_path[-1])])
+        xy = interpolate_polyline(self.path_xy, self.s_path, ends)
+        dx, dy = xy[1] - xy[0]
+        return float(np.degrees(np.arctan2(dx, dy)))
+
+    def update(
+        self,
+        t_seconds: float,
+        ground_speed_knots: float,
+        radar_alt_ft: float,
+        vertical_speed_fpm: float,
+    ) -> None:
+        gs_kt = 0.0 if np.isnan(ground_speed_knots) else ground_speed_knots
+        vs_fpm = 0.0 if np.isnan(vertical_speed_fpm) else vertical_speed_fpm
+        dt = 0.0 if self.t is None else t_seconds - self.t
+        # A restarted feed jumps back in time: start over along the path
+        if dt < 0.0:
+            self.s = 0.0
+            dt = 0.0
+        dt = min(dt, self.max_gap_s)
+        self.t = t_seconds
+        gs_ms = gs_kt * 0.514444
+        self.s = min(self.s + gs_ms * dt, float(self.s_path[-1]))
+
+        xy = interpolate_polyline(
+            self.path_xy, self.s_path, np.array([self.s])
+        )[0]
+        alt_m = 0.0 if np.isnan(radar_alt_ft) else radar_alt_ft * 0.3048
+        self.position = np.array([xy[0], xy[1], max(alt_m, 0.0)])
+
+        yaw = self._heading(self.s)
+        turn = (yaw - self.yaw + 180.0) % 360.0 - 180.0
+        yaw_rate = np.radians(turn) / dt if dt > 0.0 else 0.0
+        self.yaw = yaw
+        climb = np.arctan2(vs_fpm * 0.00508, max(gs_ms, 1.0))
+        self.pitch = float(np.degrees(climb))
+        self.roll = float(np.degrees(np.arctan2(gs_ms * yaw_rate, 9.80665)))
+        self.ground_speed_knots = gs_kt
+        self.vertical_speed_fpm = vs_fpm
+
+
+def run_live(
+    source_url: str,
+    kml_path: Path,
+    stl_path: Path,
+    yaw_offset_deg: float = 0.0,
+    pitch_offset_deg: float = 0.0,
+    roll_offset_deg: float = 0.0,
+    model_scale: float = 1.0,
+    offscreen: bool = False,
+    movie_path: Optional[Path] = None,
+    mesh_cache_dir: Optional[Path] = None,
+    camera_mode: str = "fixed",
+    camera_distance: float = 120.0,
+    camera_height: float = 60.0,
+    show_trail: bool = True,
+    duration_s: Optional[float] = None,
+    fps: float = 30.0,
+) -> int:
+    """
+    Fly the model from a live telemetry source (see telemetry_stream.py)
+    instead of Data.csv. Each frame applies the rows that arrived since
+    the previous one. Runs until duration_s elapses or Ctrl-C; returns the
+    number of frames rendered.
+    """
+    from telemetry_stream import TelemetryStream
+
+    coords = parse_kml_coordinates(kml_path)
+    lonlat = np.array([[lon, lat] for lon, lat, _alt in coords], dtype=float)
+    xy = project_lonlat_to_local_xy(lonlat, lonlat[0, 0], lonlat[0, 1])
+    pose = LivePose(xy)
+
+    try:
+        mesh = load_mesh(stl_path, model_scale, cache_dir=mesh_cache_dir)
+    except Exception as exc:
+        raise SystemExit(f"Failed to read STL model at {stl_path}: {exc}")
+    mesh_center = np.asarray(mesh.center, dtype=float)
+
+    try:
+        stream = TelemetryStream(source_url)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"Cannot open live source {source_url}: {exc}")
+    ring = stream.ring
+    col = ring.index
+
+    pv = _pyvista()
+    plotter = pv.Plotter(off_screen=offscreen)
+    plotter.add_axes()
+    plotter.set_background("black")
+    plotter.add_mesh(
+        build_path_polydata(np.column_stack([xy, np.zeros_like(xy[:, 0])])),
+        color="deepskyblue",
+        line_width=3,
+        name="path",
+    )
+    trail: Optional[TrailBuffer] = None
+    if show_trail:
+        trail = TrailBuffer(4096)
+        trail.fill(pose.position[None, :])
+        plotter.add_mesh(
+            trail.poly,
+            color="orange",
+            line_width=2,
+            name="trail",
+        )
+    actor = plotter.add_mesh(
+        mesh,
+        color="gray",
+        smooth_shading=True,
+        name="uh60",
+    )
+    actor.SetOrigin(
+        float(mesh_center[0]),
+        float(mesh_center[1]),
+        float(mesh_center[2]),
+    )
+    camera = plotter.camera
+    camera.position = (xy[0, 0] + 120.0, xy[0, 1] + 120.0, 80.0)
+    camera.focal_point = pose.position.tolist()
+    camera.up = (0.0, 0.0, 1.0)
+    plotter.add_text(
+        "Black Hawk MOJO69 – live telemetry\n"
+        f"Source: {source_url}",
+        position="lower_left",
+        font_size=10,
+        name="help",
+    )
+    if movie_path is not None:
+        plotter.open_movie(str(movie_path))
+
+    def hud_text() -> str:
+        t = int(pose.t or 0)
+        return (
+            f"{t // 3600:02d}:{t // 60 % 60:02d}:{t % 60:02d} LIVE\n"
+            f"GS: {pose.ground_speed_knots:6.1f} kt\n"
+            f"RA: {pose.position[2] * 3.28084:6.1f} ft\n"
+            f"VS: {pose.vertical_speed_fpm:6.0f} fpm\n"
+            f"Yaw/Pitch/Roll: {pose.yaw:.1f}/"
+            f"{pose.pitch:.1f}/{pose.roll:.1f} deg"
+        )
+
+    plotter.add_text(
+        hud_text(), position="upper_left", font_size=10, name="hud"
+    )
+    plotter.show(auto_close=False, interactive_update=not offscreen)
+
+    frames = 0
+    seq = 0
+    orbit_angle = np.pi / 4.0
+    start = time.monotonic()
+    try:
+        while duration_s is None or time.monotonic() - start < duration_s:
+            frame_start = time.monotonic()
+            if stream.error:
+                raise SystemExit(f"Live source stopped: {stream.error}")
+            seq, rows = ring.since(seq)
+            for row in rows:
+                pose.update(
+                    row[col["t_seconds"]],
+                    row[col["ground_speed"]],
+                    row[col["altitude_radar"]],
+                    row[col["vertical_speed"]],
+                )
+                if trail is not None:
+                    trail.append(pose.position)
+
+            x, y, z = pose.position
+            actor.SetPosition(float(x), float(y), float(z))
+            actor.SetOrientation(
+                pose.roll + roll_offset_deg,
+                pose.pitch + pitch_offset_deg,
+                pose.yaw + yaw_offset_deg,
+            )
+            if camera_mode != "fixed":
+                if camera_mode == "chase":
+                    yaw_rad = np.radians(pose.yaw)
+                    offset = -camera_distance * np.array(
+                        [np.sin(yaw_rad), np.cos(yaw_rad)]
+                    )
+                else:
+                    orbit_angle += 2.0 * np.pi / 600.0
+                    offset = camera_distance * np.array(
+                        [np.cos(orbit_angle), np.sin(orbit_angle)]
+                    )
+                camera.SetPosition(
+                    x + offset[0], y + offset[1], z + camera_height
+                )
+                camera.SetFocalPoint(x, y, z)
+                plotter.renderer.ResetCameraClippingRange()
+            if len(rows):
+                plotter.remove_actor("hud")
+                plotter.add_text(
+                    hud_text(), position="upper_left", font_size=10,
+                    name="hud",
+                )
+            if offscreen:
+                plotter.render()
+            else:
+                plotter.update()
+            if movie_path is not None:
+                plotter.write_frame()
+            frames += 1
+            delay = 1.0 / fps - (time.monotonic() - frame_start)
+            if delay > 0:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stream.close()
+        plotter.close()
+    return frames
 
 
 def main():
@@ -399,13 +1060,6 @@ def main():
     kml_path = workspace / "MOJO69 Flight Path.kml"
     stl_path = workspace / "UH-60_Blackhawk.stl"
 
-    if not csv_path.exists():
-        raise SystemExit(f"Missing CSV at {csv_path}")
-    if not kml_path.exists():
-        raise SystemExit(f"Missing KML at {kml_path}")
-    if not stl_path.exists():
-        raise SystemExit(f"Missing STL at {stl_path}")
-
     yaw_offset = 0.0
     pitch_offset = 0.0
     roll_offset = 0.0
@@ -414,6 +1068,17 @@ def main():
     offscreen_flag = False
 
     out_movie: Optional[Path] = None
+    camera_mode = "fixed"
+    camera_distance = 120.0
+    camera_height = 60.0
+    show_trail = True
+    profiler: Optional[FrameProfiler] = None
+    profile_path: Optional[Path] = None
+    mesh_cache_dir: Optional[Path] = default_mesh_cache_dir()
+    live_url: Optional[str] = None
+    duration_s: Optional[float] = None
+    flight_key: Optional[str] = None
+    kml_override: Optional[Path] = None
 
     if len(sys.argv) > 1:
         for arg in sys.argv[1:]:
@@ -432,6 +1097,92 @@ def main():
                 offscreen_flag = offscreen_str in {"1", "true", "yes", "on"}
             elif arg.startswith("--movie="):
                 out_movie = Path(arg.split("=", 1)[1]).expanduser().resolve()
+            elif arg.startswith("--camera="):
+                camera_mode = arg.split("=", 1)[1].strip().lower()
+            elif arg.startswith("--camera-distance="):
+                camera_distance = float(arg.split("=", 1)[1])
+            elif arg.startswith("--camera-height="):
+                camera_height = float(arg.split("=", 1)[1])
+            elif arg.startswith("--trail="):
+                trail_str = arg.split("=", 1)[1].strip().lower()
+                show_trail = trail_str in {"1", "true", "yes", "on"}
+            elif arg == "--profile" or arg.startswith("--profile="):
+                profiler = FrameProfiler()
+                if "=" in arg:
+                    profile_path = (
+                        Path(arg.split("=", 1)[1]).expanduser().resolve()
+                    )
+            elif arg.startswith("--mesh-cache="):
+                cache_str = arg.split("=", 1)[1].strip()
+                if cache_str.lower() in {"0", "false", "no", "off"}:
+                    mesh_cache_dir = None
+                else:
+                    mesh_cache_dir = Path(cache_str).expanduser().resolve()
+            elif arg.startswith("--live="):
+                live_url = arg.split("=", 1)[1].strip()
+            elif arg.startswith("--duration="):
+                duration_s = float(arg.split("=", 1)[1])
+            elif arg.startswith("--flight="):
+                flight_key = arg.split("=", 1)[1].strip()
+            elif arg.startswith("--kml="):
+                kml_override = (
+                    Path(arg.split("=", 1)[1]).expanduser().resolve()
+                )
+
+    if flight_key:
+        from flight_catalog import FlightCatalog
+
+        catalog = FlightCatalog()
+        catalog.scan([os.environ.get("AVIAT_FLIGHTS_DIR", str(workspace))])
+        record = catalog.find(flight_key)
+        catalog.close()
+        if record is None:
+            raise SystemExit(
+                f"Unknown --flight={flight_key} "
+                "(see: python flight_catalog.py)"
+            )
+        csv_path = Path(record.csv_path)
+        if record.kml_path:
+            kml_path = Path(record.kml_path)
+        elif kml_override is None:
+            raise SystemExit(
+                f"Flight {record.name} has no paired KML; pass --kml=PATH"
+            )
+    if kml_override is not None:
+        kml_path = kml_override
+
+    if not csv_path.exists():
+        raise SystemExit(f"Missing CSV at {csv_path}")
+    if not kml_path.exists():
+        raise SystemExit(f"Missing KML at {kml_path}")
+    if not stl_path.exists():
+        raise SystemExit(f"Missing STL at {stl_path}")
+
+    if camera_mode not in {"fixed", "chase", "orbit"}:
+        raise SystemExit(
+            f"Unknown --camera={camera_mode} (use fixed, chase or orbit)"
+        )
+
+    if live_url:
+        frames = run_live(
+            live_url,
+            kml_path=kml_path,
+            stl_path=stl_path,
+            yaw_offset_deg=yaw_offset,
+            pitch_offset_deg=pitch_offset,
+            roll_offset_deg=roll_offset,
+            model_scale=model_scale,
+            offscreen=offscreen_flag,
+            movie_path=out_movie,
+            mesh_cache_dir=mesh_cache_dir,
+            camera_mode=camera_mode,
+            camera_distance=camera_distance,
+            camera_height=camera_height,
+            show_trail=show_trail,
+            duration_s=duration_s,
+        )
+        print(f"Rendered {frames} live frames from {live_url}")
+        return
 
     run_simulation(
         csv_path=csv_path,
@@ -444,8 +1195,20 @@ def main():
         time_scale=time_scale,
         offscreen=offscreen_flag,
         movie_path=out_movie,
+        mesh_cache_dir=mesh_cache_dir,
+        camera_mode=camera_mode,
+        camera_distance=camera_distance,
+        camera_height=camera_height,
+        show_trail=show_trail,
+        profiler=profiler,
     )
 
+    if profiler is not None:
+        print(profiler.format_summary())
+        if profile_path is not None:
+            profiler.write_trace(profile_path)
+            print(f"Profile trace written to {profile_path}")
+
 
 if __name__ == "__main__":
     main()
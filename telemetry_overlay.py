@@ -0,0 +1,480 @@
+import argparse
+import math
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import screen_recorder as sr
+
+
+# Telemetry channels burned into the strip:
+# (label, CSV column, unit, value format)
+CHANNELS: List[Tuple[str, str, str, str]] = [
+    ("GS", "Ground Speed", "KT", "{:5.0f}"),
+    ("RA", "Altitude Radar", "FT", "{:5.0f}"),
+    ("VSI", "Vertical Speed", "FPM", "{:5.0f}"),
+    ("TQ1", "Eng 1 Torque", "%", "{:5.1f}"),
+    ("TQ2", "Eng 2 Torque", "%", "{:5.1f}"),
+]
+
+CHANNEL_COLORS = np.array(
+    [
+        [88, 166, 255],
+        [63, 185, 80],
+        [255, 107, 107],
+        [210, 168, 255],
+        [255, 166, 87],
+    ],
+    dtype=np.uint8,
+)
+
+# 5x7 bitmap font for the characters the strip needs
+_FONT_ROWS: Dict[str, str] = {
+    "0": "01110 10001 10011 10101 11001 10001 01110",
+    "1": "00100 01100 00100 00100 00100 00100 01110",
+    "2": "01110 10001 00001 00010 00100 01000 11111",
+    "3": "11110 00001 00001 01110 00001 00001 11110",
+    "4": "00010 00110 01010 10010 11111 00010 00010",
+    "5": "11111 10000 11110 00001 00001 10001 01110",
+    "6": "00110 01000 10000 11110 10001 10001 01110",
+    "7": "11111 00001 00010 00100 01000 01000 01000",
+    "8": "01110 10001 10001 01110 10001 10001 01110",
+    "9": "01110 10001 10001 01111 00001 00010 01100",
+    "-": "00000 00000 00000 11111 00000 00000 00000",
+    "+": "00000 00100 00100 11111 00100 00100 00000",
+    ".": "00000 00000 00000 00000 00000 01100 01100",
+    ":": "00000 01100 01100 00000 01100 01100 00000",
+    "%": "11001 11010 00010 00100 01000 01011 10011",
+    " ": "00000 00000 00000 00000 00000 00000 00000",
+    "A": "01110 10001 10001 11111 10001 10001 10001",
+    "F": "11111 10000 10000 11110 10000 10000 10000",
+    "G": "01110 10001 10000 10111 10001 10001 01111",
+    "I": "01110 00100 00100 00100 00100 00100 01110",
+    "K": "10001 10010 10100 11000 10100 10010 10001",
+    "M": "10001 11011 10101 10101 10001 10001 10001",
+    "P": "11110 10001 10001 11110 10000 10000 10000",
+    "Q": "01110 10001 10001 10001 10101 10010 01101",
+    "R": "11110 10001 10001 11110 10100 10010 10001",
+    "S": "01111 10000 10000 01110 00001 00001 11110",
+    "T": "11111 00100 00100 00100 00100 00100 00100",
+    "V": "10001 10001 10001 10001 10001 01010 00100",
+}
+FONT: Dict[str, np.ndarray] = {
+    ch: np.array(
+        [[c == "1" for c in row] for row in rows.split()], dtype=bool
+    )
+    for ch, rows in _FONT_ROWS.items()
+}
+
+
+def text_mask(text: str, scale: int = 1) -> np.ndarray:
+    """Boolean bitmap of text in the built-in 5x7 font (1 px spacing)."""
+    blank = FONT[" "]
+    gap = np.zeros((7, 1), dtype=bool)
+    glyphs: List[np.ndarray] = []
+    for ch in text.upper():
+        glyphs += [FONT.get(ch, blank), gap]
+    mask = np.hstack(glyphs) if glyphs else np.zeros((7, 0), dtype=bool)
+    if scale > 1:
+        mask = mask.repeat(scale, axis=0).repeat(scale, axis=1)
+    return mask
+
+
+def load_telemetry(csv_path: str) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Return (t_rel_seconds, values[n, channel], start_seconds_of_day) from a
+    flight CSV, sorted by time. Missing channels are all-NaN.
+    """
+    df = pd.read_csv(csv_path)
+    for col in ("Local Hour", "Local Minute", "Local Second"):
+        if col not in df.columns:
+            raise ValueError(f"CSV missing required column: {col}")
+    abs_t = (
+        pd.to_numeric(df["Local Hour"], errors="coerce") * 3600
+        + pd.to_numeric(df["Local Minute"], errors="coerce") * 60
+        + pd.to_numeric(df["Local Second"], errors="coerce")
+    ).to_numpy(dtype=float)
+    cols = []
+    for _label, column, _unit, _fmt in CHANNELS:
+        if column in df.columns:
+            cols.append(
+                pd.to_numeric(df[column], errors="coerce").to_numpy(float)
+            )
+        else:
+            cols.append(np.full(len(df), np.nan))
+    values = np.column_stack(cols)
+    ok = ~np.isnan(abs_t)
+    abs_t, values = abs_t[ok], values[ok]
+    order = np.argsort(abs_t, kind="stable")
+    abs_t, values = abs_t[order], values[order]
+    if abs_t.size == 0:
+        raise ValueError("CSV has no timestamped rows")
+    # Radar altitude is clamped at 0 like the dashboard does
+    values[:, 1] = np.where(values[:, 1] < 0, 0.0, values[:, 1])
+    return abs_t - abs_t[0], values, float(abs_t[0])
+
+
+def interp_channels(
+    t_query: np.ndarray,
+    t: np.ndarray,
+    values: np.ndarray,
+) -> np.ndarray:
+    """Linear interpolation of every channel at t_query, ignoring NaNs;
+    NaN outside the recorded time range.
+    """
+    out = np.full((t_query.shape[0], values.shape[1]), np.nan)
+    inside = (t_query >= t[0]) & (t_query <= t[-1])
+    for k in range(values.shape[1]):
+        ok = ~np.isnan(values[:, k])
+        if ok.sum() >= 1:
+            out[inside, k] = np.interp(t_query[inside], t[ok], values[ok, k])
+    return out
+
+
+@dataclass
+class VideoInfo:
+    width: int
+    height: int
+    fps: float
+    duration: float
+
+
+def probe_video(ffmpeg_bin: str, video_path: str) -> VideoInfo:
+    """Size, frame rate and duration parsed from ``ffmpeg -i`` output."""
+    proc = subprocess.run(
+        [ffmpeg_bin, "-hide_banner", "-i", video_path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    text = proc.stderr or ""
+    dur = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", text)
+    stream = re.search(r"Stream #.*?Video:.*?(\d{2,5})x(\d{2,5})", text)
+    fps = re.search(r"Video:.*?(\d+(?:\.\d+)?) (?:fps|tbr)", text)
+    if not (dur and stream and fps):
+        raise ValueError(f"Could not read video stream info: {video_path}")
+    h, m, s = dur.groups()
+    return VideoInfo(
+        width=int(stream.group(1)),
+        height=int(stream.group(2)),
+        fps=float(fps.group(1)),
+        duration=int(h) * 3600 + int(m) * 60 + float(s),
+    )
+
+
+class StripRenderer:
+    """
+    Renders the telemetry strip as RGBA frames.
+
+    The per-channel sparklines over the whole flight are rasterized once
+    with array operations; each frame is then a copy of that background plus
+    a cursor column and the numeric readouts.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        video_height: int,
+        t: np.ndarray,
+        values: np.ndarray,
+        start_of_day: float,
+    ):
+        self.scale = max(1, int(round(video_height / 360)))
+        self.row_h = 9 * self.scale + 4
+        self.width = width
+        self.height = self.row_h * len(CHANNELS) + 2
+        # Even height keeps yuv420p happy when overlaid at odd offsets
+        self.height += self.height % 2
+        self.t = t
+        self.values = values
+        self.start_of_day = start_of_day
+        char_w = 6 * self.scale
+        # "TQ2 " + value + " FPM" and the clock
+        self.label_w = char_w * 16
+        self.plot_x0 = self.label_w
+        self.plot_w = max(width - self.plot_x0 - 4, 2)
+        self.background = self._render_background()
+
+    def _render_background(self) -> np.ndarray:
+        bg = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        bg[..., 3] = 170
+        cols = np.arange(self.plot_w)
+        t_span = self.t[-1] - self.t[0]
+        t_cols = self.t[0] + cols / (self.plot_w - 1) * t_span
+        series = interp_channels(t_cols, self.t, self.values)
+        yy = np.arange(self.row_h - 2)[:, None]
+        for k in range(len(CHANNELS)):
+            v = series[:, k]
+            finite = ~np.isnan(v)
+            if not finite.any():
+                continue
+            vmin, vmax = np.nanmin(v), np.nanmax(v)
+            span = (vmax - vmin) or 1.0
+            y = (1.0 - (np.where(finite, v, vmin) - vmin) / span) * (
+                self.row_h - 3
+            )
+            y = np.rint(y).astype(int)
+            # Join consecutive columns with vertical runs so the line is
+            # continuous
+            y_prev = np.concatenate([y[:1], y[:-1]])
+            lo = np.minimum(y, y_prev)
+            hi = np.maximum(y, y_prev)
+            mask = (yy >= lo[None, :]) & (yy <= hi[None, :]) & finite[None, :]
+            top = 1 + k * self.row_h
+            region = bg[
+                top:top + self.row_h - 2,
+                self.plot_x0:self.plot_x0 + self.plot_w,
+            ]
+            region[mask, :3] = CHANNEL_COLORS[k]
+            region[mask, 3] = 255
+            label = text_mask(CHANNELS[k][0], self.scale)
+            self._blit(bg, label, 2, top + 1, CHANNEL_COLORS[k])
+        return bg
+
+    @staticmethod
+    def _blit(
+        frame: np.ndarray,
+        mask: np.ndarray,
+        x: int,
+        y: int,
+        color: np.ndarray,
+    ) -> None:
+        h = min(mask.shape[0], frame.shape[0] - y)
+        w = min(mask.shape[1], frame.shape[1] - x)
+        if h <= 0 or w <= 0:
+            return
+        region = frame[y:y + h, x:x + w]
+        m = mask[:h, :w]
+        region[m, :3] = color
+        region[m, 3] = 255
+
+    def render(self, t_video_rel: float, current: np.ndarray) -> np.ndarray:
+        """Frame for telemetry time t_video_rel (seconds from the first
+        CSV sample) with current channel values.
+        """
+        frame = self.background.copy()
+        char_w = 6 * self.scale
+        white = np.array([230, 237, 243], dtype=np.uint8)
+        for k, (_label, _col, unit, fmt) in enumerate(CHANNELS):
+            v = current[k]
+            text = fmt.format(v) if not math.isnan(v) else "  ---"
+            top = 1 + k * self.row_h + 1
+            self._blit(
+                frame,
+                text_mask(f"{text} {unit}", self.scale),
+                4 * char_w,
+                top,
+                white,
+            )
+        if self.t[-1] > self.t[0]:
+            frac = (t_video_rel - self.t[0]) / (self.t[-1] - self.t[0])
+            if 0.0 <= frac <= 1.0:
+                x = self.plot_x0 + int(round(frac * (self.plot_w - 1)))
+                frame[:, x, :3] = 255
+                frame[:, x, 3] = 255
+        clock = self.start_of_day + t_video_rel
+        if 0 <= t_video_rel <= self.t[-1]:
+            hh, rem = divmod(int(clock) % 86400, 3600)
+            mm, ss = divmod(rem, 60)
+            stamp = text_mask(f"{hh:02d}:{mm:02d}:{ss:02d}", self.scale)
+            self._blit(
+                frame,
+                stamp,
+                self.width - stamp.shape[1] - 4,
+                1,
+                white,
+            )
+        return frame
+
+
+def parse_clock(value: str) -> float:
+    parts = [float(p) for p in value.strip().split(":")]
+    if len(parts) != 3:
+        raise ValueError(f"Expected HH:MM:SS, got {value!r}")
+    return parts[0] * 3600 + parts[1] * 60 + parts[2]
+
+
+def build_overlay_command(
+    ffmpeg_bin: str,
+    video_path: str,
+    output_path: str,
+    info: VideoInfo,
+    strip_height: int,
+    position: str,
+    encoder_args: List[str],
+) -> List[str]:
+    y = "0" if position == "top" else "main_h-overlay_h"
+    return [
+        ffmpeg_bin,
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        video_path,
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgba",
+        "-s",
+        f"{info.width}x{strip_height}",
+        "-framerate",
+        f"{info.fps:g}",
+        "-i",
+        "pipe:0",
+        "-filter_complex",
+        f"[0:v][1:v]overlay=0:{y}:eof_action=pass[v]",
+        "-map",
+        "[v]",
+        "-map",
+        "0:a?",
+        *encoder_args,
+        "-c:a",
+        "copy",
+        "-movflags",
+        "+faststart",
+        output_path,
+    ]
+
+
+def burn_in(
+    ffmpeg_bin: str,
+    video_path: str,
+    csv_path: str,
+    output_path: str,
+    offset: float = 0.0,
+    position: str = "bottom",
+    profile: str = "archive",
+) -> int:
+    """
+    Overlay the telemetry strip on video_path in a single ffmpeg pass.
+
+    offset is the video time (seconds) at which the first CSV sample
+    happened; negative if the recording started after it.
+    """
+    info = probe_video(ffmpeg_bin, video_path)
+    t, values, start_of_day = load_telemetry(csv_path)
+    renderer = StripRenderer(info.width, info.height, t, values, start_of_day)
+
+    _, prof = sr.resolve_encoder_profile(
+        profile, sr.probe_encoders(ffmpeg_bin)
+    )
+    cmd = build_overlay_command(
+        ffmpeg_bin,
+        video_path,
+        output_path,
+        info,
+        renderer.height,
+        position,
+        sr.encoder_profile_args(prof, int(round(info.fps))),
+    )
+
+    n_frames = int(math.ceil(info.duration * info.fps))
+    t_frames = np.arange(n_frames) / info.fps - offset
+    current = interp_channels(t_frames, t, values)
+
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        for k in range(n_frames):
+            frame = renderer.render(float(t_frames[k]), current[k])
+            proc.stdin.write(frame.tobytes())
+    except BrokenPipeError:
+        pass
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+    return proc.wait()
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Burn a time-aligned telemetry strip (GS/RA/VSI/torques) from a "
+            "flight CSV into a screen recording."
+        ),
+    )
+    parser.add_argument(
+        "video",
+        help="Input recording (e.g. from screen_recorder.py)",
+    )
+    parser.add_argument("csv", help="Flight CSV (e.g. Data.csv)")
+    parser.add_argument(
+        "--output",
+        help="Output path (default: <video>_telemetry.mp4)",
+    )
+    align = parser.add_mutually_exclusive_group()
+    align.add_argument(
+        "--offset",
+        type=float,
+        default=0.0,
+        help="Video time (s) of the first CSV sample (default 0)",
+    )
+    align.add_argument(
+        "--csv-start",
+        help="CSV local time HH:MM:SS shown at video t=0",
+    )
+    parser.add_argument(
+        "--position",
+        choices=["bottom", "top"],
+        default="bottom",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(sr.ENCODER_PROFILES),
+        default="archive",
+        help="Encoder profile (see screen_recorder.py record --help)",
+    )
+    parser.add_argument(
+        "--ffmpeg",
+        help="Path to ffmpeg (or use ffmpeg from PATH)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    ffmpeg_bin = args.ffmpeg or "ffmpeg"
+    if not sr.ffmpeg_available(ffmpeg_bin):
+        print(
+            "ffmpeg is not available. Install from "
+            "https://ffmpeg.org/download.html and ensure it's on PATH.",
+            file=sys.stderr,
+        )
+        return 1
+    output = args.output
+    if not output:
+        stem, _ext = os.path.splitext(args.video)
+        output = f"{stem}_telemetry.mp4"
+
+    try:
+        offset = float(args.offset)
+        if args.csv_start:
+            _t, _v, start_of_day = load_telemetry(args.csv)
+            offset = start_of_day - parse_clock(args.csv_start)
+        rc = burn_in(
+            ffmpeg_bin,
+            args.video,
+            args.csv,
+            output,
+            offset=offset,
+            position=args.position,
+            profile=args.profile,
+        )
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    if rc == 0:
+        print(f"Saved to: {output}")
+    return rc
+
+
+if __name__ == "__main__":
+    sys.exit(main())
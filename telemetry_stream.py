@@ -0,0 +1,559 @@
+import argparse
+import csv
+import io
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import numpy as np
+
+
+# Channels held by the ring buffer, in column order. Units are those of
+# Data.csv (knots, feet, feet per minute, percent torque); recv_time is
+# the receiver's wall clock so consumers can tell a stalled feed.
+CHANNELS = (
+    "t_seconds",
+    "ground_speed",
+    "altitude_radar",
+    "vertical_speed",
+    "eng1_torque",
+    "eng2_torque",
+    "tas",
+    "recv_time",
+)
+
+# Sortie CSV header -> channel
+CSV_FIELDS = {
+    "Ground Speed": "ground_speed",
+    "Altitude Radar": "altitude_radar",
+    "Vertical Speed": "vertical_speed",
+    "Eng 1 Torque": "eng1_torque",
+    "Eng 2 Torque": "eng2_torque",
+    "TAS": "tas",
+}
+
+# Column order assumed until a sender transmits a header line
+DEFAULT_HEADER = (
+    "TAS,Air Pressure,Altitude Radar,Eng 1 Torque,Eng 2 Torque,"
+    "Ground Speed,Local Hour,Local Minute,Local Second,Vertical Speed,"
+    "Transcripts,Crew,Ai Pressure"
+).split(",")
+
+DEFAULT_CAPACITY = 36_000
+MAX_DATAGRAM = 65_507
+
+
+class RingBuffer:
+    """
+    Fixed-capacity telemetry history backed by one preallocated NumPy
+    array. Appends overwrite the oldest rows; readers copy out only the
+    rows they ask for, under a lock shared with the writer thread.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        channels: Sequence[str] = CHANNELS,
+    ):
+        self.capacity = max(int(capacity), 1)
+        self.channels = tuple(channels)
+        self.index = {name: i for i, name in enumerate(self.channels)}
+        self._data = np.full(
+            (self.capacity, len(self.channels)), np.nan, dtype=np.float64
+        )
+        # Total rows ever appended; row k lives at slot k % capacity
+        self.seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.seq, self.capacity)
+
+    def append(self, row: Sequence[float]) -> None:
+        with self._lock:
+            self._data[self.seq % self.capacity] = row
+            self.seq += 1
+
+    def extend(self, rows: np.ndarray) -> None:
+        rows = np.asarray(rows, dtype=np.float64).reshape(
+            -1, len(self.channels)
+        )
+        if rows.shape[0] > self.capacity:
+            skipped = rows.shape[0] - self.capacity
+            rows = rows[skipped:]
+        else:
+            skipped = 0
+        with self._lock:
+            self.seq += skipped
+            start = self.seq % self.capacity
+            first = min(rows.shape[0], self.capacity - start)
+            self._data[start:start + first] = rows[:first]
+            self._data[:rows.shape[0] - first] = rows[first:]
+            self.seq += rows.shape[0]
+
+    def since(self, seq: int) -> Tuple[int, np.ndarray]:
+        """
+        Rows appended after sequence number seq (oldest first) and the
+        current sequence number to pass next time. Rows that were already
+        overwritten are silently skipped.
+        """
+        with self._lock:
+            end = self.seq
+            start = max(int(seq), end - self.capacity, 0)
+            a = start % self.capacity
+            b = end % self.capacity
+            if end == start:
+                rows = self._data[:0].copy()
+            elif a < b:
+                rows = self._data[a:b].copy()
+            else:
+                rows = np.concatenate([self._data[a:], self._data[:b]])
+        return end, rows
+
+    def snapshot(self, last: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """The newest `last` rows (default: all held) as channel arrays."""
+        n = len(self) if last is None else min(int(last), self.capacity)
+        _, rows = self.since(self.seq - n)
+        return {name: rows[:, i] for name, i in self.index.items()}
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        _, rows = self.since(self.seq - 1)
+        if not len(rows):
+            return None
+        return {name: float(rows[-1, i]) for name, i in self.index.items()}
+
+
+def _number(value: str) -> float:
+    try:
+        return float(value.strip().strip('"'))
+    except ValueError:
+        return np.nan
+
+
+class RowParser:
+    """
+    Turns CSV text lines in the sortie format into ring-buffer rows. A line
+    whose first field is not numeric is taken as a header and sets the
+    column order for the lines after it.
+    """
+
+    def __init__(self, header: Sequence[str] = DEFAULT_HEADER):
+        self.set_header(header)
+
+    def set_header(self, header: Sequence[str]) -> None:
+        pos = {name.strip(): i for i, name in enumerate(header)}
+        self._time_cols = [
+            pos.get(n) for n in ("Local Hour", "Local Minute", "Local Second")
+        ]
+        self._cols = [
+            (CHANNELS.index(ch), pos[name])
+            for name, ch in CSV_FIELDS.items()
+            if name in pos
+        ]
+
+    def parse(self, lines: Iterable[str]) -> np.ndarray:
+        return self.parse_rows(csv.reader(lines))
+
+    def parse_rows(self, records: Iterable[Sequence[str]]) -> np.ndarray:
+        """Like parse, for records already split by csv.reader."""
+        now = time.time()
+        out: List[List[float]] = []
+        for fields in records:
+            if not fields or not any(f.strip() for f in fields):
+                continue
+            if fields[0].strip() and np.isnan(_number(fields[0])):
+                self.set_header(fields)
+                continue
+            if None in self._time_cols or max(self._time_cols) >= len(fields):
+                continue
+            hh, mm, ss = (_number(fields[i]) for i in self._time_cols)
+            if np.isnan(hh) or np.isnan(mm) or np.isnan(ss):
+                continue
+            row = [np.nan] * len(CHANNELS)
+            row[0] = hh * 3600 + mm * 60 + ss
+            for ch, col in self._cols:
+                if col < len(fields):
+                    row[ch] = _number(fields[col])
+            row[-1] = now
+            out.append(row)
+        return np.asarray(out, dtype=np.float64).reshape(-1, len(CHANNELS))
+
+
+class _Source(threading.Thread):
+    """Background reader feeding parsed rows into a RingBuffer."""
+
+    def __init__(self, ring: RingBuffer, name: str):
+        super().__init__(name=name, daemon=True)
+        self.ring = ring
+        self.parser = RowParser()
+        self.error: Optional[str] = None
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop_event.is_set()
+
+    def feed(self, text: str) -> None:
+        rows = self.parser.parse(text.splitlines())
+        if len(rows):
+            self.ring.extend(rows)
+
+    def run(self) -> None:
+        try:
+            self.serve()
+        except OSError as exc:
+            self.error = str(exc)
+
+    def serve(self) -> None:
+        raise NotImplementedError
+
+
+class UdpSource(_Source):
+    """One or more CSV lines per datagram."""
+
+    def __init__(self, ring: RingBuffer, host: str, port: int):
+        super().__init__(ring, f"udp-{port}")
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.settimeout(0.5)
+        self.address = self.sock.getsockname()
+
+    def serve(self) -> None:
+        with self.sock:
+            while not self.stopped:
+                try:
+                    data = self.sock.recv(MAX_DATAGRAM)
+                except socket.timeout:
+                    continue
+                self.feed(data.decode("utf-8", errors="replace"))
+
+
+class TcpSource(_Source):
+    """
+    Listens for a sender and reads newline-delimited CSV; a new connection
+    replaces the previous one and starts over from the default header.
+    """
+
+    def __init__(self, ring: RingBuffer, host: str, port: int):
+        super().__init__(ring, f"tcp-{port}")
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.listen(1)
+        self.sock.settimeout(0.5)
+        self.address = self.sock.getsockname()
+
+    def serve(self) -> None:
+        with self.sock:
+            while not self.stopped:
+                try:
+                    conn, _ = self.sock.accept()
+                except socket.timeout:
+                    continue
+                self.parser = RowParser()
+                with conn:
+                    conn.settimeout(0.5)
+                    self._read(conn)
+
+    def _read(self, conn: socket.socket) -> None:
+        pending = b""
+        while not self.stopped:
+            try:
+                data = conn.recv(1 << 16)
+            except socket.timeout:
+                continue
+            if not data:
+                return
+            pending += data
+            # Hold back a partial last line until its newline arrives
+            cut = pending.rfind(b"\n") + 1
+            if cut:
+                self.feed(pending[:cut].decode("utf-8", errors="replace"))
+                pending = pending[cut:]
+
+
+class FileFollower(_Source):
+    """
+    Tails a CSV file that another process appends to (like `tail -F`).
+    Starts at the end unless from_start; a truncated or replaced file is
+    reopened from its beginning.
+    """
+
+    def __init__(
+        self,
+        ring: RingBuffer,
+        path: str,
+        from_start: bool = False,
+        poll_interval: float = 0.2,
+    ):
+        super().__init__(ring, f"follow-{os.path.basename(path)}")
+        self.path = path
+        self.from_start = from_start
+        self.poll_interval = poll_interval
+
+    def serve(self) -> None:
+        f = None
+        inode = None
+        pending = ""
+        first = True
+        try:
+            while not self.stopped:
+                if f is None:
+                    try:
+                        f = open(self.path, "r", encoding="utf-8-sig")
+                    except FileNotFoundError:
+                        # Everything in a file created later is new
+                        first = False
+                        self._stop_event.wait(self.poll_interval)
+                        continue
+                    inode = os.fstat(f.fileno()).st_ino
+                    if first and not self.from_start:
+                        f.seek(0, os.SEEK_END)
+                    first = False
+                    pending = ""
+                chunk = f.read()
+                if chunk:
+                    pending += chunk
+                    cut = pending.rfind("\n") + 1
+                    if cut:
+                        self.feed(pending[:cut])
+                        pending = pending[cut:]
+                    continue
+                try:
+                    st = os.stat(self.path)
+                    rotated = st.st_ino != inode or st.st_size < f.tell()
+                except FileNotFoundError:
+                    rotated = True
+                if rotated:
+                    f.close()
+                    f = None
+                    self.parser = RowParser()
+                    continue
+                self._stop_event.wait(self.poll_interval)
+        finally:
+            if f is not None:
+                f.close()
+
+
+def parse_source_url(url: str) -> Tuple[str, str, int]:
+    """
+    ("udp" | "tcp", host, port) or ("file", path, 0) for udp://host:port,
+    tcp://host:port, file:///path or a bare file path.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ("udp", "tcp"):
+        if parsed.port is None:
+            raise ValueError(f"Missing port in {url!r}")
+        return parsed.scheme, parsed.hostname or "0.0.0.0", parsed.port
+    if parsed.scheme == "file":
+        return "file", parsed.path, 0
+    if parsed.scheme == "":
+        return "file", url, 0
+    raise ValueError(f"Unsupported telemetry source {url!r}")
+
+
+class TelemetryStream:
+    """A ring buffer plus the background source that fills it."""
+
+    def __init__(
+        self,
+        url: str,
+        capacity: int = DEFAULT_CAPACITY,
+        from_start: bool = False,
+    ):
+        self.url = url
+        self.ring = RingBuffer(capacity)
+        kind, host, port = parse_source_url(url)
+        if kind == "udp":
+            self.source: _Source = UdpSource(self.ring, host, port)
+        elif kind == "tcp":
+            self.source = TcpSource(self.ring, host, port)
+        else:
+            self.source = FileFollower(self.ring, host, from_start)
+        self.source.start()
+
+    @property
+    def error(self) -> Optional[str]:
+        return self.source.error
+
+    def close(self) -> None:
+        self.source.stop()
+        self.source.join(timeout=2.0)
+
+
+def _csv_line(fields: Sequence[str]) -> str:
+    """One record as a single CSV line; the wire is line-delimited."""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="").writerow(
+        [f.replace("\r", " ").replace("\n", " ") for f in fields]
+    )
+    return buf.getvalue()
+
+
+def replay(
+    csv_path: str,
+    url: str,
+    rate: float = 1.0,
+    loop: bool = False,
+    max_gap: float = 5.0,
+) -> int:
+    """
+    Send a recorded sortie CSV to a live source as if it were being flown:
+    the header first, then each row after its recorded time step divided
+    by rate (gaps capped at max_gap seconds). Returns rows sent.
+    """
+    # csv.reader, not splitlines: quoted transcripts may span lines
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        records = [r for r in csv.reader(f) if any(c.strip() for c in r)]
+    parser = RowParser(records[0])
+    times = np.array([
+        (parser.parse_rows([r])[:, 0].tolist() or [np.nan])[0]
+        for r in records[1:]
+    ])
+    header, rows = _csv_line(records[0]), [_csv_line(r) for r in records[1:]]
+    # Rows without a usable time go out together with the previous one
+    steps = np.nan_to_num(np.diff(times, prepend=times[:1]), nan=0.0)
+    offsets = np.cumsum(np.clip(steps, 0.0, max_gap))
+    kind, host, port = parse_source_url(url)
+
+    sent = 0
+    sock: Optional[socket.socket] = None
+    out = None
+    try:
+        if kind == "udp":
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.connect((host, port))
+        elif kind == "tcp":
+            sock = socket.create_connection((host, port), timeout=5.0)
+        else:
+            out = open(host, "a", encoding="utf-8", newline="")
+
+        def send(line: str) -> None:
+            data = line + "\n"
+            if out is not None:
+                out.write(data)
+                out.flush()
+            elif sock is not None:
+                if kind == "udp":
+                    sock.send(data.encode("utf-8"))
+                else:
+                    sock.sendall(data.encode("utf-8"))
+
+        if out is None or out.tell() == 0:
+            send(header)
+        while True:
+            start = time.monotonic()
+            for line, offset in zip(rows, offsets):
+                if rate > 0:
+                    delay = start + offset / rate - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                send(line)
+                sent += 1
+            if not loop:
+                break
+    finally:
+        if sock is not None:
+            sock.close()
+        if out is not None:
+            out.close()
+    return sent
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Live telemetry over UDP, TCP or a followed file, and a replay "
+            "tool that streams a recorded sortie CSV to one."
+        ),
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rp = sub.add_parser("replay", help="Stream a sortie CSV to a source")
+    rp.add_argument("csv", help="Recorded sortie CSV (e.g. Data.csv)")
+    rp.add_argument(
+        "url",
+        help="udp://host:port, tcp://host:port or a file path to append to",
+    )
+    rp.add_argument(
+        "--rate",
+        type=float,
+        default=1.0,
+        help="Playback speed multiplier; 0 sends as fast as possible",
+    )
+    rp.add_argument("--loop", action="store_true", help="Repeat forever")
+
+    lp = sub.add_parser("listen", help="Receive and print live telemetry")
+    lp.add_argument(
+        "url",
+        help="udp://0.0.0.0:5005, tcp://0.0.0.0:5006 or a file to follow",
+    )
+    lp.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY)
+    lp.add_argument(
+        "--from-start",
+        action="store_true",
+        help="Read a followed file from the beginning",
+    )
+    lp.add_argument(
+        "--duration",
+        type=float,
+        help="Stop after this many seconds (default: until Ctrl-C)",
+    )
+    return parser
+
+
+def _listen(args: argparse.Namespace) -> int:
+    stream = TelemetryStream(args.url, args.capacity, args.from_start)
+    deadline = (
+        time.monotonic() + args.duration if args.duration else None
+    )
+    seq = 0
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(1.0)
+            if stream.error:
+                print(stream.error, file=sys.stderr)
+                return 1
+            seq, rows = stream.ring.since(seq)
+            last = stream.ring.latest()
+            if last is None:
+                continue
+            t = int(last["t_seconds"])
+            print(
+                f"{t // 3600:02d}:{t // 60 % 60:02d}:{t % 60:02d} "
+                f"+{len(rows)} rows ({len(stream.ring)} held)  "
+                f"GS {last['ground_speed']:.0f} kt  "
+                f"RA {last['altitude_radar']:.0f} ft  "
+                f"VS {last['vertical_speed']:.0f} fpm"
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stream.close()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    try:
+        if args.command == "listen":
+            return _listen(args)
+        sent = replay(args.csv, args.url, rate=args.rate, loop=args.loop)
+    except (OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 0
+    print(f"Sent {sent} rows to {args.url}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+INDEX_CACHE_VERSION = 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents so "Está" matches "esta"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        ch for ch in decomposed if not unicodedata.combining(ch)
+    ).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+@dataclass
+class Transmission:
+    source: str
+    row: int
+    t_seconds: int
+    time_str: str
+    crew: str
+    text: str
+
+
+def _cell(row: dict, *names: str) -> str:
+    for name in names:
+        value = row.get(name)
+        if value is not None and value.strip():
+            return value.strip()
+    return ""
+
+
+def _int_cell(row: dict, name: str) -> int:
+    try:
+        return int(float(_cell(row, name) or 0))
+    except ValueError:
+        return 0
+
+
+def read_transmissions(csv_path: str) -> List[Transmission]:
+    """Rows of a sortie CSV that carry a transcript."""
+    out: List[Transmission] = []
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            text = _cell(row, "Transcripts", "transcript").strip('"')
+            if not text:
+                continue
+            hh = _int_cell(row, "Local Hour")
+            mm = _int_cell(row, "Local Minute")
+            ss = _int_cell(row, "Local Second")
+            out.append(
+                Transmission(
+                    source=os.path.abspath(csv_path),
+                    row=i,
+                    t_seconds=hh * 3600 + mm * 60 + ss,
+                    time_str=f"{hh:02d}:{mm:02d}:{ss:02d}",
+                    crew=_cell(row, "Crew", "crew"),
+                    text=text,
+                )
+            )
+    return out
+
+
+class TranscriptIndex:
+    """Inverted index from folded tokens to transmission ids."""
+
+    def __init__(
+        self,
+        docs: List[Transmission],
+        stamps: Dict[str, List[int]],
+    ) -> None:
+        self.docs = docs
+        self.stamps = stamps
+        postings: Dict[str, List[int]] = {}
+        for doc_id, doc in enumerate(docs):
+            for tok in set(tokenize(f"{doc.crew} {doc.text}")):
+                postings.setdefault(tok, []).append(doc_id)
+        self.postings = postings
+        self.vocab = sorted(postings)
+
+    def _term_ids(self, term: str) -> List[int]:
+        if not term.endswith("*"):
+            return self.postings.get(term, [])
+        # Prefix query: walk the sorted vocabulary from the first match
+        prefix = term[:-1]
+        ids: set = set()
+        i = bisect_left(self.vocab, prefix)
+        while i < len(self.vocab) and self.vocab[i].startswith(prefix):
+            ids.update(self.postings[self.vocab[i]])
+            i += 1
+        return sorted(ids)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Ids of transmissions containing every query term, in time order.
+        A trailing * makes a term a prefix match ("clim*").
+        """
+        terms = [
+            tok + ("*" if raw.endswith("*") else "")
+            for raw in query.split()
+            for tok in tokenize(raw)
+        ]
+        if not terms:
+            return []
+        id_lists = sorted((self._term_ids(t) for t in terms), key=len)
+        hits = set(id_lists[0])
+        for ids in id_lists[1:]:
+            if not hits:
+                break
+            hits.intersection_update(ids)
+        ordered = sorted(
+            hits, key=lambda i: (self.docs[i].source, self.docs[i].t_seconds)
+        )
+        return ordered[:limit] if limit is not None else ordered
+
+    def to_dict(self) -> dict:
+        return {
+            "index_version": INDEX_CACHE_VERSION,
+            "stamps": self.stamps,
+            "docs": [asdict(d) for d in self.docs],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TranscriptIndex":
+        return cls(
+            [Transmission(**d) for d in data["docs"]],
+            {k: list(v) for k, v in data["stamps"].items()},
+        )
+
+
+def _stamps(csv_paths: Sequence[str]) -> Dict[str, List[int]]:
+    stamps = {}
+    for p in csv_paths:
+        st = os.stat(p)
+        stamps[os.path.abspath(p)] = [st.st_mtime_ns, st.st_size]
+    return stamps
+
+
+def build_index(csv_paths: Iterable[str]) -> TranscriptIndex:
+    paths = [os.path.abspath(p) for p in csv_paths]
+    docs: List[Transmission] = []
+    for p in paths:
+        docs.extend(read_transmissions(p))
+    return TranscriptIndex(docs, _stamps(paths))
+
+
+def default_index_cache_dir() -> str:
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".cache", "transcripts"
+    )
+
+
+def index_cache_path(cache_dir: str, csv_paths: Sequence[str]) -> str:
+    key = hashlib.sha256(
+        "\n".join(sorted(os.path.abspath(p) for p in csv_paths)).encode(
+            "utf-8"
+        )
+    ).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def load_index(
+    csv_paths: Sequence[str],
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> TranscriptIndex:
+    """
+    Index for one or more sortie CSVs. The persisted copy is reused while
+    every CSV keeps its mtime and size; only the postings are rebuilt.
+    """
+    stamps = _stamps(csv_paths)
+    cache_file = index_cache_path(
+        cache_dir or default_index_cache_dir(), list(csv_paths)
+    )
+    if not refresh:
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if (
+                data.get("index_version") == INDEX_CACHE_VERSION
+                and data.get("stamps") == stamps
+            ):
+                return TranscriptIndex.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    index = build_index(csv_paths)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # Caching is best effort; the fresh index is still returned
+        pass
+    return index
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Search crew transcripts across one or more sorties."
+    )
+    parser.add_argument("query", help="Terms to match (all must appear)")
+    parser.add_argument(
+        "csv",
+        nargs="*",
+        default=["Data.csv"],
+        help="Sortie CSV files (default: Data.csv)",
+    )
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Rebuild the cached index",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    try:
+        index = load_index(args.csv, refresh=args.refresh)
+    except OSError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    hits = index.search(args.query)
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    for i in hits[:args.limit]:
+        doc = index.docs[i]
+        name = os.path.basename(doc.source)
+        print(f"{name} {doc.time_str} {doc.crew or 'Crew'}: {doc.text}")
+    print(
+        f"{len(hits)} hit(s) in {len(index.docs)} transmissions "
+        f"({elapsed_ms:.3f} ms)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())